@@ -12,10 +12,10 @@ from passlib.context import CryptContext
 
 from .contracts import LoginRequest, User, UserCreate
 from .file_lock import FileLock
+from .services import LazyService
 from .settings import settings
 
 ACCOUNTS_DIR = settings.data_dir / "accounts"
-ACCOUNTS_DIR.mkdir(parents=True, exist_ok=True)
 USERS_PATH = ACCOUNTS_DIR / "users.json"
 SESSIONS_PATH = ACCOUNTS_DIR / "sessions.json"
 SESSION_TTL = timedelta(days=7)
@@ -28,6 +28,7 @@ def _iso(dt: datetime) -> str:
 
 class AccountStore:
     def __init__(self) -> None:
+        ACCOUNTS_DIR.mkdir(parents=True, exist_ok=True)
         self.users: dict[str, dict[str, Any]] = {}
         self.sessions: dict[str, dict[str, Any]] = {}
         self._load_users()
@@ -213,4 +214,4 @@ class AccountStore:
         return [self._user_from_record(record) for record in self.users.values()]
 
 
-ACCOUNTS = AccountStore()
+ACCOUNTS: LazyService[AccountStore] = LazyService("accounts", AccountStore)
@@ -1,6 +1,7 @@
-from . import concierge, reservations, restaurants
+from . import availability, concierge, reservations, restaurants
 
 __all__ = [
+    "availability",
     "concierge",
     "reservations",
     "restaurants",
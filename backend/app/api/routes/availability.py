@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import math
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from ...availability import restaurants_with_table
+from ...serializers import restaurant_to_list_item
+from ...storage import DB
+from ..types import DateQuery, TimeQuery
+from ..utils import parse_coordinate_string
+
+router = APIRouter(tags=["availability"])
+
+
+def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 6371.0 * 2 * math.asin(math.sqrt(a))
+
+
+def _coordinates(record: dict) -> tuple[float, float] | None:
+    try:
+        lat = float(record.get("latitude"))
+        lon = float(record.get("longitude"))
+    except (TypeError, ValueError):
+        return None
+    return lat, lon
+
+
+@router.get("/availability/search")
+async def search_availability(
+    request: Request,
+    date_: DateQuery,
+    time_: TimeQuery,
+    party_size: int = Query(2, ge=1, le=50),
+    sort: Literal["rating", "distance", "name"] = "rating",
+    near: str | None = Query(None, description="Latitude,Longitude for distance sorting"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    origin: tuple[float, float] | None = None
+    if near:
+        try:
+            origin = parse_coordinate_string(near)
+        except ValueError as exc:
+            raise HTTPException(422, str(exc))
+    if sort == "distance" and origin is None:
+        raise HTTPException(422, "sort=distance requires near=lat,lon")
+
+    matches = await restaurants_with_table(
+        list(DB.restaurants.values()), party_size, date_, time_, DB
+    )
+
+    results = []
+    for record, free_ids in matches:
+        summary = DB.get_restaurant_summary(record["id"]) or record
+        item = restaurant_to_list_item(summary, request)
+        item["available_table_ids"] = free_ids
+        item["count"] = len(free_ids)
+        coords = _coordinates(record)
+        item["distance_km"] = (
+            round(_haversine_km(origin[0], origin[1], *coords), 3) if origin and coords else None
+        )
+        results.append(item)
+
+    if sort == "distance":
+        results.sort(key=lambda r: (r["distance_km"] is None, r["distance_km"] or 0.0, r["name"]))
+    elif sort == "name":
+        results.sort(key=lambda r: r["name"].lower())
+    else:
+        results.sort(key=lambda r: (-r["rating"], -r["reviews_count"], r["name"].lower()))
+
+    return {
+        "date": date_.isoformat(),
+        "time": time_.strftime("%H:%M"),
+        "party_size": party_size,
+        "total": len(results),
+        "limit": limit,
+        "offset": offset,
+        "results": results[offset : offset + limit],
+    }
@@ -8,17 +8,12 @@ from pydantic import BaseModel, Field
 
 from ...concierge import ConciergeEngine
 from ...concierge.normalize import pick_primary_location, summarize_price
+from ...services import LazyService
 
 router = APIRouter(tags=["concierge"])
 
-# Initialize a singleton engine; builds a lightweight hash index on first import.
-try:
-    ENGINE = ConciergeEngine.default()
-except Exception as exc:  # pragma: no cover - defensive path
-    ENGINE = None  # type: ignore
-    init_error = exc
-else:
-    init_error = None
+# Built on first request (or by the lifespan's concierge phase) rather than at import.
+ENGINE: LazyService[ConciergeEngine] = LazyService("concierge", ConciergeEngine.default)
 
 
 class ConciergeRequest(BaseModel):
@@ -48,9 +43,11 @@ class ConciergeResponse(BaseModel):
 
 @router.post("/concierge", response_model=ConciergeResponse)
 async def concierge(req: ConciergeRequest) -> ConciergeResponse:
-    if ENGINE is None:
-        raise HTTPException(status_code=503, detail=f"Concierge unavailable: {init_error}")
-    intent, results, message = ENGINE.recommend(req.query, top_k=req.top_k)
+    try:
+        engine = ENGINE.get()
+    except Exception as exc:  # pragma: no cover - defensive path
+        raise HTTPException(status_code=503, detail=f"Concierge unavailable: {exc}") from exc
+    intent, results, message = engine.recommend(req.query, top_k=req.top_k)
     payload: list[ConciergeResult] = []
     for res in results:
         venue = res.venue
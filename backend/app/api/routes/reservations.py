@@ -1,24 +1,67 @@
 from __future__ import annotations
 
+import json
+from collections.abc import AsyncIterator
+from datetime import UTC, date, datetime
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 
 from ...auth import require_auth
 from ...contracts import Reservation, ReservationCreate, Review
 from ...storage import DB
+from ..types import (
+    BulkRowsQuery,
+    OptionalRangeEnd,
+    OptionalRangeStart,
+    ReservationCursor,
+    ReservationPageLimit,
+    ReservationStatuses,
+)
 from ..utils import ensure_reservation_owner, rec_to_reservation
 
 router = APIRouter(tags=["reservations"])
 
+DEFAULT_RESERVATION_PAGE = 100
+
 
 class ReviewCreate(BaseModel):
     rating: int = Field(ge=1, le=5)
     comment: str | None = Field(default=None, max_length=1000)
 
 
+class BulkCancel(BaseModel):
+    """Venue closure: cancel everything active starting on these local dates."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    restaurant_id: str
+    from_: date = Field(alias="from")
+    to: date
+
+
+class BulkNoShow(BaseModel):
+    """Mark booked reservations that ended before ``before`` (default: now) as no-shows."""
+
+    restaurant_id: str | None = None
+    before: datetime | None = None
+
+
+class BulkReassign(BaseModel):
+    """Move the active bookings on one table to another, optionally for some dates only."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    restaurant_id: str
+    from_table_id: str
+    to_table_id: str
+    from_: date | None = Field(default=None, alias="from")
+    to: date | None = None
+
+
 def _scope_tokens(claims: dict[str, Any]) -> set[str]:
     raw = claims.get("scope")
     if isinstance(raw, str):
@@ -42,13 +85,49 @@ def _owner_id_from_claims(claims: dict[str, Any]) -> str | None:
     return None
 
 
+def _owner_scope(claims: dict[str, Any]) -> str | None:
+    """Owner a reservation write is limited to; ``None`` for reservation admins."""
+    if _is_reservations_admin(claims):
+        return None
+    owner_id = _owner_id_from_claims(claims)
+    if not owner_id:
+        raise HTTPException(404, "Reservation not found")
+    return owner_id
+
+
 @router.get("/reservations")
-async def list_reservations(claims: dict[str, Any] = Depends(require_auth)):
+async def list_reservations(
+    response: Response,
+    restaurant_id: str | None = None,
+    status: ReservationStatuses = None,
+    from_: OptionalRangeStart = None,
+    to: OptionalRangeEnd = None,
+    cursor: ReservationCursor = None,
+    limit: ReservationPageLimit = DEFAULT_RESERVATION_PAGE,
+    claims: dict[str, Any] = Depends(require_auth),
+):
+    """
+    One page ordered by start time; ``X-Next-Cursor`` carries the cursor for the next page and
+    is absent on the last one.
+    """
     is_admin = _is_reservations_admin(claims)
     owner_id = _owner_id_from_claims(claims)
     if not is_admin and not owner_id:
         raise HTTPException(401, "Missing subject claim")
-    return await DB.list_reservations(None if is_admin else owner_id)
+    if from_ and to and to < from_:
+        raise HTTPException(422, "'to' must not be before 'from'")
+    items, next_cursor = await DB.list_reservations_page(
+        None if is_admin else owner_id,
+        restaurant_id=restaurant_id,
+        statuses=status,
+        day_from=from_,
+        day_to=to,
+        cursor=cursor,
+        limit=limit,
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
 
 @router.post("/reservations", response_model=Reservation, status_code=201)
@@ -66,34 +145,101 @@ async def create_reservation(
         raise HTTPException(409, str(exc)) from exc
 
 
+def _require_admin(claims: dict[str, Any]) -> None:
+    if not _is_reservations_admin(claims):
+        raise HTTPException(403, "reservations:admin scope required")
+
+
+def _bulk_response(rows: list[dict[str, Any]], stream_rows: bool):
+    """
+    ``{"affected": n}``, or with ``rows=true`` the affected reservations as NDJSON (one
+    object per line) with the count in ``X-Affected-Count``.
+    """
+    if not stream_rows:
+        return {"affected": len(rows)}
+
+    async def lines() -> AsyncIterator[str]:
+        for row in rows:
+            yield json.dumps(row, separators=(",", ":")) + "\n"
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"X-Affected-Count": str(len(rows))},
+    )
+
+
+@router.post("/reservations/bulk/cancel")
+async def bulk_cancel_reservations(
+    payload: BulkCancel, rows: BulkRowsQuery = False, claims: dict[str, Any] = Depends(require_auth)
+):
+    _require_admin(claims)
+    if payload.to < payload.from_:
+        raise HTTPException(422, "'to' must not be before 'from'")
+    if not DB.get_restaurant(payload.restaurant_id):
+        raise HTTPException(404, "Restaurant not found")
+    changed = await DB.bulk_transition(
+        "cancelled",
+        restaurant_id=payload.restaurant_id,
+        day_from=payload.from_,
+        day_to=payload.to,
+    )
+    return _bulk_response(changed, rows)
+
+
+@router.post("/reservations/bulk/no-show")
+async def bulk_mark_no_show(
+    payload: BulkNoShow, rows: BulkRowsQuery = False, claims: dict[str, Any] = Depends(require_auth)
+):
+    _require_admin(claims)
+    before = payload.before or datetime.now(UTC)
+    if before.tzinfo is None:
+        raise HTTPException(422, "'before' needs a UTC offset")
+    changed = await DB.bulk_transition(
+        "no_show", restaurant_id=payload.restaurant_id, ended_before=before
+    )
+    return _bulk_response(changed, rows)
+
+
+@router.post("/reservations/bulk/reassign-table")
+async def bulk_reassign_table(
+    payload: BulkReassign,
+    rows: BulkRowsQuery = False,
+    claims: dict[str, Any] = Depends(require_auth),
+):
+    _require_admin(claims)
+    if payload.from_ and payload.to and payload.to < payload.from_:
+        raise HTTPException(422, "'to' must not be before 'from'")
+    if not DB.get_restaurant(payload.restaurant_id):
+        raise HTTPException(404, "Restaurant not found")
+    changed = await DB.bulk_reassign_table(
+        payload.restaurant_id,
+        payload.from_table_id,
+        payload.to_table_id,
+        day_from=payload.from_,
+        day_to=payload.to,
+    )
+    return _bulk_response(changed, rows)
+
+
+async def _transition(resid: UUID, status: str, claims: dict[str, Any]) -> Reservation:
+    record = await DB.transition_reservation(str(resid), status, _owner_scope(claims))
+    return rec_to_reservation(record)
+
+
 @router.post("/reservations/{resid}/cancel", response_model=Reservation)
 async def soft_cancel_reservation(resid: UUID, claims: dict[str, Any] = Depends(require_auth)):
-    is_admin = _is_reservations_admin(claims)
-    owner_id = _owner_id_from_claims(claims)
-    ensure_reservation_owner(await DB.get_reservation(str(resid)), owner_id, is_admin)
-    record = await DB.set_status(str(resid), "cancelled")
-    if not record:
-        raise HTTPException(404, "Reservation not found")
-    return rec_to_reservation(record)
+    return await _transition(resid, "cancelled", claims)
 
 
 @router.post("/reservations/{resid}/confirm", response_model=Reservation)
 async def confirm_reservation(resid: UUID, claims: dict[str, Any] = Depends(require_auth)):
-    is_admin = _is_reservations_admin(claims)
-    owner_id = _owner_id_from_claims(claims)
-    ensure_reservation_owner(await DB.get_reservation(str(resid)), owner_id, is_admin)
-    record = await DB.set_status(str(resid), "booked")
-    if not record:
-        raise HTTPException(404, "Reservation not found")
-    return rec_to_reservation(record)
+    return await _transition(resid, "booked", claims)
 
 
 @router.delete("/reservations/{resid}", response_model=Reservation)
 async def hard_delete_reservation(resid: UUID, claims: dict[str, Any] = Depends(require_auth)):
-    is_admin = _is_reservations_admin(claims)
-    owner_id = _owner_id_from_claims(claims)
-    ensure_reservation_owner(await DB.get_reservation(str(resid)), owner_id, is_admin)
-    record = await DB.cancel_reservation(str(resid))
+    record = await DB.cancel_reservation(str(resid), _owner_scope(claims))
     if not record:
         raise HTTPException(404, "Reservation not found")
     return rec_to_reservation(record)
@@ -101,24 +247,12 @@ async def hard_delete_reservation(resid: UUID, claims: dict[str, Any] = Depends(
 
 @router.post("/reservations/{resid}/arrive", response_model=Reservation)
 async def mark_arrived(resid: UUID, claims: dict[str, Any] = Depends(require_auth)):
-    is_admin = _is_reservations_admin(claims)
-    owner_id = _owner_id_from_claims(claims)
-    ensure_reservation_owner(await DB.get_reservation(str(resid)), owner_id, is_admin)
-    record = await DB.set_status(str(resid), "arrived")
-    if not record:
-        raise HTTPException(404, "Reservation not found")
-    return rec_to_reservation(record)
+    return await _transition(resid, "arrived", claims)
 
 
 @router.post("/reservations/{resid}/no-show", response_model=Reservation)
 async def mark_no_show(resid: UUID, claims: dict[str, Any] = Depends(require_auth)):
-    is_admin = _is_reservations_admin(claims)
-    owner_id = _owner_id_from_claims(claims)
-    ensure_reservation_owner(await DB.get_reservation(str(resid)), owner_id, is_admin)
-    record = await DB.set_status(str(resid), "no_show")
-    if not record:
-        raise HTTPException(404, "Reservation not found")
-    return rec_to_reservation(record)
+    return await _transition(resid, "no_show", claims)
 
 
 @router.get("/reservations/{resid}/review", response_model=Review)
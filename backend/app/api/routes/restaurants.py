@@ -1,22 +1,141 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Request
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
 
-from ...availability import availability_for_day
-from ...contracts import Restaurant, RestaurantListItem, Review
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+
+from ...availability import (
+    MAX_NEXT_AVAILABLE_DAYS,
+    MAX_RANGE_DAYS,
+    availability_for_range,
+    cached_availability_for_day,
+    next_available_slots,
+)
+from ...contracts import Restaurant, RestaurantListItem, RestaurantPage, Review
+from ...live import availability_hub
 from ...serializers import restaurant_to_detail, restaurant_to_list_item
 from ...storage import DB
-from ..types import DateQuery, RestaurantSearch
+from ..types import (
+    AfterQuery,
+    DateQuery,
+    FacetValues,
+    MinRatingQuery,
+    PageLimit,
+    PageOffset,
+    PartySizesQuery,
+    RangeEndQuery,
+    RangeStartQuery,
+    RestaurantSearch,
+    RestaurantSort,
+    TagFilters,
+)
 
 router = APIRouter(tags=["restaurants"])
 
+MAX_RANGE_PARTY_SIZES = 8
+MAX_NEXT_AVAILABLE_RESULTS = 50
+STREAM_HEARTBEAT_SECONDS = 15.0
+
+
+def _parse_party_sizes(raw: str) -> list[int]:
+    sizes: set[int] = set()
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            size = int(part)
+        except ValueError:
+            raise HTTPException(422, "party_sizes must be comma-separated integers")
+        if size < 1:
+            raise HTTPException(422, "party_sizes must be >= 1")
+        sizes.add(size)
+    if not sizes:
+        raise HTTPException(422, "party_sizes must include at least one size")
+    if len(sizes) > MAX_RANGE_PARTY_SIZES:
+        raise HTTPException(422, f"At most {MAX_RANGE_PARTY_SIZES} party sizes per request")
+    return sorted(sizes)
+
+
+def _facet_filters(
+    cuisine: list[str] | None,
+    neighborhood: list[str] | None,
+    price_level: list[str] | None,
+    tags: list[str] | None,
+) -> dict[str, list[str]]:
+    filters = {
+        "cuisine": cuisine or [],
+        "neighborhood": neighborhood or [],
+        "price_level": price_level or [],
+    }
+    for raw in tags or []:
+        group, sep, value = raw.partition(":")
+        if not sep or not group.strip() or not value.strip():
+            raise HTTPException(422, "tag filters must look like group:value")
+        filters.setdefault(f"tag:{group.strip()}", []).append(value.strip())
+    return filters
+
 
 @router.get("/restaurants", response_model=list[RestaurantListItem])
-def list_restaurants(request: Request, q: RestaurantSearch = None):
-    items = DB.list_restaurants(q)
+def list_restaurants(
+    request: Request,
+    response: Response,
+    q: RestaurantSearch = None,
+    cuisine: FacetValues = None,
+    neighborhood: FacetValues = None,
+    price_level: FacetValues = None,
+    tag: TagFilters = None,
+    min_rating: MinRatingQuery = None,
+    sort: RestaurantSort = None,
+    limit: PageLimit = None,
+    offset: PageOffset = 0,
+):
+    """Catalog order without ``q``; relevance-ranked search results with it."""
+    items, total = DB.search_restaurants(
+        q,
+        limit=limit,
+        offset=offset,
+        filters=_facet_filters(cuisine, neighborhood, price_level, tag),
+        min_rating=min_rating,
+        sort=sort,
+    )
+    response.headers["X-Total-Count"] = str(total)
     return [restaurant_to_list_item(r, request) for r in items]
 
 
+@router.get("/restaurants/search", response_model=RestaurantPage)
+def search_restaurants(
+    request: Request,
+    q: RestaurantSearch = None,
+    cuisine: FacetValues = None,
+    neighborhood: FacetValues = None,
+    price_level: FacetValues = None,
+    tag: TagFilters = None,
+    min_rating: MinRatingQuery = None,
+    sort: RestaurantSort = None,
+    limit: PageLimit = None,
+    offset: PageOffset = 0,
+):
+    """
+    Same filters as ``/restaurants``, wrapped with the total and per-facet counts so clients
+    can render filter chips without downloading the catalog.
+    """
+    page = DB.browse_restaurants(
+        q,
+        limit=limit,
+        offset=offset,
+        filters=_facet_filters(cuisine, neighborhood, price_level, tag),
+        min_rating=min_rating,
+        sort=sort,
+    )
+    page["items"] = [restaurant_to_list_item(r, request) for r in page["items"]]
+    return page
+
+
 @router.get("/restaurants/{rid}", response_model=Restaurant)
 def get_restaurant(rid: str, request: Request):
     record = DB.get_restaurant(rid)
@@ -30,7 +149,90 @@ async def restaurant_availability(rid: str, date_: DateQuery, party_size: int =
     record = DB.get_restaurant(rid)
     if not record:
         raise HTTPException(404, "Restaurant not found")
-    return await availability_for_day(record, party_size, date_, DB)
+    return await cached_availability_for_day(record, party_size, date_, DB)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+@router.get("/restaurants/{rid}/availability/stream")
+async def restaurant_availability_stream(
+    rid: str, request: Request, date_: DateQuery, party_size: int = 2
+):
+    """
+    Server-sent events for one availability grid: a ``snapshot`` event with the full day,
+    then ``delta`` events carrying only the slots that changed after each reservation write.
+    """
+    record = DB.get_restaurant(rid)
+    if not record:
+        raise HTTPException(404, "Restaurant not found")
+    if party_size < 1:
+        raise HTTPException(422, "party_size must be >= 1")
+    subscription, snapshot = await availability_hub.subscribe(record, party_size, date_, DB)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            yield _sse("snapshot", snapshot)
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=STREAM_HEARTBEAT_SECONDS
+                    )
+                except TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(event, data)
+        finally:
+            availability_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/restaurants/{rid}/availability/range")
+async def restaurant_availability_range(
+    rid: str,
+    from_: RangeStartQuery,
+    to: RangeEndQuery,
+    party_sizes: PartySizesQuery = "2",
+):
+    record = DB.get_restaurant(rid)
+    if not record:
+        raise HTTPException(404, "Restaurant not found")
+    if to < from_:
+        raise HTTPException(422, "'to' must not be before 'from'")
+    if (to - from_).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(422, f"Date range is limited to {MAX_RANGE_DAYS} days")
+    sizes = _parse_party_sizes(party_sizes)
+    return await availability_for_range(record, sizes, from_, to, DB)
+
+
+@router.get("/restaurants/{rid}/next-available")
+async def restaurant_next_available(
+    rid: str,
+    party_size: int = 2,
+    after: AfterQuery = None,
+    within_days: int = 14,
+    limit: int = 5,
+):
+    record = DB.get_restaurant(rid)
+    if not record:
+        raise HTTPException(404, "Restaurant not found")
+    if party_size < 1:
+        raise HTTPException(422, "party_size must be >= 1")
+    if not 1 <= within_days <= MAX_NEXT_AVAILABLE_DAYS:
+        raise HTTPException(422, f"within_days must be between 1 and {MAX_NEXT_AVAILABLE_DAYS}")
+    if not 1 <= limit <= MAX_NEXT_AVAILABLE_RESULTS:
+        raise HTTPException(422, f"limit must be between 1 and {MAX_NEXT_AVAILABLE_RESULTS}")
+    return await next_available_slots(
+        record, party_size, after or datetime.now(UTC), within_days, limit, DB
+    )
 
 
 @router.get("/restaurants/{rid}/reviews", response_model=list[Review])
@@ -1,11 +1,27 @@
 from __future__ import annotations
 
-from datetime import date
-from typing import Annotated
+from datetime import date, datetime, time
+from typing import Annotated, Literal
 
 from fastapi import Query
 
 DateQuery = Annotated[date, Query(alias="date")]
+TimeQuery = Annotated[time, Query(alias="time", description="Local start time (HH:MM)")]
+AfterQuery = Annotated[
+    datetime | None,
+    Query(description="Earliest slot start; naive values are restaurant-local (default: now)"),
+]
+RangeStartQuery = Annotated[date, Query(alias="from")]
+RangeEndQuery = Annotated[date, Query(alias="to")]
+
+PartySizesQuery = Annotated[
+    str,
+    Query(
+        min_length=1,
+        max_length=64,
+        description="Comma-separated party sizes (e.g., 2,4,6)",
+    ),
+]
 
 CoordinateString = Annotated[
     str,
@@ -25,3 +41,41 @@ RestaurantSearch = Annotated[
         description="Optional search term for restaurants",
     ),
 ]
+
+PageLimit = Annotated[
+    int | None,
+    Query(ge=1, le=200, description="Maximum number of items to return (default: all)"),
+]
+PageOffset = Annotated[int, Query(ge=0, description="Number of items to skip")]
+
+FacetValues = Annotated[
+    list[str] | None,
+    Query(description="Accepted values (repeat the parameter to OR several)"),
+]
+TagFilters = Annotated[
+    list[str] | None,
+    Query(description="Tag group values as group:value, e.g. vibe:romantic (repeatable)"),
+]
+MinRatingQuery = Annotated[float | None, Query(ge=0, le=5)]
+RestaurantSort = Annotated[
+    Literal["relevance", "rating", "reviews_count", "name"] | None,
+    Query(description="Default: relevance with q, catalog order without"),
+]
+
+ReservationStatuses = Annotated[
+    list[Literal["pending", "booked", "cancelled", "arrived", "no_show"]] | None,
+    Query(alias="status", description="Only these statuses (repeatable)"),
+]
+OptionalRangeStart = Annotated[
+    date | None, Query(alias="from", description="First local date (inclusive)")
+]
+OptionalRangeEnd = Annotated[
+    date | None, Query(alias="to", description="Last local date (inclusive)")
+]
+ReservationCursor = Annotated[
+    str | None, Query(description="X-Next-Cursor value from the previous page")
+]
+ReservationPageLimit = Annotated[int, Query(ge=1, le=500)]
+BulkRowsQuery = Annotated[
+    bool, Query(description="Stream the affected reservations as NDJSON instead of a count")
+]
@@ -1,13 +1,23 @@
-from datetime import date, datetime, time, timedelta
+from datetime import UTC, date, datetime, time, timedelta
 from typing import Any
-from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from zoneinfo import ZoneInfo
 
-RES_DURATION = timedelta(minutes=90)
-INTERVAL = timedelta(minutes=30)
-OPEN = time(8, 0)
-CLOSE = time(23, 0)
-DEFAULT_TIMEZONE = "Asia/Baku"
-DAY_KEYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+from .cache import availability_cache
+from .schedule import (
+    DEFAULT_TIMEZONE,
+    INTERVAL,
+    RES_DURATION,
+    CompiledSchedule,
+    compile_schedule,
+    parse_time,
+    resolve_timezone,
+    weekday_hours,
+)
+from .table_assignment import split_table_ids
+
+MAX_RANGE_DAYS = 14
+MAX_NEXT_AVAILABLE_DAYS = 60
+NEXT_AVAILABLE_CHUNK_DAYS = 7
 
 
 def _overlaps(a_start: datetime, a_end: datetime, b_start: datetime, b_end: datetime) -> bool:
@@ -18,26 +28,8 @@ def _iso_parse(s: str) -> datetime:
     return datetime.fromisoformat(s)
 
 
-def _resolve_timezone(tz_name: str | None) -> ZoneInfo:
-    name = tz_name or DEFAULT_TIMEZONE
-    try:
-        return ZoneInfo(name)
-    except ZoneInfoNotFoundError:
-        return ZoneInfo(DEFAULT_TIMEZONE)
-
-
-def _parse_time(value: str | None, default: time) -> time:
-    if not value:
-        return default
-    parts = value.strip().split(":")
-    if len(parts) < 2:
-        return default
-    try:
-        hour = max(0, min(23, int(parts[0])))
-        minute = max(0, min(59, int(parts[1])))
-        return time(hour, minute)
-    except ValueError:
-        return default
+_resolve_timezone = resolve_timezone
+_parse_time = parse_time
 
 
 def _hours_for_day(restaurant: Any, day: date) -> tuple[time, time]:
@@ -46,16 +38,7 @@ def _hours_for_day(restaurant: Any, day: date) -> tuple[time, time]:
         if isinstance(restaurant, dict)
         else getattr(restaurant, "hours", None)
     )
-    if isinstance(hours, dict):
-        # Support global open/close as well as day-specific records
-        weekday_key = DAY_KEYS[day.weekday()]
-        day_hours = hours.get(weekday_key) if isinstance(hours.get(weekday_key), dict) else None
-        open_str = day_hours.get("open") if day_hours else hours.get("open")
-        close_str = day_hours.get("close") if day_hours else hours.get("close")
-        open_time = _parse_time(open_str, OPEN)
-        close_time = _parse_time(close_str, CLOSE)
-        return open_time, close_time
-    return OPEN, CLOSE
+    return weekday_hours(hours, day.weekday())
 
 
 def _assign_shared_block(
@@ -97,86 +80,457 @@ def _normalize_timezone(dt: datetime, tz: ZoneInfo) -> datetime:
     return dt.astimezone(tz)
 
 
-async def availability_for_day(restaurant: Any, party_size: int, day: date, db) -> dict[str, Any]:
-    """
-    Returns: {"slots":[{"start":iso,"end":iso,"available_table_ids":[...],"count":N}, ...]}
-    Only considers reservations with status == "booked".
-    """
+def _restaurant_identity(restaurant: Any) -> tuple[str, str]:
     if isinstance(restaurant, dict):
         rid = str(restaurant.get("id"))
         restaurant_tz = restaurant.get("timezone") or DEFAULT_TIMEZONE
     else:
         rid = str(restaurant.id)
         restaurant_tz = getattr(restaurant, "timezone", DEFAULT_TIMEZONE) or DEFAULT_TIMEZONE
-    tzinfo = _resolve_timezone(restaurant_tz)
-    open_time, close_time = _hours_for_day(restaurant, day)
+    return rid, restaurant_tz
 
-    # Tables that fit the party
-    tables: list[dict[str, Any]] = db.eligible_tables(rid, party_size)
 
-    # Existing booked reservations for that date, same restaurant
-    todays: list[dict[str, Any]] = []
+def _schedule_for(restaurant: Any, db) -> CompiledSchedule:
+    """The catalog's compiled schedule, compiling on the fly for restaurants it doesn't know."""
+    getter = getattr(db, "schedule_for", None)
+    if callable(getter):
+        rid, _ = _restaurant_identity(restaurant)
+        schedule = getter(rid)
+        if schedule is not None:
+            return schedule
+    return compile_schedule(restaurant)
+
+
+class DayOccupancy:
+    """
+    Busy-slot bitmasks for the tables of one service day.
+
+    Bit ``k`` of a table's mask is set when a booking overlaps the reservation window that
+    starts at slot ``k`` (``open + k * INTERVAL`` for ``RES_DURATION``). Masks are built once
+    from raw booking datetimes, so per-slot lookups are shifts instead of overlap scans.
+    """
+
+    __slots__ = ("open_dt", "slot_count", "table_ids", "masks", "slot_busy")
+
+    def __init__(self, open_dt: datetime, slot_count: int, table_ids: list[str]) -> None:
+        self.open_dt = open_dt
+        self.slot_count = slot_count
+        self.table_ids = table_ids
+        # Per-table masks over slots, and the transposed per-slot masks over table indexes.
+        self.masks = [0] * len(table_ids)
+        self.slot_busy = [0] * slot_count
+
+    def slot_range(self, start: datetime, end: datetime) -> tuple[int, int]:
+        """Return the inclusive slot index range whose windows overlap ``[start, end)``."""
+        # Same-tzinfo subtraction is wall-clock, matching how the slot grid is stepped.
+        first = (start - self.open_dt - RES_DURATION) // INTERVAL + 1
+        last = -((self.open_dt - end) // INTERVAL) - 1
+        return max(0, first), min(self.slot_count - 1, last)
+
+    def block(self, index: int, start: datetime, end: datetime) -> None:
+        first, last = self.slot_range(start, end)
+        if first > last:
+            return
+        self.masks[index] |= ((1 << (last - first + 1)) - 1) << first
+        bit = 1 << index
+        for slot in range(first, last + 1):
+            self.slot_busy[slot] |= bit
+
+    def free_table_ids(self, slot: int, allowed: int | None = None) -> list[str]:
+        """Free tables at ``slot``; ``allowed`` optionally masks table indexes."""
+        busy = self.slot_busy[slot]
+        if allowed is None:
+            if not busy:
+                return list(self.table_ids)
+            return [tid for idx, tid in enumerate(self.table_ids) if not busy >> idx & 1]
+        free = allowed & ~busy
+        return [tid for idx, tid in enumerate(self.table_ids) if free >> idx & 1]
+
+    def slot_start(self, slot: int) -> datetime:
+        return self.open_dt + slot * INTERVAL
+
+
+async def _booking_blocks(
+    db, rid: str, day: date, restaurant_tz: str, tzinfo: ZoneInfo
+) -> list[tuple[str, datetime, datetime, int]]:
+    """Return ``(table_id, start, end, party_size)`` tuples in the restaurant timezone."""
+    loader = getattr(db, "reservation_blocks_for_day", None)
+    blocks: list[tuple[str, datetime, datetime, int]] = []
+    if callable(loader):
+        for table_id, start, end, size in await loader(rid, day, restaurant_tz):
+            blocks.append(
+                (
+                    table_id or "",
+                    _normalize_timezone(start, tzinfo),
+                    _normalize_timezone(end, tzinfo),
+                    size or 0,
+                )
+            )
+        return blocks
     for r in await db.reservations_for_day(rid, day, restaurant_tz):
         try:
             rs = _normalize_timezone(_iso_parse(str(r["start"])), tzinfo)
             re = _normalize_timezone(_iso_parse(str(r["end"])), tzinfo)
         except Exception:
             continue
-        todays.append(
+        blocks.append((str(r.get("table_id") or ""), rs, re, int(r.get("party_size") or 0)))
+    return blocks
+
+
+def build_day_occupancy(
+    db,
+    rid: str,
+    tables: list[dict[str, Any]],
+    blocks: list[tuple[str, datetime, datetime, int]],
+    schedule: CompiledSchedule,
+    day: date,
+    party_size: int,
+) -> DayOccupancy:
+    table_ids = [str(t.get("id")) for t in tables]
+    open_dt, _ = schedule.service_window(day)
+    occupancy = DayOccupancy(open_dt, schedule.slot_count(day), table_ids)
+    position = {tid: idx for idx, tid in enumerate(table_ids)}
+    shared: dict[int, str | None] = {}
+    for tid, start, end, size in blocks:
+        if not tid:
+            size = size or party_size
+            if size not in shared:
+                shared[size] = _assign_shared_block(db, rid, tables, (start, end), size)
+            tid = shared[size]
+            if not tid:
+                continue
+        for part in split_table_ids(tid):
+            index = position.get(part)
+            if index is not None:
+                occupancy.block(index, start, end)
+    return occupancy
+
+
+def _slots_payload(occupancy: DayOccupancy, allowed: int | None = None) -> list[dict[str, Any]]:
+    slots = []
+    for k in range(occupancy.slot_count):
+        cur = occupancy.slot_start(k)
+        free_ids = occupancy.free_table_ids(k, allowed)
+        slots.append(
             {
-                "table_id": str(r.get("table_id") or ""),
-                "start": rs,
-                "end": re,
-                "party_size": int(r.get("party_size") or 0),
+                "start": cur.isoformat(timespec="seconds"),
+                "end": (cur + RES_DURATION).isoformat(timespec="seconds"),
+                "available_table_ids": free_ids,
+                "count": len(free_ids),
             }
         )
+    return slots
 
-    bookings_by_table: dict[str, list[tuple[datetime, datetime]]] = {}
-    for booking in todays:
-        block = (booking["start"], booking["end"])
-        tid = booking["table_id"]
-        if tid:
-            bookings_by_table.setdefault(tid, []).append(block)
-        else:
-            assigned = _assign_shared_block(
-                db,
-                rid,
-                tables,
-                block,
-                booking.get("party_size") or party_size,
-            )
-            if assigned:
-                bookings_by_table.setdefault(assigned, []).append(block)
 
-    slots = []
-    open_dt = datetime.combine(day, open_time, tzinfo=tzinfo)
-    close_dt = datetime.combine(day, close_time, tzinfo=tzinfo)
-    if close_dt <= open_dt:
-        close_dt += timedelta(days=1)
-    cur = open_dt
-    last_start = close_dt - RES_DURATION
-
-    while cur <= last_start:
-        slot_end = cur + RES_DURATION
-        free_ids: list[str] = []
-        for t in tables:
-            tid = str(t.get("id"))
-            taken = False
-            for rs, re in bookings_by_table.get(tid, ()):
-                if _overlaps(cur, slot_end, rs, re):
-                    taken = True
-                    break
-            if not taken:
-                free_ids.append(tid)
+async def availability_for_day(restaurant: Any, party_size: int, day: date, db) -> dict[str, Any]:
+    """
+    Returns: {"slots":[{"start":iso,"end":iso,"available_table_ids":[...],"count":N}, ...]}
+    Only considers reservations with status == "booked".
+    """
+    rid, restaurant_tz = _restaurant_identity(restaurant)
+    schedule = _schedule_for(restaurant, db)
+
+    # Tables that fit the party
+    tables: list[dict[str, Any]] = db.eligible_tables(rid, party_size)
+
+    # Precomputed occupancy shared by every worker, when the day has been materialised
+    loader = getattr(db, "materialized_slots", None)
+    if callable(loader):
+        rows = await loader(rid, day)
+        if rows:
+            slots = _materialized_slots_payload(rows, schedule, day, tables)
+            if slots is not None:
+                return {"slots": slots, "restaurant_timezone": restaurant_tz}
+
+    # Existing booked reservations for that date, same restaurant
+    blocks = await _booking_blocks(db, rid, day, restaurant_tz, schedule.tzinfo)
+    occupancy = build_day_occupancy(db, rid, tables, blocks, schedule, day, party_size)
+    return {"slots": _slots_payload(occupancy), "restaurant_timezone": restaurant_tz}
 
+
+async def cached_availability_for_day(
+    restaurant: Any, party_size: int, day: date, db
+) -> dict[str, Any]:
+    """`availability_for_day` behind the invalidation-aware LRU in `cache.availability_cache`."""
+    rid, _ = _restaurant_identity(restaurant)
+    cached = availability_cache.get(rid, day, party_size)
+    if cached is not None:
+        return cached
+    generation = availability_cache.generation(rid, day)
+    payload = await availability_for_day(restaurant, party_size, day, db)
+    availability_cache.put(rid, day, party_size, payload, generation)
+    return payload
+
+
+def _capacity_mask(capacities: list[int], party_size: int) -> int:
+    """Bitmask of table indexes whose capacity seats ``party_size``."""
+    mask = 0
+    for idx, cap in enumerate(capacities):
+        if cap >= party_size:
+            mask |= 1 << idx
+    return mask
+
+
+def _bucket_blocks_by_day(
+    blocks: list[tuple[str, datetime, datetime, int]],
+    first_day: date,
+    last_day: date,
+    tzinfo: ZoneInfo,
+) -> dict[date, list[tuple[str, datetime, datetime, int]]]:
+    """Group blocks under every local day whose midnight-to-midnight window they overlap."""
+    buckets: dict[date, list[tuple[str, datetime, datetime, int]]] = {}
+    for block in blocks:
+        _, start, end, _ = block
+        day = max(start.date(), first_day)
+        while day <= last_day and datetime.combine(day, time.min, tzinfo=tzinfo) < end:
+            buckets.setdefault(day, []).append(block)
+            day += timedelta(days=1)
+    return buckets
+
+
+async def _blocks_by_day(
+    db, rid: str, restaurant_tz: str, tzinfo: ZoneInfo, first_day: date, last_day: date
+) -> dict[date, list[tuple[str, datetime, datetime, int]]]:
+    """Blocking reservations for ``first_day..last_day`` bucketed like the day view, one query."""
+    loader = getattr(db, "reservation_blocks_between", None)
+    if not callable(loader):
+        by_day = {}
+        day = first_day
+        while day <= last_day:
+            by_day[day] = await _booking_blocks(db, rid, day, restaurant_tz, tzinfo)
+            day += timedelta(days=1)
+        return by_day
+    window_start = datetime.combine(first_day, time.min, tzinfo=tzinfo)
+    window_end = datetime.combine(last_day + timedelta(days=1), time.min, tzinfo=tzinfo)
+    raw = await loader(rid, window_start.astimezone(UTC), window_end.astimezone(UTC))
+    return bucket_blocks(raw, first_day, last_day, tzinfo)
+
+
+def bucket_blocks(
+    raw: list[tuple[str | None, datetime, datetime, int]],
+    first_day: date,
+    last_day: date,
+    tzinfo: ZoneInfo,
+) -> dict[date, list[tuple[str, datetime, datetime, int]]]:
+    """Localise raw ``(table_id, start, end, size)`` rows and bucket them like the day view."""
+    blocks = [
+        (
+            table_id or "",
+            _normalize_timezone(start, tzinfo),
+            _normalize_timezone(end, tzinfo),
+            size or 0,
+        )
+        for table_id, start, end, size in raw
+    ]
+    return _bucket_blocks_by_day(blocks, first_day, last_day, tzinfo)
+
+
+def occupancy_rows(
+    db,
+    rid: str,
+    schedule: CompiledSchedule,
+    day: date,
+    blocks: list[tuple[str, datetime, datetime, int]],
+) -> list[tuple[datetime, list[str]]]:
+    """``(slot_start, free table ids)`` for every slot of ``day`` across all of the tables."""
+    tables = db.eligible_tables(rid, 1)
+    occupancy = build_day_occupancy(db, rid, tables, blocks, schedule, day, 1)
+    return [
+        (occupancy.slot_start(k), occupancy.free_table_ids(k)) for k in range(occupancy.slot_count)
+    ]
+
+
+def _materialized_slots_payload(
+    rows: list[tuple[datetime, list[str]]],
+    schedule: CompiledSchedule,
+    day: date,
+    tables: list[dict[str, Any]],
+) -> list[dict[str, Any]] | None:
+    """Day-view slots from ``slot_occupancy`` rows, or ``None`` if they don't fit the grid."""
+    starts = schedule.slot_starts(day)
+    if len(rows) != len(starts) or (rows and rows[0][0] != starts[0]):
+        # Hours changed since the rows were written; the caller recomputes instead.
+        return None
+    eligible = {str(t.get("id")) for t in tables}
+    slots = []
+    for cur, (_, free) in zip(starts, rows, strict=True):
+        free_ids = [tid for tid in free if tid in eligible]
         slots.append(
             {
                 "start": cur.isoformat(timespec="seconds"),
-                "end": slot_end.isoformat(timespec="seconds"),
+                "end": (cur + RES_DURATION).isoformat(timespec="seconds"),
                 "available_table_ids": free_ids,
                 "count": len(free_ids),
             }
         )
-        cur += INTERVAL
+    return slots
+
+
+async def availability_for_range(
+    restaurant: Any, party_sizes: list[int], first_day: date, last_day: date, db
+) -> dict[str, Any]:
+    """
+    Per-day slot grids for every requested party size over ``first_day..last_day``.
+
+    Reservations for the whole window come from one query; each day's occupancy is built once
+    over the tables that seat the smallest party and narrowed per size with capacity masks.
+    Slots match what `availability_for_day` returns for the same day and party size.
+    """
+    rid, restaurant_tz = _restaurant_identity(restaurant)
+    schedule = _schedule_for(restaurant, db)
+    tzinfo = schedule.tzinfo
+    sizes = sorted(set(party_sizes))
+    tables: list[dict[str, Any]] = db.eligible_tables(rid, sizes[0])
+    capacities = [int(t.get("capacity", 2) or 2) for t in tables]
+
+    by_day = await _blocks_by_day(db, rid, restaurant_tz, tzinfo, first_day, last_day)
+
+    days = []
+    day = first_day
+    while day <= last_day:
+        occupancy = build_day_occupancy(
+            db, rid, tables, by_day.get(day, []), schedule, day, sizes[0]
+        )
+        grids = {
+            str(size): _slots_payload(occupancy, _capacity_mask(capacities, size)) for size in sizes
+        }
+        days.append({"date": day.isoformat(), "party_sizes": grids})
+        day += timedelta(days=1)
+
+    return {
+        "restaurant_timezone": restaurant_tz,
+        "from": first_day.isoformat(),
+        "to": last_day.isoformat(),
+        "party_sizes": sizes,
+        "days": days,
+    }
+
+
+async def next_available_slots(
+    restaurant: Any,
+    party_size: int,
+    after: datetime,
+    within_days: int,
+    limit: int,
+    db,
+) -> dict[str, Any]:
+    """
+    The first ``limit`` slots starting at or after ``after`` with a table for ``party_size``.
+
+    Service days are scanned in order from the one that may still be running at ``after``;
+    reservations are loaded lazily with one range query per chunk of days and the scan stops
+    as soon as enough slots are found. Slots are the day view's slots for the same party size.
+    """
+    rid, restaurant_tz = _restaurant_identity(restaurant)
+    schedule = _schedule_for(restaurant, db)
+    tzinfo = schedule.tzinfo
+    after = schedule.localize(after)
+    tables: list[dict[str, Any]] = db.eligible_tables(rid, party_size)
+    # Yesterday's service can still be running after midnight.
+    first_day = after.date() - timedelta(days=1)
+    last_day = after.date() + timedelta(days=max(1, within_days) - 1)
+
+    found: list[dict[str, Any]] = []
+    by_day: dict[date, list[tuple[str, datetime, datetime, int]]] = {}
+    loaded_through = first_day - timedelta(days=1)
+    day = first_day
+    if not tables:
+        day = last_day + timedelta(days=1)
+    while day <= last_day:
+        if found and len(found) >= limit:
+            # Only keep going while the next service could open before the last slot kept.
+            open_dt, _ = schedule.service_window(day)
+            if open_dt >= datetime.fromisoformat(found[limit - 1]["start"]):
+                break
+        _, close_dt = schedule.service_window(day)
+        if not schedule.slot_count(day) or close_dt - RES_DURATION < after:
+            day += timedelta(days=1)
+            continue
+        if day > loaded_through:
+            chunk_end = min(last_day, day + timedelta(days=NEXT_AVAILABLE_CHUNK_DAYS - 1))
+            by_day = await _blocks_by_day(db, rid, restaurant_tz, tzinfo, day, chunk_end)
+            loaded_through = chunk_end
+        occupancy = build_day_occupancy(
+            db, rid, tables, by_day.get(day, []), schedule, day, party_size
+        )
+        for slot in range(occupancy.slot_count):
+            start = occupancy.slot_start(slot)
+            if start < after:
+                continue
+            free_ids = occupancy.free_table_ids(slot)
+            if free_ids:
+                found.append(
+                    {
+                        "date": day.isoformat(),
+                        "start": start.isoformat(timespec="seconds"),
+                        "end": (start + RES_DURATION).isoformat(timespec="seconds"),
+                        "available_table_ids": free_ids,
+                        "count": len(free_ids),
+                    }
+                )
+        found.sort(key=lambda item: datetime.fromisoformat(item["start"]))
+        day += timedelta(days=1)
+
+    return {
+        "restaurant_timezone": restaurant_tz,
+        "party_size": party_size,
+        "after": after.isoformat(timespec="seconds"),
+        "searched_through": min(day - timedelta(days=1), last_day).isoformat(),
+        "slots": found[:limit],
+    }
+
+
+def _bookable_start(schedule: CompiledSchedule, day: date, at: time) -> datetime | None:
+    """Return the local start for ``day`` at ``at`` if a full reservation fits the hours."""
+    start = datetime.combine(day, at, tzinfo=schedule.tzinfo)
+    return start if schedule.fits_reservation(start) else None
+
+
+async def restaurants_with_table(
+    restaurants: list[Any], party_size: int, day: date, at: time, db
+) -> list[tuple[Any, list[str]]]:
+    """
+    Restaurants that can seat ``party_size`` at local ``day``/``at``, with their free tables.
+
+    Blocking reservations for all candidates come from one query over the union of their
+    reservation windows; each restaurant is then evaluated with a busy-table bitmask.
+    """
+    candidates: list[tuple[Any, str, list[dict[str, Any]], datetime, datetime]] = []
+    for restaurant in restaurants:
+        rid, _ = _restaurant_identity(restaurant)
+        tables = db.eligible_tables(rid, party_size)
+        if not tables:
+            continue
+        start = _bookable_start(_schedule_for(restaurant, db), day, at)
+        if start is None:
+            continue
+        candidates.append((restaurant, rid, tables, start, start + RES_DURATION))
+    if not candidates:
+        return []
+
+    window_start = min(c[3] for c in candidates).astimezone(UTC)
+    window_end = max(c[4] for c in candidates).astimezone(UTC)
+    blocks_by_rid = await db.reservation_blocks_by_restaurant(window_start, window_end)
 
-    return {"slots": slots, "restaurant_timezone": restaurant_tz}
+    matches: list[tuple[Any, list[str]]] = []
+    for restaurant, rid, tables, start, end in candidates:
+        table_ids = [str(t.get("id")) for t in tables]
+        busy = 0
+        blocks = blocks_by_rid.get(rid)
+        if blocks:
+            position = {tid: idx for idx, tid in enumerate(table_ids)}
+            for tid, block_start, block_end, size in blocks:
+                if not (block_start < end and block_end > start):
+                    continue
+                if not tid:
+                    tid = _assign_shared_block(
+                        db, rid, tables, (block_start, block_end), size or party_size
+                    )
+                for part in split_table_ids(tid):
+                    index = position.get(part)
+                    if index is not None:
+                        busy |= 1 << index
+        free_ids = [tid for idx, tid in enumerate(table_ids) if not busy >> idx & 1]
+        if free_ids:
+            matches.append((restaurant, free_ids))
+    return matches
@@ -1,19 +1,173 @@
 """
 Lightweight cache utilities used by the /dev cache endpoints.
 
-Currently only health checks maintain an in-memory cache; this module provides a
-stable interface so the FastAPI app can import `clear_all_caches` and
-`get_all_cache_stats` even if additional caches are added later.
+Health checks keep a small TTL cache; availability payloads are memoised in an LRU keyed by
+``(restaurant_id, local_date, party_size)`` and invalidated by the reservation write paths in
+`storage.Database`. `clear_all_caches` and `get_all_cache_stats` cover both.
 """
 
 from __future__ import annotations
 
+import time
+from collections import OrderedDict
+from datetime import date
+from threading import Lock
+from typing import Any
+
 from .health import health_checker
+from .metrics import (
+    cache_evictions_total,
+    cache_expirations_total,
+    cache_hits_total,
+    cache_misses_total,
+    cache_size,
+)
+from .settings import settings
+
+AvailabilityKey = tuple[str, date, int]
+
+
+class AvailabilityCache:
+    """
+    LRU cache for day availability payloads with per-(restaurant, day) invalidation.
+
+    Each invalidated (restaurant, day) pair records a fresh generation from a cache-wide
+    counter; `put` drops payloads computed against an older generation so a read racing a
+    write can never repopulate the cache with a stale grid. Pairs without a record report the
+    current floor. Once the records outgrow ``generation_limit`` they are all dropped and the
+    floor moves past every generation handed out so far, which only costs in-flight reads
+    their `put`. Invalidation is per process, so entries also
+    expire after ``ttl_seconds`` to bound staleness from writes made by other workers.
+    """
+
+    name = "availability"
+
+    def __init__(
+        self, max_entries: int, ttl_seconds: float = 0.0, generation_limit: int | None = None
+    ) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self.generation_limit = (
+            max(1024, 4 * self.max_entries) if generation_limit is None else generation_limit
+        )
+        self._entries: OrderedDict[AvailabilityKey, tuple[dict[str, Any], float]] = OrderedDict()
+        self._sizes_by_day: dict[tuple[str, date], set[int]] = {}
+        self._generations: dict[tuple[str, date], int] = {}
+        self._generation_counter = 0
+        self._generation_floor = 0
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def generation(self, rid: str, day: date) -> int:
+        return self._generations.get((rid, day), self._generation_floor)
+
+    def get(self, rid: str, day: date, party_size: int) -> dict[str, Any] | None:
+        if not self.enabled:
+            return None
+        key = (rid, day, party_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds and entry[1] <= time.monotonic():
+                del self._entries[key]
+                self._forget_size(rid, day, party_size)
+                self.expirations += 1
+                cache_expirations_total.labels(cache_name=self.name).inc()
+                entry = None
+            if entry is None:
+                self.misses += 1
+                cache_misses_total.labels(cache_name=self.name).inc()
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        cache_hits_total.labels(cache_name=self.name).inc()
+        return entry[0]
+
+    def put(
+        self, rid: str, day: date, party_size: int, payload: dict[str, Any], generation: int
+    ) -> None:
+        if not self.enabled:
+            return
+        key = (rid, day, party_size)
+        evicted = 0
+        with self._lock:
+            if self._generations.get((rid, day), self._generation_floor) != generation:
+                return
+            self._entries[key] = (payload, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            self._sizes_by_day.setdefault((rid, day), set()).add(party_size)
+            while len(self._entries) > self.max_entries:
+                (old_rid, old_day, old_size), _ = self._entries.popitem(last=False)
+                self._forget_size(old_rid, old_day, old_size)
+                evicted += 1
+            self.evictions += evicted
+            size = len(self._entries)
+        if evicted:
+            cache_evictions_total.labels(cache_name=self.name).inc(evicted)
+        cache_size.labels(cache_name=self.name).set(size)
+
+    def invalidate(self, rid: str, days: set[date] | list[date]) -> None:
+        """Drop every party size cached for the given restaurant days."""
+        with self._lock:
+            if len(self._generations) >= self.generation_limit:
+                self._reset_generations()
+            for day in days:
+                day_key = (rid, day)
+                self._generation_counter += 1
+                self._generations[day_key] = self._generation_counter
+                for party_size in self._sizes_by_day.pop(day_key, ()):
+                    self._entries.pop((rid, day, party_size), None)
+            size = len(self._entries)
+        cache_size.labels(cache_name=self.name).set(size)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes_by_day.clear()
+            # Move every generation on so in-flight computations are discarded too.
+            self._reset_generations()
+        cache_size.labels(cache_name=self.name).set(0)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+    def _reset_generations(self) -> None:
+        self._generation_counter += 1
+        self._generation_floor = self._generation_counter
+        self._generations.clear()
+
+    def _forget_size(self, rid: str, day: date, party_size: int) -> None:
+        sizes = self._sizes_by_day.get((rid, day))
+        if sizes is None:
+            return
+        sizes.discard(party_size)
+        if not sizes:
+            self._sizes_by_day.pop((rid, day), None)
+
+
+availability_cache = AvailabilityCache(
+    settings.AVAILABILITY_CACHE_MAX_ENTRIES, settings.AVAILABILITY_CACHE_TTL_SECONDS
+)
 
 
 def clear_all_caches() -> None:
     """Purge all in-process caches."""
     health_checker.clear_cache()
+    availability_cache.clear()
 
 
 def get_all_cache_stats() -> dict[str, dict]:
@@ -22,5 +176,6 @@ def get_all_cache_stats() -> dict[str, dict]:
         "health": {
             "entries": len(health_checker._check_cache),  # type: ignore[attr-defined]
             "ttl_seconds": getattr(health_checker, "_cache_ttl", None),
-        }
+        },
+        "availability": availability_cache.stats(),
     }
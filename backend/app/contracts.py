@@ -44,6 +44,24 @@ class RestaurantListItem(BaseModel):
     instagram: str | None = None
 
 
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class RestaurantFacets(BaseModel):
+    cuisine: list[FacetCount] = Field(default_factory=list)
+    neighborhood: list[FacetCount] = Field(default_factory=list)
+    price_level: list[FacetCount] = Field(default_factory=list)
+    tag_groups: dict[str, list[FacetCount]] = Field(default_factory=dict)
+
+
+class RestaurantPage(BaseModel):
+    items: list[RestaurantListItem]
+    total: int
+    facets: RestaurantFacets
+
+
 class Restaurant(BaseModel):
     id: str
     name: str
@@ -73,6 +91,9 @@ class Restaurant(BaseModel):
     areas: list[Area] = Field(default_factory=list)
     rating: float | None = None
     reviews_count: int = 0
+    rating_histogram: dict[str, int] = Field(
+        default_factory=lambda: {str(value): 0 for value in range(1, 6)}
+    )
 
 
 # --- Reservations ---
@@ -92,6 +113,13 @@ class ReservationCreate(BaseModel):
             raise ValueError("party_size must be >= 1")
         return v
 
+    @field_validator("start", "end")
+    @classmethod
+    def _whole_minute(cls, v: datetime) -> datetime:
+        if v.second or v.microsecond:
+            raise ValueError("reservation times must fall on a whole minute")
+        return v
+
     @field_validator("end")
     @classmethod
     def _end_after_start(cls, v: datetime, info):
@@ -1,3 +1,10 @@
-from .core import Base, get_session, init_db
+from .core import Base, get_read_session, get_session, get_write_session, init_db, pin_reads
 
-__all__ = ["Base", "get_session", "init_db"]
+__all__ = [
+    "Base",
+    "get_read_session",
+    "get_session",
+    "get_write_session",
+    "init_db",
+    "pin_reads",
+]
@@ -1,20 +1,145 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
+import time
 from contextlib import asynccontextmanager
 
-from sqlalchemy import text
+from sqlalchemy import event, inspect, text
+from sqlalchemy.exc import DisconnectionError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from ..metrics import db_pool_checked_out, db_pool_overflow, db_pool_wait_seconds
 from ..settings import settings
+from .instrumentation import install_query_hooks
 
-engine = create_async_engine(
-    settings.async_database_url,
-    future=True,
-    echo=False,
-    pool_pre_ping=True,
-)
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each checkout waited for a connection and publishes the
+    checked-out and overflow gauges once a checkout or return has completed.
+    """
+
+    pool_name = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait_seconds.labels(pool=self.pool_name).observe(time.perf_counter() - started)
+            self._publish()
+
+    def _do_return_conn(self, record) -> None:
+        try:
+            super()._do_return_conn(record)
+        finally:
+            self._publish()
+
+    def _publish(self) -> None:
+        db_pool_checked_out.labels(pool=self.pool_name).set(self.checkedout())
+        db_pool_overflow.labels(pool=self.pool_name).set(max(0, self.overflow()))
+
+
+def sqlite_pragmas(profile: str) -> list[str]:
+    """
+    Statements run on every new SQLite connection. ``production`` switches to WAL (readers no
+    longer wait for the writer), relaxes fsyncs to checkpoints, waits on locks instead of
+    failing and sizes the page cache and memory map; ``default`` keeps SQLite's stock settings.
+    """
+    if profile != "production":
+        return []
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE_MB * 1024 * 1024}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_MB * 1024}",
+        "PRAGMA foreign_keys=ON",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def _pool_options(url: str, name: str) -> dict:
+    if url.startswith("sqlite"):
+        if ":memory:" in url:
+            return {}
+        return {
+            "poolclass": type(f"{name}_pool", (TimedQueuePool,), {"pool_name": name}),
+            "pool_size": settings.SQLITE_POOL_SIZE,
+            "max_overflow": settings.SQLITE_MAX_OVERFLOW,
+            "pool_timeout": settings.SQLITE_POOL_TIMEOUT_SECONDS,
+        }
+    options = {
+        "poolclass": type(f"{name}_pool", (TimedQueuePool,), {"pool_name": name}),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+    if "+asyncpg" in url:
+        # The asyncpg dialect prepares every statement server-side; this sizes its
+        # per-connection LRU of prepared statements.
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE
+        }
+    return options
+
+
+def _watch_pool(created) -> None:
+    """
+    Replace `pool_pre_ping`'s round-trip on every checkout with a ping only for connections
+    idle longer than `DB_POOL_PING_AFTER_IDLE_SECONDS`.
+    """
+
+    @event.listens_for(created.sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, record, _proxy) -> None:
+        idle_after = settings.DB_POOL_PING_AFTER_IDLE_SECONDS
+        returned = record.info.get("checked_in_at")
+        if idle_after > 0 and returned is not None and time.monotonic() - returned > idle_after:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            except Exception as exc:
+                # The pool discards this connection and checks out another.
+                raise DisconnectionError() from exc
+            finally:
+                cursor.close()
+
+    @event.listens_for(created.sync_engine, "checkin")
+    def _on_checkin(_dbapi_connection, record) -> None:
+        record.info["checked_in_at"] = time.monotonic()
+
+
+def _create_engine(url: str, name: str):
+    is_sqlite = url.startswith("sqlite")
+    created = create_async_engine(
+        url,
+        future=True,
+        echo=False,
+        pool_pre_ping=settings.DB_POOL_PING_AFTER_IDLE_SECONDS == 0,
+        **_pool_options(url, name),
+    )
+    _watch_pool(created)
+    install_query_hooks(created.sync_engine)
+    pragmas = sqlite_pragmas(settings.SQLITE_PROFILE) if is_sqlite else []
+    if pragmas:
+
+        @event.listens_for(created.sync_engine, "connect")
+        def _apply_pragmas(dbapi_connection, _record) -> None:
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+
+    return created
+
+
+engine = _create_engine(settings.async_database_url, "primary")
 
 SessionLocal = async_sessionmaker(
     bind=engine,
@@ -23,22 +148,126 @@ SessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Optional read replicas (`DATABASE_READ_URL`); without any, reads use the primary.
+read_engines = [
+    _create_engine(url, f"replica{index}")
+    for index, url in enumerate(settings.async_read_database_urls)
+]
+read_session_factories = [
+    async_sessionmaker(bind=replica, autoflush=False, autocommit=False, expire_on_commit=False)
+    for replica in read_engines
+]
+
 Base = declarative_base()
 
+_replica_turn = itertools.count()
+# Read key -> monotonic deadline until which its reads stay on the primary.
+_pinned_until: dict[str, float] = {}
+PIN_PRUNE_THRESHOLD = 10_000
+
 
 @asynccontextmanager
-async def get_session() -> AsyncSession:
+async def get_write_session() -> AsyncSession:
+    """A session on the primary: every write, and reads that must see them."""
     async with SessionLocal() as session:
         yield session
 
 
+# Callers that predate read routing; they all stay on the primary.
+get_session = get_write_session
+
+
+def pin_reads(*keys: str) -> None:
+    """
+    Keep reads for ``keys`` on the primary for `DATABASE_READ_PIN_SECONDS`, so whoever just
+    wrote reads their own write instead of a lagging replica. Pins are per process.
+    """
+    if not read_session_factories or settings.DATABASE_READ_PIN_SECONDS <= 0:
+        return
+    now = time.monotonic()
+    if len(_pinned_until) > PIN_PRUNE_THRESHOLD:
+        for key, deadline in list(_pinned_until.items()):
+            if deadline <= now:
+                del _pinned_until[key]
+    deadline = now + settings.DATABASE_READ_PIN_SECONDS
+    for key in keys:
+        _pinned_until[key] = deadline
+
+
+def reads_pinned(*keys: str) -> bool:
+    now = time.monotonic()
+    return any(_pinned_until.get(key, 0.0) > now for key in keys)
+
+
+@asynccontextmanager
+async def get_read_session(*keys: str) -> AsyncSession:
+    """
+    A session for reads that tolerate replica lag: the next replica in round-robin order, or
+    the primary when there is none or any of ``keys`` was written recently (`pin_reads`).
+    """
+    factories = read_session_factories
+    if not factories or reads_pinned(*keys):
+        factory = SessionLocal
+    else:
+        factory = factories[next(_replica_turn) % len(factories)]
+    async with factory() as session:
+        yield session
+
+
 async def init_db() -> None:
     from . import models  # noqa: F401 - ensure models registered
 
     async with engine.begin() as conn:
-        if conn.dialect.name == "postgresql":
-            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_add_missing_indexes)
+
+
+def _add_missing_columns(sync_conn) -> None:
+    """`create_all` never alters existing tables; add nullable columns introduced since."""
+    inspector = inspect(sync_conn)
+    existing_tables = set(inspector.get_table_names())
+    preparer = sync_conn.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=sync_conn.dialect)
+            sync_conn.execute(
+                text(
+                    f"ALTER TABLE {preparer.quote(table.name)} "
+                    f"ADD COLUMN {preparer.quote(column.name)} {column_type}"
+                )
+            )
+
+
+def _add_missing_indexes(sync_conn) -> None:
+    """Likewise, `create_all` only creates indexes together with a new table."""
+    inspector = inspect(sync_conn)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in present:
+                index.create(sync_conn)
+
+
+async def sqlite_maintenance() -> bool:
+    """
+    Checkpoint the WAL back into the database file (without waiting on readers) and let
+    SQLite refresh its planner statistics. Returns ``False`` when there is nothing to maintain.
+    """
+    if engine.dialect.name != "sqlite" or settings.SQLITE_PROFILE != "production":
+        return False
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("PRAGMA wal_checkpoint(PASSIVE)")
+        await conn.exec_driver_sql("PRAGMA optimize")
+    return True
 
 
 def ensure_db_initialized() -> None:
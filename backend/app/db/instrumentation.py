@@ -0,0 +1,194 @@
+"""
+Statement- and operation-level database instrumentation.
+
+Cursor hooks on every engine count statements into the active `QueryCounter`s (one per HTTP
+request via `QueryCountMiddleware`, plus any `assert_max_queries` block) and log statements
+slower than `DB_SLOW_QUERY_MS` with normalised SQL and the shape of their parameters.
+`instrument_operations` times each `Database` coroutine into the `db_operation_*` metrics.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import re
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from ..metrics import (
+    db_operation_duration_seconds,
+    db_operations_total,
+    db_queries_per_request,
+    db_slow_queries_total,
+    normalize_endpoint,
+)
+from ..settings import settings
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|(?<!:):\w+|%s")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class QueryCounter:
+    """Statements executed while the counter was active, in order (normalised SQL)."""
+
+    statements: list[str] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+_request_counter: ContextVar[QueryCounter | None] = ContextVar("db_query_counter", default=None)
+# Counters that see every statement in the process, whichever thread or task runs it.
+_global_counters: list[QueryCounter] = []
+
+
+def normalize_sql(statement: str) -> str:
+    """Literals and placeholders become ``?`` and placeholder lists ``(?, ...)``."""
+    normalised = _STRING_LITERAL.sub("?", statement)
+    normalised = _PLACEHOLDER.sub("?", normalised)
+    normalised = _NUMBER_LITERAL.sub("?", normalised)
+    normalised = _PLACEHOLDER_LIST.sub("(?, ...)", normalised)
+    return _WHITESPACE.sub(" ", normalised).strip()
+
+
+def bind_shape(parameters: Any, executemany: bool = False) -> str:
+    """Parameter types without values, e.g. ``(str, datetime x 2)`` or ``3 x {id: str}``."""
+    if executemany and isinstance(parameters, list | tuple) and parameters:
+        return f"{len(parameters)} x {bind_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, list | tuple):
+        runs: list[list[Any]] = []
+        for value in parameters:
+            name = type(value).__name__
+            if runs and runs[-1][0] == name:
+                runs[-1][1] += 1
+            else:
+                runs.append([name, 1])
+        return "(" + ", ".join(name if n == 1 else f"{name} x {n}" for name, n in runs) + ")"
+    return type(parameters).__name__
+
+
+def install_query_hooks(sync_engine) -> None:
+    """Count and time every statement ``sync_engine`` executes."""
+
+    # The start time lives on the statement's execution context, so a statement that raises
+    # (and never reaches ``after_cursor_execute``) leaves nothing behind on the connection.
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(_conn, _cursor, _statement, _parameters, context, _executemany) -> None:
+        if context is not None:
+            context.query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(_conn, _cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        counters = list(_global_counters)
+        request_counter = _request_counter.get()
+        if request_counter is not None:
+            counters.append(request_counter)
+        slow = elapsed * 1000 >= settings.DB_SLOW_QUERY_MS > 0
+        if not counters and not slow:
+            return
+        normalised = normalize_sql(statement)
+        for counter in counters:
+            counter.statements.append(normalised)
+        if slow:
+            db_slow_queries_total.inc()
+            logger.warning(
+                "Slow query (%.1f ms): %s params=%s",
+                elapsed * 1000,
+                normalised,
+                bind_shape(parameters, executemany),
+            )
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """Count the statements the current task (and tasks it starts) executes."""
+    counter = QueryCounter()
+    token = _request_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _request_counter.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryCounter]:
+    """
+    Test helper: fail when the block runs more than ``limit`` statements. Counts process-wide,
+    so it also sees statements an endpoint runs in `TestClient`'s event loop thread.
+    """
+    counter = QueryCounter()
+    _global_counters.append(counter)
+    try:
+        yield counter
+    finally:
+        _global_counters.remove(counter)
+    if counter.count > limit:
+        listing = "\n".join(f"  {sql}" for sql in counter.statements)
+        raise AssertionError(
+            f"{counter.count} queries executed, expected at most {limit}:\n{listing}"
+        )
+
+
+class QueryCountMiddleware(BaseHTTPMiddleware):
+    """Record how many statements each request runs and warn about suspiciously many."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        with count_queries() as counter:
+            response = await call_next(request)
+        endpoint = normalize_endpoint(request.url.path)
+        db_queries_per_request.labels(method=request.method, endpoint=endpoint).observe(
+            counter.count
+        )
+        if counter.count > settings.DB_REQUEST_QUERY_WARN > 0:
+            logger.warning("%s %s ran %d queries", request.method, request.url.path, counter.count)
+        return response
+
+
+def instrument_operations(cls: type) -> type:
+    """Time every public coroutine method of ``cls`` into the `db_operation_*` metrics."""
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(method):
+            continue
+        setattr(cls, name, _timed_operation(name, method))
+    return cls
+
+
+def _timed_operation(name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(method)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        status = "error"
+        try:
+            result = await method(*args, **kwargs)
+            status = "success"
+            return result
+        finally:
+            db_operations_total.labels(operation=name, status=status).inc()
+            db_operation_duration_seconds.labels(operation=name).observe(
+                time.perf_counter() - started
+            )
+
+    return wrapper
@@ -3,18 +3,17 @@ from __future__ import annotations
 import uuid
 
 from sqlalchemy import (
-    CheckConstraint,
     Column,
+    Date,
     DateTime,
+    Index,
     Integer,
     String,
-    UniqueConstraint,
     func,
     text,
 )
 from sqlalchemy.types import JSON
 
-from ..settings import settings
 from .core import Base
 
 
@@ -23,7 +22,8 @@ class ReservationRecord(Base):
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     restaurant_id = Column(String(64), nullable=False, index=True)
-    table_id = Column(String(64), nullable=True, index=True)
+    # Combined-table bookings store "<id>+<id>[+<id>]" (see table_assignment).
+    table_id = Column(String(128), nullable=True, index=True)
     party_size = Column(Integer, nullable=False)
     start = Column(DateTime(timezone=True), nullable=False, index=True)
     end = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -40,32 +40,102 @@ class ReservationRecord(Base):
     )
 
 
-constraints = [
-    UniqueConstraint("restaurant_id", "table_id", "start", name="uq_reservation_slot"),
-    CheckConstraint("end > start", name="ck_reservation_times"),
-]
+# Keyset pagination walks (start, id); each listing filter leads its own composite index.
+Index("ix_reservations_start_id", ReservationRecord.start, ReservationRecord.id)
+Index(
+    "ix_reservations_owner_start_id",
+    ReservationRecord.owner_id,
+    ReservationRecord.start,
+    ReservationRecord.id,
+)
+Index(
+    "ix_reservations_restaurant_start_id",
+    ReservationRecord.restaurant_id,
+    ReservationRecord.start,
+    ReservationRecord.id,
+)
+Index(
+    "ix_reservations_status_start_id",
+    ReservationRecord.status,
+    ReservationRecord.start,
+    ReservationRecord.id,
+)
+
+
+class ReservationArchiveRecord(Base):
+    """
+    Reservations that ended before the archive horizon, moved out of `reservations` so the
+    availability and conflict queries only scan live rows. On Postgres the table is
+    partitioned by month of ``start`` (the partition key has to be part of the primary key).
+    """
+
+    __tablename__ = "reservations_archive"
+    __table_args__ = {"postgresql_partition_by": "RANGE (start)"}
+
+    id = Column(String(36), primary_key=True)
+    start = Column(DateTime(timezone=True), primary_key=True)
+    restaurant_id = Column(String(64), nullable=False)
+    table_id = Column(String(128), nullable=True)
+    party_size = Column(Integer, nullable=False)
+    end = Column(DateTime(timezone=True), nullable=False)
+    guest_name = Column(String(255), nullable=False)
+    guest_phone = Column(String(50), nullable=True)
+    status = Column(String(20), nullable=False)
+    owner_id = Column(String(128), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+Index("ix_reservations_archive_id", ReservationArchiveRecord.id)
+Index(
+    "ix_reservations_archive_owner_start_id",
+    ReservationArchiveRecord.owner_id,
+    ReservationArchiveRecord.start,
+    ReservationArchiveRecord.id,
+)
+Index(
+    "ix_reservations_archive_restaurant_start_id",
+    ReservationArchiveRecord.restaurant_id,
+    ReservationArchiveRecord.start,
+    ReservationArchiveRecord.id,
+)
 
-if settings.database_url.startswith("postgresql"):
-    try:
-        from sqlalchemy.dialects.postgresql import ExcludeConstraint
 
-        constraints.append(
-            ExcludeConstraint(
-                (
-                    func.tstzrange(ReservationRecord.start, ReservationRecord.end, "[]"),
-                    "&&",
-                ),
-                (ReservationRecord.restaurant_id, "="),
-                (ReservationRecord.table_id, "="),
-                name="reservations_no_overlap",
-                using="gist",
-            )
-        )
-    except Exception:
-        # Skip exclusion constraint if dialect/types unavailable (e.g., SQLite)
-        pass
+class SlotClaimRecord(Base):
+    """
+    One row per table and claim bucket touched by blocking reservations. Bookings upsert the
+    rows of their buckets, which locks them until commit: two overlapping bookings of a table
+    share at least one bucket, so the second waits for the first and then sees it when it
+    checks exact overlap, without any table-wide lock. ``reservation_id`` is the latest
+    booking to claim the bucket.
+    """
 
-ReservationRecord.__table_args__ = tuple(constraints)
+    __tablename__ = "slot_claims"
+
+    restaurant_id = Column(String(64), primary_key=True)
+    # A component table id, or "*" for restaurants booked without tables.
+    table_id = Column(String(64), primary_key=True)
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    reservation_id = Column(String(36), nullable=False, index=True)
+
+
+class SlotOccupancyRecord(Base):
+    """Free tables per reservation slot, rewritten in the same commit as reservation writes."""
+
+    __tablename__ = "slot_occupancy"
+
+    restaurant_id = Column(String(64), primary_key=True)
+    local_date = Column(Date, primary_key=True)
+    slot_start = Column(DateTime(timezone=True), primary_key=True)
+    free_table_count = Column(Integer, nullable=False)
+    free_table_ids = Column(JSON, nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
 
 
 class RestaurantRecord(Base):
@@ -79,6 +149,17 @@ class RestaurantRecord(Base):
     cuisine = Column(JSON, nullable=True)
     tags = Column(JSON, nullable=True)
     payload = Column(JSON, nullable=False, server_default=text("'{}'"))
+    # sha256 of the canonical seed payload; startup sync skips rows whose hash is unchanged.
+    content_hash = Column(String(64), nullable=True)
+    # Running review aggregates, bumped in the review insert transaction. NULL until first
+    # hydrated from `reviews` (rows created before these columns existed).
+    rating_sum = Column(Integer, nullable=True)
+    rating_count = Column(Integer, nullable=True)
+    rating_1 = Column(Integer, nullable=True)
+    rating_2 = Column(Integer, nullable=True)
+    rating_3 = Column(Integer, nullable=True)
+    rating_4 = Column(Integer, nullable=True)
+    rating_5 = Column(Integer, nullable=True)
 
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(
@@ -0,0 +1,212 @@
+"""
+Bitmap facet index for filtering and sorting the restaurant catalog.
+
+`Database` numbers restaurants in catalog order (the same positions `SearchIndex` uses) and
+registers each one's facet values here. Every ``(dimension, value)`` pair owns a Python ``int``
+used as a bitmap over those positions, so a filter is a handful of ``|`` and ``&`` operations
+and a facet count is ``(bitmap & selection).bit_count()`` — no pass over the catalog per
+request. Ratings live in 0.1-wide bucket bitmaps that move a restaurant between buckets when a
+review lands, and sort orders are cached until a rating or review count changes.
+
+Facet counts are disjunctive: values within one dimension are OR-ed, dimensions are AND-ed,
+and each dimension's counts ignore that dimension's own selection, so picking "seafood" still
+shows how many restaurants the other cuisines would add.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Collection, Iterable
+from itertools import compress
+
+from .search import fold
+
+RATING_BUCKETS = 10  # buckets per rating point
+_FLAGS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def _bucket(rating: float) -> int:
+    return math.floor(round(rating * RATING_BUCKETS, 6))
+
+
+class FacetIndex:
+    def __init__(self) -> None:
+        self._size = 0
+        self._bitmaps: dict[str, dict[str, int]] = {}
+        self._labels: dict[str, dict[str, str]] = {}
+        self._names: list[str] = []
+        self._ratings: list[float] = []
+        self._reviews: list[int] = []
+        self._rating_bitmaps: dict[int, int] = {}
+        self._orders: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def everything(self) -> int:
+        return (1 << self._size) - 1
+
+    def add(
+        self,
+        facets: dict[str, Iterable[str] | str | None],
+        *,
+        name: str,
+        rating: float = 0.0,
+        reviews_count: int = 0,
+    ) -> int:
+        """Register one restaurant's facet values; returns its position."""
+        doc = self._size
+        self._size += 1
+        bit = 1 << doc
+        for dimension, values in facets.items():
+            if values is None:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            bitmaps = self._bitmaps.setdefault(dimension, {})
+            labels = self._labels.setdefault(dimension, {})
+            for value in values:
+                if not value:
+                    continue
+                key = str(value).casefold()
+                labels.setdefault(key, str(value))
+                bitmaps[key] = bitmaps.get(key, 0) | bit
+        self._names.append(fold(name))
+        self._ratings.append(0.0)
+        self._reviews.append(0)
+        self._rating_bitmaps[0] = self._rating_bitmaps.get(0, 0) | bit
+        self.set_rating(doc, rating, reviews_count)
+        self._orders.clear()
+        return doc
+
+    def set_rating(self, doc: int, rating: float, reviews_count: int) -> None:
+        """Move one restaurant to its new rating bucket; other bitmaps are untouched."""
+        old, new = _bucket(self._ratings[doc]), _bucket(rating)
+        if old != new:
+            bit = 1 << doc
+            self._rating_bitmaps[old] &= ~bit
+            self._rating_bitmaps[new] = self._rating_bitmaps.get(new, 0) | bit
+        if self._ratings[doc] != rating or self._reviews[doc] != reviews_count:
+            self._ratings[doc] = rating
+            self._reviews[doc] = reviews_count
+            self._orders.pop("rating", None)
+            self._orders.pop("reviews_count", None)
+
+    def _value_bitmap(self, dimension: str, values: Collection[str]) -> int:
+        bitmaps = self._bitmaps.get(dimension, {})
+        bitmap = 0
+        for value in values:
+            bitmap |= bitmaps.get(str(value).casefold(), 0)
+        return bitmap
+
+    def _rating_bitmap(self, min_rating: float) -> int:
+        threshold = _bucket(min_rating)
+        bitmap = 0
+        for bucket, members in self._rating_bitmaps.items():
+            if bucket > threshold:
+                bitmap |= members
+        # Restaurants in the boundary bucket are compared one by one; a bucket is 0.1 wide.
+        boundary = self._rating_bitmaps.get(threshold, 0)
+        for doc in self.members(boundary):
+            if self._ratings[doc] >= min_rating:
+                bitmap |= 1 << doc
+        return bitmap
+
+    def select(
+        self,
+        filters: dict[str, Collection[str]],
+        min_rating: float | None = None,
+        within: int | None = None,
+    ) -> tuple[int, dict[str, int]]:
+        """
+        The selection bitmap for ``filters`` and, per facet dimension, the bitmap to count that
+        dimension's values against (every filter except the dimension's own).
+        """
+        base = self.everything if within is None else within
+        if min_rating is not None:
+            base &= self._rating_bitmap(min_rating)
+        chosen = {
+            dimension: self._value_bitmap(dimension, values)
+            for dimension, values in filters.items()
+            if values
+        }
+        selection = base
+        for bitmap in chosen.values():
+            selection &= bitmap
+        contexts: dict[str, int] = {}
+        for dimension in self._bitmaps:
+            context = base
+            for other, bitmap in chosen.items():
+                if other != dimension:
+                    context &= bitmap
+            contexts[dimension] = context
+        return selection, contexts
+
+    def counts(
+        self, contexts: dict[str, int], filters: dict[str, Collection[str]] | None = None
+    ) -> dict[str, list[tuple[str, int]]]:
+        """
+        Per dimension, ``(value, count)`` pairs with a non-zero count (selected values are kept
+        even at zero), most common first.
+        """
+        filters = filters or {}
+        result: dict[str, list[tuple[str, int]]] = {}
+        for dimension, context in contexts.items():
+            labels = self._labels[dimension]
+            selected = {str(value).casefold() for value in filters.get(dimension, ())}
+            pairs = []
+            for key, bitmap in self._bitmaps[dimension].items():
+                count = (bitmap & context).bit_count()
+                if count or key in selected:
+                    pairs.append((labels[key], count))
+            pairs.sort(key=lambda pair: (-pair[1], pair[0]))
+            result[dimension] = pairs
+        return result
+
+    def flags(self, bitmap: int) -> bytes:
+        """One byte per position, 1 where ``bitmap`` has the bit set (for C-level filtering)."""
+        return bin(bitmap)[:1:-1].ljust(self._size, "0").encode().translate(_FLAGS)
+
+    def bitmap(self, docs: Iterable[int]) -> int:
+        digits = bytearray(b"0" * self._size)
+        for doc in docs:
+            digits[doc] = 49
+        return int(digits[::-1] or b"0", 2)
+
+    def members(self, bitmap: int) -> list[int]:
+        return list(compress(range(self._size), self.flags(bitmap)))
+
+    def order(self, sort: str) -> list[int]:
+        """
+        Positions sorted best first by ``sort``: rating or review count descending, name, or
+        ``catalog`` (insertion) order.
+        """
+        order = self._orders.get(sort)
+        if order is None:
+            names, ratings, reviews = self._names, self._ratings, self._reviews
+            if sort == "catalog":
+                key = None
+            elif sort == "rating":
+                key = lambda doc: (-ratings[doc], -reviews[doc], names[doc])  # noqa: E731
+            elif sort == "reviews_count":
+                key = lambda doc: (-reviews[doc], -ratings[doc], names[doc])  # noqa: E731
+            elif sort == "name":
+                key = names.__getitem__
+            else:
+                raise ValueError(f"Unknown sort: {sort}")
+            order = self._orders[sort] = sorted(range(self._size), key=key)
+        return order
+
+    def page(
+        self, bitmap: int, sort: str, limit: int | None = None, offset: int = 0
+    ) -> tuple[list[int], int]:
+        """One page of the positions in ``bitmap`` in ``sort`` order, and their total."""
+        order = self.order(sort)
+        flags = self.flags(bitmap)
+        selected = list(compress(order, map(flags.__getitem__, order)))
+        stop = None if limit is None else offset + limit
+        return selected[offset:stop], len(selected)
+
+
+__all__ = ["FacetIndex"]
@@ -67,8 +67,7 @@ class HealthChecker:
             restaurant_count = len(restaurants)
 
             # Try to read reservations
-            reservations = await DB.list_reservations()
-            reservation_count = len(reservations)
+            reservation_count = await DB.count_reservations()
 
             return {
                 "status": "ok",
@@ -0,0 +1,168 @@
+"""
+In-process fan-out of live availability changes.
+
+`storage.Database` publishes the restaurant days touched by every reservation write through
+`availability_hub.publish`. Subscribers watching the same ``(restaurant, day, party size)``
+share one channel: the channel recomputes the day once per burst of writes, diffs it against
+the last grid it sent and fans the changed slots out to every subscriber queue. Like the
+availability cache this only sees writes made by the current process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import date
+from typing import Any
+
+from .availability import cached_availability_for_day
+
+logger = logging.getLogger(__name__)
+
+ChannelKey = tuple[str, date, int]
+Event = tuple[str, dict[str, Any]]
+
+SUBSCRIBER_QUEUE_SIZE = 32
+
+
+def _slots_by_start(payload: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    return {slot["start"]: slot for slot in payload.get("slots", [])}
+
+
+def slot_delta(previous: dict[str, Any], current: dict[str, Any]) -> list[dict[str, Any]]:
+    """Slots of ``current`` that differ from (or are missing in) ``previous``."""
+    before = _slots_by_start(previous)
+    return [slot for slot in current.get("slots", []) if before.get(slot["start"]) != slot]
+
+
+class Subscription:
+    __slots__ = ("key", "queue")
+
+    def __init__(self, key: ChannelKey) -> None:
+        self.key = key
+        self.queue: asyncio.Queue[Event] = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def push(self, event: Event, snapshot: dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A consumer this far behind gets a fresh snapshot instead of the backlog.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(("snapshot", snapshot))
+
+
+class _Channel:
+    def __init__(
+        self,
+        key: ChannelKey,
+        loader: Callable[[], Awaitable[dict[str, Any]]],
+        payload: dict[str, Any],
+    ) -> None:
+        self.key = key
+        self.loader = loader
+        self.payload = payload
+        self.loop = asyncio.get_running_loop()
+        self.subscribers: set[Subscription] = set()
+        self.refreshing = False
+        self.dirty = False
+
+    def schedule_refresh(self) -> None:
+        if self.refreshing:
+            self.dirty = True
+            return
+        self.refreshing = True
+        self.loop.create_task(self._refresh())
+
+    async def _refresh(self) -> None:
+        try:
+            while True:
+                self.dirty = False
+                current = await self.loader()
+                changed = slot_delta(self.payload, current)
+                self.payload = current
+                if changed:
+                    rid, day, party_size = self.key
+                    event = (
+                        "delta",
+                        {
+                            "restaurant_id": rid,
+                            "date": day.isoformat(),
+                            "party_size": party_size,
+                            "slots": changed,
+                        },
+                    )
+                    for subscriber in list(self.subscribers):
+                        subscriber.push(event, current)
+                if not self.dirty:
+                    break
+        except Exception:  # pragma: no cover - keep the channel alive for the next write
+            logger.exception("Failed to refresh live availability for %s", self.key)
+        finally:
+            self.refreshing = False
+
+
+class AvailabilityHub:
+    def __init__(self) -> None:
+        self._channels: dict[ChannelKey, _Channel] = {}
+        self._days_by_restaurant: dict[str, set[date]] = {}
+
+    async def subscribe(
+        self, restaurant: Any, party_size: int, day: date, db
+    ) -> tuple[Subscription, dict[str, Any]]:
+        """Register a subscriber; returns it with the snapshot deltas will apply to."""
+        rid = str(restaurant["id"] if isinstance(restaurant, dict) else restaurant.id)
+        key = (rid, day, party_size)
+        channel = self._channels.get(key)
+        if channel is None:
+
+            async def loader() -> dict[str, Any]:
+                return await cached_availability_for_day(restaurant, party_size, day, db)
+
+            channel = _Channel(key, loader, await loader())
+            # Another subscriber may have opened the channel while the first grid loaded.
+            channel = self._channels.setdefault(key, channel)
+            self._days_by_restaurant.setdefault(rid, set()).add(day)
+        subscription = Subscription(key)
+        channel.subscribers.add(subscription)
+        return subscription, channel.payload
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        channel = self._channels.get(subscription.key)
+        if channel is None:
+            return
+        channel.subscribers.discard(subscription)
+        if not channel.subscribers:
+            del self._channels[subscription.key]
+            rid, day, _ = subscription.key
+            if not any(k[0] == rid and k[1] == day for k in self._channels):
+                days = self._days_by_restaurant.get(rid)
+                if days is not None:
+                    days.discard(day)
+                    if not days:
+                        del self._days_by_restaurant[rid]
+
+    def publish(self, rid: str, days: set[date] | list[date]) -> None:
+        """Signal that reservations for ``rid`` on ``days`` changed; safe from any thread."""
+        watched = self._days_by_restaurant.get(rid)
+        if not watched:
+            return
+        for key, channel in list(self._channels.items()):
+            if key[0] == rid and key[1] in days:
+                try:
+                    channel.loop.call_soon_threadsafe(channel.schedule_refresh)
+                except RuntimeError:  # pragma: no cover - subscriber loop already closed
+                    self._channels.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "channels": len(self._channels),
+            "subscribers": sum(len(c.subscribers) for c in self._channels.values()),
+        }
+
+
+availability_hub = AvailabilityHub()
+
+
+__all__ = ["AvailabilityHub", "Subscription", "availability_hub", "slot_delta"]
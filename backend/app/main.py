@@ -1,4 +1,6 @@
+import asyncio
 import warnings
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 from typing import Any
 from uuid import UUID
@@ -9,6 +11,7 @@ from fastapi.responses import JSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 
+from .api.routes import availability as availability_routes
 from .api.routes import concierge as concierge_routes
 from .api.routes import reservations as reservations_routes
 from .api.routes import restaurants as restaurants_routes
@@ -16,11 +19,14 @@ from .api_v1 import v1_router
 from .auth import require_auth
 from .backup import backup_manager
 from .cache import clear_all_caches, get_all_cache_stats
+from .db.core import sqlite_maintenance
+from .db.instrumentation import QueryCountMiddleware
 from .health import health_checker
 from .logging_config import configure_structlog, get_logger
 from .metrics import PrometheusMiddleware, get_metrics
+from .services import services
 from .settings import settings
-from .storage import DB
+from .storage import DB, BookingConflict, Database
 from .ui import router as ui_router
 from .utils import (
     add_cors,
@@ -52,10 +58,64 @@ if settings.SENTRY_DSN:
         traces_sample_rate=settings.SENTRY_TRACES_SAMPLE_RATE,
     )
 
+
+@services.phase("catalog")
+async def _load_catalog() -> None:
+    if not DB.built:
+        # Seed parsing is CPU-bound; keep the loop free while it runs.
+        await DB.provide(await asyncio.to_thread(Database)).startup()
+
+
+@services.phase("concierge", required=False)
+async def _load_concierge() -> None:
+    await asyncio.to_thread(concierge_routes.ENGINE.get)
+
+
+async def _archive_periodically() -> None:
+    """Move reservations past the archive horizon out of the live table, once per interval."""
+    while True:
+        try:
+            moved = await DB.archive_reservations()
+        except Exception:
+            logger.exception("Reservation archival failed")
+        else:
+            if moved:
+                logger.info("Archived reservations", count=moved)
+        await asyncio.sleep(settings.RESERVATION_ARCHIVE_INTERVAL_SECONDS)
+
+
+async def _maintain_sqlite_periodically() -> None:
+    """Checkpoint the SQLite WAL and refresh planner statistics, once per interval."""
+    while True:
+        await asyncio.sleep(settings.SQLITE_MAINTENANCE_INTERVAL_SECONDS)
+        try:
+            if not await sqlite_maintenance():
+                return
+        except Exception:
+            logger.exception("SQLite maintenance failed")
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    await services.startup()
+    background = []
+    if settings.RESERVATION_ARCHIVE_AFTER_DAYS > 0 and DB.built:
+        background.append(asyncio.create_task(_archive_periodically()))
+    if settings.SQLITE_MAINTENANCE_INTERVAL_SECONDS > 0:
+        background.append(asyncio.create_task(_maintain_sqlite_periodically()))
+    yield
+    for task in background:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await services.shutdown()
+
+
 app = FastAPI(
     title="Baku Reserve API",
     version="0.1.0",
     description="Restaurant reservation system for Baku, Azerbaijan",
+    lifespan=lifespan,
 )
 add_cors(app)
 add_security_headers(app)
@@ -63,6 +123,7 @@ add_request_id_tracing(app)
 add_rate_limiting(app)
 app.add_middleware(APIVersionMiddleware, current_version="1.0", latest_version="1.0")
 app.add_middleware(PrometheusMiddleware)
+app.add_middleware(QueryCountMiddleware)
 
 API_PREFIX = "/v1"
 LEGACY_API_PREFIXES = ("/restaurants", "/reservations")
@@ -99,6 +160,7 @@ async def legacy_prefix_upgrade(request: Request, call_next):  # type: ignore[ov
 
 # Include v1 API router (versioned endpoints)
 app.include_router(restaurants_routes.router, prefix=API_PREFIX)
+app.include_router(availability_routes.router, prefix=API_PREFIX)
 app.include_router(reservations_routes.router, prefix=API_PREFIX)
 app.include_router(concierge_routes.router, prefix=API_PREFIX)
 app.include_router(v1_router)
@@ -116,6 +178,16 @@ if PHOTO_DIR.exists():
 logger = get_logger(__name__)
 
 
+@app.exception_handler(BookingConflict)
+async def booking_conflict_handler(request: Request, exc: BookingConflict):
+    """Keep the usual string ``detail`` and add the nearby slots the guest can take instead."""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail, "alternatives": exc.alternatives},
+        headers=exc.headers,
+    )
+
+
 def register_on_both(method: str, path: str, **kwargs):
     """Register endpoint on legacy and versioned routers."""
 
@@ -130,6 +202,12 @@ def register_on_both(method: str, path: str, **kwargs):
 @register_on_both("get", "/health")
 async def health():
     """Return service health including upstream dependency checks."""
+    if not services.ready:
+        # Optional phases still warming in the background: keep load balancers away.
+        return JSONResponse(
+            content={"status": services.state, "startup": services.report()},
+            status_code=503,
+        )
     health_status = await health_checker.check_all()
     status_code = 200 if health_status["status"] == "healthy" else 503
     body = {
@@ -139,6 +217,7 @@ async def health():
     }
     if settings.DEBUG:
         body["details"] = _scrub_health_details(health_status)
+    body["startup"] = services.report()
     body["service"] = "baku-reserve"
     body["version"] = "0.1.0"
 
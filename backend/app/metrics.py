@@ -252,6 +252,49 @@ db_operation_duration_seconds = Histogram(
     buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
 )
 
+db_queries_per_request = Histogram(
+    "db_queries_per_request",
+    "Database statements executed per HTTP request",
+    ["method", "endpoint"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250),
+)
+
+db_slow_queries_total = Counter(
+    "db_slow_queries_total",
+    "Database statements slower than the slow-query threshold",
+)
+
+db_pool_checked_out = Gauge(
+    "db_pool_checked_out",
+    "Database connections currently checked out of the pool",
+    ["pool"],
+)
+
+db_pool_overflow = Gauge(
+    "db_pool_overflow",
+    "Database connections open beyond the pool size",
+    ["pool"],
+)
+
+db_pool_wait_seconds = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+restaurant_sync_duration_seconds = Histogram(
+    "restaurant_sync_duration_seconds",
+    "Startup restaurant catalog sync duration in seconds",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+restaurant_sync_rows_total = Counter(
+    "restaurant_sync_rows_total",
+    "Restaurant rows handled by the startup catalog sync",
+    ["outcome"],
+)
+
 # ==============================================================================
 # HELPER FUNCTIONS
 # ==============================================================================
@@ -0,0 +1,190 @@
+"""
+Compiled opening-hours schedules.
+
+Restaurant ``hours`` payloads are parsed once per restaurant into an immutable
+`CompiledSchedule` holding per-weekday open/close minutes (overnight closes are stored past
+1440), the resolved tzinfo and the reservation slot offsets for each weekday. Availability,
+search and booking code query the compiled form instead of re-reading the raw dict.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Any
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+RES_DURATION = timedelta(minutes=90)
+INTERVAL = timedelta(minutes=30)
+OPEN = time(8, 0)
+CLOSE = time(23, 0)
+DEFAULT_TIMEZONE = "Asia/Baku"
+DAY_KEYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+_DURATION_MINUTES = int(RES_DURATION.total_seconds() // 60)
+_INTERVAL_MINUTES = int(INTERVAL.total_seconds() // 60)
+_DAY_MINUTES = 24 * 60
+
+
+@lru_cache(maxsize=256)
+def resolve_timezone(tz_name: str | None) -> ZoneInfo:
+    name = tz_name or DEFAULT_TIMEZONE
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(DEFAULT_TIMEZONE)
+
+
+def parse_time(value: str | None, default: time) -> time:
+    if not value:
+        return default
+    parts = value.strip().split(":")
+    if len(parts) < 2:
+        return default
+    try:
+        hour = max(0, min(23, int(parts[0])))
+        minute = max(0, min(59, int(parts[1])))
+        return time(hour, minute)
+    except ValueError:
+        return default
+
+
+def weekday_hours(hours: Any, weekday: int) -> tuple[time, time]:
+    """Open/close times for ``weekday`` (0=Mon) from a raw ``hours`` payload."""
+    if isinstance(hours, dict):
+        # Support global open/close as well as day-specific records
+        weekday_key = DAY_KEYS[weekday]
+        day_hours = hours.get(weekday_key) if isinstance(hours.get(weekday_key), dict) else None
+        open_str = day_hours.get("open") if day_hours else hours.get("open")
+        close_str = day_hours.get("close") if day_hours else hours.get("close")
+        return parse_time(open_str, OPEN), parse_time(close_str, CLOSE)
+    return OPEN, CLOSE
+
+
+@dataclass(frozen=True, slots=True)
+class DayHours:
+    """Opening minutes from local midnight; ``close_minute`` exceeds 1440 when overnight."""
+
+    open_minute: int
+    close_minute: int
+    slot_offsets: tuple[int, ...]
+
+    @classmethod
+    def from_times(cls, open_time: time, close_time: time) -> DayHours:
+        open_minute = open_time.hour * 60 + open_time.minute
+        close_minute = close_time.hour * 60 + close_time.minute
+        if close_minute <= open_minute:
+            close_minute += _DAY_MINUTES
+        last_start = close_minute - _DURATION_MINUTES - open_minute
+        offsets = tuple(range(0, last_start + 1, _INTERVAL_MINUTES)) if last_start >= 0 else ()
+        return cls(open_minute, close_minute, offsets)
+
+    @property
+    def overnight(self) -> bool:
+        return self.close_minute > _DAY_MINUTES
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSchedule:
+    timezone_name: str
+    tzinfo: ZoneInfo
+    weekdays: tuple[DayHours, ...]
+
+    @classmethod
+    def compile(cls, restaurant: Any) -> CompiledSchedule:
+        if isinstance(restaurant, dict):
+            hours = restaurant.get("hours")
+            tz_name = restaurant.get("timezone") or DEFAULT_TIMEZONE
+        else:
+            hours = getattr(restaurant, "hours", None)
+            tz_name = getattr(restaurant, "timezone", DEFAULT_TIMEZONE) or DEFAULT_TIMEZONE
+        weekdays = tuple(DayHours.from_times(*weekday_hours(hours, wd)) for wd in range(7))
+        return cls(str(tz_name), resolve_timezone(str(tz_name)), weekdays)
+
+    def hours_for(self, day: date) -> DayHours:
+        return self.weekdays[day.weekday()]
+
+    def service_window(self, day: date) -> tuple[datetime, datetime]:
+        """Local open/close datetimes of the service that starts on ``day``."""
+        hours = self.weekdays[day.weekday()]
+        midnight = datetime.combine(day, time.min, tzinfo=self.tzinfo)
+        return (
+            midnight + timedelta(minutes=hours.open_minute),
+            midnight + timedelta(minutes=hours.close_minute),
+        )
+
+    def service_window_at(self, instant: datetime) -> tuple[datetime, datetime] | None:
+        """Open/close of the service running at ``instant`` (today's or last night's)."""
+        local = self.localize(instant)
+        for day in (local.date(), local.date() - timedelta(days=1)):
+            open_dt, close_dt = self.service_window(day)
+            if open_dt <= local < close_dt:
+                return open_dt, close_dt
+        return None
+
+    def slot_count(self, day: date) -> int:
+        return len(self.weekdays[day.weekday()].slot_offsets)
+
+    def slot_starts(self, day: date) -> list[datetime]:
+        open_dt, _ = self.service_window(day)
+        return [open_dt + timedelta(minutes=m) for m in self.hours_for(day).slot_offsets]
+
+    def localize(self, instant: datetime) -> datetime:
+        if instant.tzinfo is None:
+            return instant.replace(tzinfo=self.tzinfo)
+        return instant.astimezone(self.tzinfo)
+
+    @staticmethod
+    def _minute_of(local: datetime) -> float:
+        return local.hour * 60 + local.minute + (local.second + local.microsecond / 1e6) / 60
+
+    def is_open_at(self, instant: datetime) -> bool:
+        """True when ``instant`` falls inside today's service or last night's overnight tail."""
+        local = self.localize(instant)
+        minute = self._minute_of(local)
+        today = self.weekdays[local.weekday()]
+        if today.open_minute <= minute < today.close_minute:
+            return True
+        yesterday = self.weekdays[(local.weekday() - 1) % 7]
+        return minute + _DAY_MINUTES < yesterday.close_minute
+
+    def fits_reservation(self, start: datetime) -> bool:
+        """True when a full ``RES_DURATION`` booking starting at ``start`` fits the hours."""
+        local = self.localize(start)
+        minute = self._minute_of(local)
+        today = self.weekdays[local.weekday()]
+        if today.open_minute <= minute and minute + _DURATION_MINUTES <= today.close_minute:
+            return True
+        yesterday = self.weekdays[(local.weekday() - 1) % 7]
+        return minute + _DAY_MINUTES + _DURATION_MINUTES <= yesterday.close_minute
+
+    def next_opening_after(self, instant: datetime) -> datetime:
+        """First service opening at or after ``instant`` (checks at most one week ahead)."""
+        local = self.localize(instant)
+        day = local.date()
+        for offset in range(8):
+            open_dt, _ = self.service_window(day + timedelta(days=offset))
+            if open_dt >= local:
+                return open_dt
+        raise AssertionError("every weekday has an opening")  # pragma: no cover
+
+
+def compile_schedule(restaurant: Any) -> CompiledSchedule:
+    return CompiledSchedule.compile(restaurant)
+
+
+__all__ = [
+    "CLOSE",
+    "CompiledSchedule",
+    "DAY_KEYS",
+    "DEFAULT_TIMEZONE",
+    "DayHours",
+    "INTERVAL",
+    "OPEN",
+    "RES_DURATION",
+    "compile_schedule",
+    "parse_time",
+    "resolve_timezone",
+    "weekday_hours",
+]
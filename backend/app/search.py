@@ -0,0 +1,261 @@
+"""
+In-memory inverted index for restaurant search.
+
+`Database` builds one `SearchIndex` when the catalog loads. Text is folded to ASCII (the
+Azerbaijani letters ə ş ç ğ ı ö ü fold to e s c g i o u) and split into tokens; each token
+maps to the documents and the best-weighted field it occurs in. Query tokens match exactly,
+as a prefix of an indexed token (the last, still-being-typed token), or within a small edit
+distance found via a trigram index over the vocabulary. Every query token has to match for a
+document to be returned; documents are ranked by the summed field weights of their matches.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+from collections.abc import Iterable
+from operator import add, neg
+
+_FOLD = str.maketrans({
+    "ə": "e",
+    "Ə": "e",
+    "ş": "s",
+    "Ş": "s",
+    "ç": "c",
+    "Ç": "c",
+    "ğ": "g",
+    "Ğ": "g",
+    "ı": "i",
+    "İ": "i",
+    "ö": "o",
+    "Ö": "o",
+    "ü": "u",
+    "Ü": "u",
+})
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Field weights: a name hit outranks a cuisine hit, which outranks a tag or address hit.
+FIELD_WEIGHTS = {
+    "name": 8.0,
+    "slug": 4.0,
+    "cuisine": 4.0,
+    "neighborhood": 3.0,
+    "tags": 2.0,
+    "address": 1.0,
+    "city": 0.5,
+}
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.7
+FUZZY_MATCH = 0.4
+# Prefix matches need this many typed characters; shorter tokens only match exactly.
+MIN_PREFIX_LENGTH = 2
+FUZZY_CANDIDATES = 64
+# Per query-token score maps are memoised per frozen index, up to this many tokens.
+TERM_CACHE_SIZE = 1024
+
+
+def fold(text: str) -> str:
+    """Lowercase ASCII folding that treats Azerbaijani letters like their Latin base."""
+    folded = unicodedata.normalize("NFKD", str(text).translate(_FOLD))
+    return "".join(ch for ch in folded if not unicodedata.combining(ch)).lower()
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(fold(text))
+
+
+def _trigrams(token: str) -> set[str]:
+    padded = f"  {token} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _max_edits(token: str) -> int:
+    if len(token) < 4:
+        return 0
+    return 1 if len(token) < 8 else 2
+
+
+def _within_edits(a: str, b: str, limit: int) -> bool:
+    """Optimal string alignment distance (adjacent swaps count once) of at most ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous2: list[int] | None = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return False
+        previous2, previous = previous, current
+    return previous[-1] <= limit
+
+
+def _best_scores(postings: list[tuple[dict[int, float], float]]) -> dict[int, float]:
+    """Per-document best ``weight * quality`` over one query token's expansions."""
+    if len(postings) == 1:
+        docs, quality = postings[0]
+        return {doc: weight * quality for doc, weight in docs.items()}
+    scores: dict[int, float] = {}
+    for docs, quality in postings:
+        for doc, weight in docs.items():
+            score = weight * quality
+            if scores.get(doc, 0.0) < score:
+                scores[doc] = score
+    return scores
+
+
+class SearchIndex:
+    def __init__(self) -> None:
+        self._postings: dict[str, dict[int, float]] = {}
+        self._trigram_postings: dict[str, set[str]] = {}
+        self._vocabulary: list[str] = []
+        self._boosts: list[float] = []
+        self._term_cache: dict[tuple[str, bool], dict[int, float]] = {}
+        self._frozen = True
+
+    def __len__(self) -> int:
+        return len(self._boosts)
+
+    def add(self, fields: dict[str, Iterable[str] | str | None], boost: float = 0.0) -> int:
+        """
+        Index one document; returns its position. ``boost`` breaks relevance ties (rating).
+        """
+        doc = len(self._boosts)
+        self._boosts.append(boost)
+        for field, values in fields.items():
+            weight = FIELD_WEIGHTS.get(field, 1.0)
+            if values is None:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            for value in values:
+                for token in tokenize(value):
+                    postings = self._postings.setdefault(token, {})
+                    if postings.get(doc, 0.0) < weight:
+                        postings[doc] = weight
+        self._frozen = False
+        return doc
+
+    def set_boost(self, doc: int, boost: float) -> None:
+        self._boosts[doc] = boost
+
+    def _freeze(self) -> None:
+        if self._frozen:
+            return
+        self._vocabulary = sorted(self._postings)
+        self._term_cache = {}
+        self._trigram_postings = {}
+        for token in self._vocabulary:
+            for gram in _trigrams(token):
+                self._trigram_postings.setdefault(gram, set()).add(token)
+        self._frozen = True
+
+    def _expansions(self, token: str, complete: bool) -> list[tuple[str, float]]:
+        """
+        Indexed tokens a query token stands for, with their match quality.
+
+        A ``complete`` token (followed by more query text) that exists in the vocabulary only
+        matches itself; the token being typed also matches as a prefix.
+        """
+        matches: dict[str, float] = {}
+        if token in self._postings:
+            matches[token] = EXACT_MATCH
+        if len(token) >= MIN_PREFIX_LENGTH and not (complete and matches):
+            idx = bisect_left(self._vocabulary, token)
+            while idx < len(self._vocabulary) and self._vocabulary[idx].startswith(token):
+                matches.setdefault(self._vocabulary[idx], PREFIX_MATCH)
+                idx += 1
+        limit = _max_edits(token)
+        if limit and not matches:
+            shared: dict[str, int] = {}
+            for gram in _trigrams(token):
+                for candidate in self._trigram_postings.get(gram, ()):
+                    shared[candidate] = shared.get(candidate, 0) + 1
+            ranked = sorted(shared, key=lambda candidate: -shared[candidate])
+            for candidate in ranked[:FUZZY_CANDIDATES]:
+                if _within_edits(token, candidate, limit):
+                    matches[candidate] = FUZZY_MATCH
+        return list(matches.items())
+
+    def _term_scores(self, token: str, complete: bool) -> dict[int, float]:
+        """Best ``field weight * match quality`` per document for one query token."""
+        key = (token, complete)
+        scores = self._term_cache.get(key)
+        if scores is None:
+            expansions = self._expansions(token, complete)
+            if expansions == [(token, EXACT_MATCH)]:
+                scores = self._postings[token]
+            else:
+                scores = _best_scores([
+                    (self._postings[indexed], quality) for indexed, quality in expansions
+                ])
+            if len(self._term_cache) >= TERM_CACHE_SIZE:
+                self._term_cache.clear()
+            self._term_cache[key] = scores
+        return scores
+
+    def scores(self, query: str) -> dict[int, float]:
+        """Summed match score per document that matches every query token."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return {}
+        self._freeze()
+        terms = sorted(
+            (
+                self._term_scores(token, complete=position < len(tokens))
+                for position, token in enumerate(tokens, 1)
+            ),
+            key=len,
+        )
+        if not terms[0]:
+            return {}
+        if len(terms) == 1:
+            return terms[0]
+        # Intersect rarest-first with set operations, then sum the per-term scores of the
+        # survivors; `map` keeps both loops in C.
+        candidates = terms[0].keys() & terms[1].keys()
+        for term in terms[2:]:
+            candidates &= term.keys()
+        order = list(candidates)
+        totals = list(map(terms[0].__getitem__, order))
+        for term in terms[1:]:
+            totals = list(map(add, totals, map(term.__getitem__, order)))
+        return dict(zip(order, totals, strict=True))
+
+    def rank(
+        self, scores: dict[int, float], limit: int | None = None, offset: int = 0
+    ) -> list[int]:
+        """Order scored documents best first (score, then boost) and cut one page."""
+        boosts = self._boosts
+        ranked = list(
+            zip(
+                map(neg, scores.values()),
+                map(neg, map(boosts.__getitem__, scores)),
+                scores,
+                strict=True,
+            )
+        )
+        if limit is None:
+            ranked.sort()
+            page = ranked[offset:]
+        else:
+            page = heapq.nsmallest(offset + limit, ranked)[offset:]
+        return [doc for _, _, doc in page]
+
+    def search(
+        self, query: str, limit: int | None = None, offset: int = 0
+    ) -> tuple[list[int], int]:
+        """
+        One page of document positions matching every query token, best first, and the total.
+        """
+        scores = self.scores(query)
+        return self.rank(scores, limit, offset), len(scores)
+
+
+__all__ = ["FIELD_WEIGHTS", "SearchIndex", "fold", "tokenize"]
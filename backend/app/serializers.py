@@ -165,6 +165,9 @@ def restaurant_to_detail(r: Any, request: Request | None = None) -> dict[str, An
         "experiences": list(get_attr(r, "experiences", []) or []),
         "rating": float(get_attr(r, "rating", 0.0) or 0.0),
         "reviews_count": int(get_attr(r, "reviews_count", 0) or 0),
+        # Every star bucket is present, zero when a restaurant has no reviews yet.
+        "rating_histogram": {str(value): 0 for value in range(1, 6)}
+        | dict(get_attr(r, "rating_histogram", None) or {}),
         "areas": areas,
     }
     photos = payload.get("photos") or []
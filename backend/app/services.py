@@ -0,0 +1,169 @@
+"""
+Lazily built application services and the startup phases that warm them.
+
+Modules expose their heavy singletons (`storage.DB`, `accounts.ACCOUNTS`, the concierge engine)
+as `LazyService` handles, so importing them is free. Under uvicorn the FastAPI lifespan runs
+`services.startup()`, which builds each service in an explicit phase and records how long it
+took. Required phases finish before the server accepts requests; optional ones warm up in the
+background while it already serves, and ``/health`` answers 503 until they are done. Tests,
+scripts and CLIs that never run the lifespan build only the services they actually touch, on
+first attribute access.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LazyService(Generic[T]):
+    """Module-level handle that builds its service on first use and proxies attributes to it."""
+
+    def __init__(self, name: str, factory: Callable[[], T]) -> None:
+        self._name = name
+        self._factory = factory
+        self._instance: T | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def built(self) -> bool:
+        return self._instance is not None
+
+    def get(self) -> T:
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+                instance = self._instance
+        return instance
+
+    def provide(self, instance: T) -> T:
+        """Install an instance built elsewhere (the lifespan phases build theirs explicitly)."""
+        with self._lock:
+            self._instance = instance
+        return instance
+
+    def __getattr__(self, item: str) -> Any:
+        if item.startswith("__"):
+            raise AttributeError(item)
+        return getattr(self.get(), item)
+
+    def __repr__(self) -> str:
+        state = "built" if self.built else "pending"
+        return f"<LazyService {self._name} ({state})>"
+
+
+@dataclass(slots=True)
+class StartupPhase:
+    name: str
+    seconds: float = 0.0
+    status: str = "pending"
+    error: str | None = None
+    required: bool = True
+
+
+class ServiceContainer:
+    """
+    Runs named startup phases in order and tracks readiness for ``/health``: required phases
+    run inside `startup`, optional ones afterwards in a background task ("warming").
+    """
+
+    def __init__(self) -> None:
+        self._phases: list[tuple[StartupPhase, Callable[[], Awaitable[None]]]] = []
+        # "lazy" until a lifespan starts the container: services then build on first use.
+        self.state = "lazy"
+        self._warmup: asyncio.Task | None = None
+
+    def phase(self, name: str, required: bool = True):
+        """Register an async startup step; optional phases may fail without blocking readiness."""
+
+        def decorator(fn: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+            self._phases.append((StartupPhase(name=name, required=required), fn))
+            return fn
+
+        return decorator
+
+    @property
+    def ready(self) -> bool:
+        return self.state in {"lazy", "ready"}
+
+    async def startup(self) -> None:
+        """Run the required phases, then start warming the optional ones in the background."""
+        self.state = "starting"
+        total = perf_counter()
+        for phase, fn in self._phases:
+            if phase.required:
+                await self._run(phase, fn)
+        self.state = "warming"
+        self._warmup = asyncio.create_task(self._warm(total))
+
+    async def wait_ready(self) -> None:
+        """Wait for the background warm-up started by `startup`."""
+        if self._warmup is not None:
+            await self._warmup
+
+    async def shutdown(self) -> None:
+        if self._warmup is not None and not self._warmup.done():
+            self._warmup.cancel()
+            try:
+                await self._warmup
+            except asyncio.CancelledError:
+                pass
+
+    async def _warm(self, total: float) -> None:
+        for phase, fn in self._phases:
+            if not phase.required:
+                await self._run(phase, fn)
+        self.state = "ready"
+        logger.info(
+            "Startup complete in %.1f ms (%s)",
+            (perf_counter() - total) * 1000,
+            ", ".join(f"{p.name}={p.seconds * 1000:.1f}ms" for p, _ in self._phases),
+        )
+
+    async def _run(self, phase: StartupPhase, fn: Callable[[], Awaitable[None]]) -> None:
+        started = perf_counter()
+        try:
+            await fn()
+        except Exception as exc:
+            phase.seconds = perf_counter() - started
+            phase.status = "failed"
+            phase.error = f"{type(exc).__name__}: {exc}"
+            if phase.required:
+                self.state = "failed"
+                logger.exception("Startup phase %s failed", phase.name)
+                raise
+            logger.warning("Optional startup phase %s failed: %s", phase.name, phase.error)
+            return
+        phase.seconds = perf_counter() - started
+        phase.status = "ok"
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "phases": [
+                {
+                    "name": phase.name,
+                    "status": phase.status,
+                    "ms": round(phase.seconds * 1000, 1),
+                    **({"error": phase.error} if phase.error else {}),
+                }
+                for phase, _ in self._phases
+            ],
+        }
+
+
+services = ServiceContainer()
+
+
+__all__ = ["LazyService", "ServiceContainer", "StartupPhase", "services"]
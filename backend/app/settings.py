@@ -9,6 +9,14 @@ REPO_ROOT = Path(__file__).resolve().parents[2]
 ENV_FILE = REPO_ROOT / ".env"
 
 
+def _async_url(url: str) -> str:
+    if url.startswith("sqlite///") or url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=str(ENV_FILE), env_file_encoding="utf-8", extra="ignore"
@@ -21,6 +29,36 @@ class Settings(BaseSettings):
     # persistence directory (defaults to app/data)
     DATA_DIR: Path | None = None
     DATABASE_URL: str | None = None
+    # Read replicas (comma-separated URLs) for availability, listing and review reads, used
+    # round-robin. After a write, reads for the same owner/restaurant stay on the primary for
+    # the pin window.
+    DATABASE_READ_URL: str = ""
+    DATABASE_READ_PIN_SECONDS: float = 5.0
+
+    # Connection pool for server databases (Postgres). Connections idle longer than the ping
+    # threshold are checked with `SELECT 1` on checkout (0 pings every checkout).
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PING_AFTER_IDLE_SECONDS: float = 30.0
+    DB_STATEMENT_CACHE_SIZE: int = 256
+    # Log statements slower than this (normalised SQL and parameter types; 0 disables) and
+    # requests that run more than this many statements (0 disables).
+    DB_SLOW_QUERY_MS: float = 200.0
+    DB_REQUEST_QUERY_WARN: int = 50
+
+    # SQLite tuning: `production` (WAL, synchronous=NORMAL, busy timeout, mmap, page cache,
+    # foreign keys) or `default` (stock SQLite). Pool sizes apply to file databases; the
+    # maintenance task checkpoints the WAL and runs `PRAGMA optimize` every interval.
+    SQLITE_PROFILE: str = "production"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE_MB: int = 256
+    SQLITE_CACHE_SIZE_MB: int = 64
+    SQLITE_POOL_SIZE: int = 8
+    SQLITE_MAX_OVERFLOW: int = 4
+    SQLITE_POOL_TIMEOUT_SECONDS: float = 30.0
+    SQLITE_MAINTENANCE_INTERVAL_SECONDS: float = 300.0
 
     # CORS allow origins (comma-separated). Default empty (no cross-origin).
     CORS_ALLOW_ORIGINS: str = ""
@@ -42,6 +80,29 @@ class Settings(BaseSettings):
     # Leave empty to never trust X-Forwarded-For (use direct client.host only)
     TRUSTED_PROXIES: str = ""
 
+    # Availability payload cache (entries keyed by restaurant/day/party size; 0 disables).
+    # Writes invalidate in-process; the TTL bounds staleness from writes in other workers.
+    AVAILABILITY_CACHE_MAX_ENTRIES: int = 4096
+    AVAILABILITY_CACHE_TTL_SECONDS: float = 30.0
+
+    # Maintain the slot_occupancy table with every reservation write and serve day views from it.
+    SLOT_OCCUPANCY_ENABLED: bool = True
+
+    # Let auto-assigned bookings combine adjacent tables in one area for large parties.
+    TABLE_COMBINATIONS_ENABLED: bool = True
+
+    # Group-commit reservation creates and status changes that arrive within the window
+    # (milliseconds) into one transaction; each keeps its own conflict check and outcome.
+    RESERVATION_WRITE_BATCHING: bool = False
+    RESERVATION_BATCH_WINDOW_MS: float = 5.0
+    RESERVATION_BATCH_MAX_SIZE: int = 64
+
+    # Move reservations that ended more than this many days ago to `reservations_archive`
+    # (0 disables). The mover runs every interval while the app is up, in batches.
+    RESERVATION_ARCHIVE_AFTER_DAYS: int = 180
+    RESERVATION_ARCHIVE_INTERVAL_SECONDS: float = 3600.0
+    RESERVATION_ARCHIVE_BATCH_SIZE: int = 1000
+
     # Observability
     SENTRY_DSN: str | None = None
     SENTRY_ENVIRONMENT: str = "development"
@@ -89,12 +150,13 @@ class Settings(BaseSettings):
 
     @property
     def async_database_url(self) -> str:
-        url = self.database_url
-        if url.startswith("sqlite///") or url.startswith("sqlite:///"):
-            return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
-        if url.startswith("postgresql://"):
-            return url.replace("postgresql://", "postgresql+asyncpg://", 1)
-        return url
+        return _async_url(self.database_url)
+
+    @property
+    def async_read_database_urls(self) -> list[str]:
+        return [
+            _async_url(part.strip()) for part in self.DATABASE_READ_URL.split(",") if part.strip()
+        ]
 
     @property
     def auth0_issuer(self) -> str | None:
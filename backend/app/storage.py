@@ -1,23 +1,60 @@
 from __future__ import annotations
 
 import asyncio
+import base64
+import binascii
+import hashlib
+import heapq
 import json
 import logging
-from collections.abc import Callable
+import math
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 from datetime import UTC, date, datetime, time, timedelta
+from functools import partial
 from pathlib import Path
 from shutil import copy2
+from time import perf_counter
 from typing import Any
 from uuid import uuid4
-from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from fastapi import HTTPException
-from sqlalchemy import func, select
+from sqlalchemy import bindparam, delete, func, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from .availability import bucket_blocks, occupancy_rows
+from .cache import availability_cache
 from .contracts import Reservation, ReservationCreate
-from .db.core import ensure_db_initialized, get_session
-from .db.models import ReservationRecord, RestaurantRecord, ReviewRecord
+from .db.core import get_read_session, get_session, init_db, pin_reads
+from .db.instrumentation import instrument_operations
+from .db.models import (
+    ReservationArchiveRecord,
+    ReservationRecord,
+    RestaurantRecord,
+    ReviewRecord,
+    SlotClaimRecord,
+    SlotOccupancyRecord,
+)
+from .facets import FacetIndex
+from .file_lock import FileLock
+from .live import availability_hub
+from .metrics import restaurant_sync_duration_seconds, restaurant_sync_rows_total
+from .schedule import RES_DURATION, CompiledSchedule, compile_schedule, resolve_timezone
+from .search import SearchIndex
+from .services import LazyService
 from .settings import settings
+from .table_assignment import (
+    ALTERNATIVE_SEARCH_WINDOW,
+    TableSpec,
+    alternative_slots,
+    choose_tables,
+    combinable_groups,
+    split_table_ids,
+    table_specs,
+)
+from .write_batch import WriteBatch, WriteCoalescer
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +62,18 @@ DATA_DIR = settings.data_dir
 LEGACY_DATA_DIR = Path(__file__).resolve().parent / "data"
 
 
+class _ClaimLost(Exception):
+    """A booking's claim lost a race; the next attempt re-reads and sees the winner."""
+
+
+class BookingConflict(HTTPException):
+    """409 raised by `Database.create_reservation` that also carries nearby bookable options."""
+
+    def __init__(self, detail: str, alternatives: list[dict[str, Any]]) -> None:
+        super().__init__(status_code=409, detail=detail)
+        self.alternatives = alternatives
+
+
 def _iso(dt: datetime) -> str:
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=UTC)
@@ -38,6 +87,107 @@ def _parse_iso(value: str) -> datetime:
     return parsed.astimezone(UTC)
 
 
+# Rows per upsert statement; keeps bound parameters well under SQLite's limit.
+RESTAURANT_SYNC_BATCH = 200
+
+# Statuses that hold a table: they block availability and own slot claims.
+BLOCKING_STATUSES = ("booked", "pending", "arrived")
+# Owner-facing status changes: target status -> statuses it may be applied to. Repeating a
+# change succeeds so retried requests get the same answer. No transition re-enters a blocking
+# status from a released one, so transitions only ever drop slot claims.
+STATUS_TRANSITIONS: dict[str, tuple[str, ...]] = {
+    "booked": ("pending", "booked"),
+    "cancelled": ("pending", "booked", "cancelled"),
+    "arrived": ("booked", "arrived"),
+    "no_show": ("booked", "no_show"),
+}
+# Claims latch a table's time in buckets of this size. Writing a bucket's claim row locks it
+# until commit, so bookings that could overlap queue on the buckets they share and the later
+# one checks exact overlap against the earlier; back-to-back bookings both go through.
+CLAIM_BUCKET = timedelta(minutes=15)
+# Whole-restaurant claims for venues booked without table inventory.
+WHOLE_RESTAURANT = "*"
+# Attempts at a booking whose claim lost a race (the winner is visible on the next read).
+CLAIM_ATTEMPTS = 3
+# Reservation ids per IN-list when bulk operations follow up on the rows they changed.
+BULK_ID_CHUNK = 500
+# Columns copied into `reservations_archive` (it adds `archived_at`).
+ARCHIVED_COLUMNS = tuple(column.name for column in ReservationRecord.__table__.columns)
+
+# Hot availability and booking queries, built once with named parameters: their SQL text
+# never varies, so SQLAlchemy's compiled cache and the driver's prepared statements (asyncpg
+# prepares server-side, `DB_STATEMENT_CACHE_SIZE` per connection) are reused on every call.
+_BLOCKING_OVERLAP = (
+    ReservationRecord.restaurant_id == bindparam("rid"),
+    ReservationRecord.status.in_(BLOCKING_STATUSES),
+    ReservationRecord.end > bindparam("window_start"),
+    ReservationRecord.start < bindparam("window_end"),
+)
+BLOCKING_RESERVATIONS = select(ReservationRecord).where(*_BLOCKING_OVERLAP)
+BLOCKING_RESERVATIONS_FOR_UPDATE = BLOCKING_RESERVATIONS.with_for_update(of=ReservationRecord)
+BLOCKING_ROWS = select(
+    ReservationRecord.table_id,
+    ReservationRecord.start,
+    ReservationRecord.end,
+    ReservationRecord.party_size,
+).where(*_BLOCKING_OVERLAP)
+DAY_OCCUPANCY = (
+    select(SlotOccupancyRecord.slot_start, SlotOccupancyRecord.free_table_ids)
+    .where(SlotOccupancyRecord.restaurant_id == bindparam("rid"))
+    .where(SlotOccupancyRecord.local_date == bindparam("day"))
+    .order_by(SlotOccupancyRecord.slot_start)
+)
+
+
+RATING_VALUES = (1, 2, 3, 4, 5)
+_AGGREGATE_COLUMNS = (
+    RestaurantRecord.rating_sum,
+    RestaurantRecord.rating_count,
+    *(getattr(RestaurantRecord, f"rating_{value}") for value in RATING_VALUES),
+)
+
+
+def _review_stats(
+    rating_sum: int | None, rating_count: int | None, *histogram: int | None
+) -> dict[str, Any]:
+    count = int(rating_count or 0)
+    return {
+        "count": count,
+        "average_rating": (int(rating_sum or 0) / count) if count else 0.0,
+        "histogram": {
+            str(value): int(bucket or 0)
+            for value, bucket in zip(RATING_VALUES, histogram, strict=True)
+        },
+    }
+
+
+def _payload_hash(payload: dict[str, Any]) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _restaurant_row(payload: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": str(payload["id"]),
+        "slug": payload.get("slug"),
+        "name": payload.get("name") or "",
+        "city": payload.get("city"),
+        "timezone": payload.get("timezone"),
+        "cuisine": payload.get("cuisine"),
+        "tags": payload.get("tags"),
+        "payload": payload,
+        "content_hash": _payload_hash(payload),
+    }
+
+
+def _restaurant_upsert(dialect: str, rows: list[dict[str, Any]]):
+    insert_fn = pg_insert if dialect == "postgresql" else sqlite_insert
+    stmt = insert_fn(RestaurantRecord).values(rows)
+    updates = {key: stmt.excluded[key] for key in rows[0] if key != "id"}
+    updates["updated_at"] = func.now()
+    return stmt.on_conflict_do_update(index_elements=[RestaurantRecord.id], set_=updates)
+
+
 def _ensure_datetime(value: datetime | str) -> datetime:
     if isinstance(value, datetime):
         if value.tzinfo is None:
@@ -60,10 +210,6 @@ def _bootstrap_file(filename: str, fallback: str | None = None) -> None:
         target.touch()
 
 
-_bootstrap_file("restaurants.json", "[]\n")
-_bootstrap_file("restaurant_tags_enriched.json", "{}\n")
-
-
 def _load_enriched_tags() -> dict[str, dict[str, Any]]:
     tag_path = DATA_DIR / "restaurant_tags_enriched.json"
     if not tag_path.exists():
@@ -83,7 +229,8 @@ def _load_enriched_tags() -> dict[str, dict[str, Any]]:
     return enriched
 
 
-def _record_to_public_dict(record: ReservationRecord) -> dict[str, Any]:
+def _record_to_public_dict(record: Any) -> dict[str, Any]:
+    """Public dict for a `ReservationRecord` or a row selected from its table."""
     return {
         "id": record.id,
         "restaurant_id": record.restaurant_id,
@@ -100,6 +247,54 @@ def _record_to_public_dict(record: ReservationRecord) -> dict[str, Any]:
     }
 
 
+def _claim_buckets(start: datetime, end: datetime) -> list[datetime]:
+    """``CLAIM_BUCKET``-aligned UTC bucket starts touched by ``[start, end)``."""
+    step = int(CLAIM_BUCKET.total_seconds())
+    first = math.floor(_ensure_datetime(start).timestamp()) // step * step
+    stop = math.ceil(_ensure_datetime(end).timestamp())
+    return [datetime.fromtimestamp(bucket, UTC) for bucket in range(first, stop, step)]
+
+
+def _claim_rows(record: ReservationRecord) -> list[dict[str, Any]]:
+    """Claim rows in key order, so concurrent bookings latch shared buckets in the same order."""
+    tables = sorted(split_table_ids(record.table_id)) or [WHOLE_RESTAURANT]
+    return [
+        {
+            "restaurant_id": record.restaurant_id,
+            "table_id": table,
+            "bucket_start": bucket,
+            "reservation_id": record.id,
+        }
+        for table in tables
+        for bucket in _claim_buckets(record.start, record.end)
+    ]
+
+
+def _encode_cursor(start: datetime, resid: str) -> str:
+    raw = f"{_iso(_ensure_datetime(start))}|{resid}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Inverse of `_encode_cursor`; a malformed cursor is a client error."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        start, resid = raw.split("|", 1)
+        return _parse_iso(start), resid
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(422, "Invalid cursor") from None
+
+
+def _read_keys(restaurant_id: str | None = None, owner_id: str | None = None) -> list[str]:
+    """Keys a write pins to the primary and a replica-tolerant read checks (`pin_reads`)."""
+    keys = []
+    if restaurant_id:
+        keys.append(f"restaurant:{restaurant_id}")
+    if owner_id:
+        keys.append(f"owner:{owner_id}")
+    return keys
+
+
 def _record_to_reservation(record: ReservationRecord) -> Reservation:
     return Reservation(
         id=record.id,
@@ -127,6 +322,7 @@ def _review_to_public(record: ReviewRecord) -> dict[str, Any]:
     }
 
 
+@instrument_operations
 class Database:
     """
     Restaurant metadata still comes from the JSON seed, but reservations persist in SQL via
@@ -134,7 +330,8 @@ class Database:
     """
 
     def __init__(self) -> None:
-        ensure_db_initialized()
+        _bootstrap_file("restaurants.json", "[]\n")
+        _bootstrap_file("restaurant_tags_enriched.json", "{}\n")
         seed_path = DATA_DIR / "restaurants.json"
         try:
             raw = seed_path.read_text(encoding="utf-8")
@@ -185,35 +382,36 @@ class Database:
 
             normalised.append(entry)
 
-        try:
-            # If already inside an event loop (e.g., uvicorn reload), schedule the sync task.
-            loop = asyncio.get_running_loop()
-            loop.create_task(self._sync_restaurants_to_db(normalised))
-        except RuntimeError:
-            # No running loop; safe to run synchronously during cold start or tests.
-            try:
-                synced = asyncio.run(self._sync_restaurants_to_db(normalised))
-                if synced:
-                    normalised = synced
-            except Exception:
-                logger.exception(
-                    "Failed to sync restaurants into SQL store; continuing with JSON data"
-                )
-        except Exception:
-            logger.exception("Failed to sync restaurants into SQL store; continuing with JSON data")
-
+        # Seed payloads as loaded; the summary pass below annotates `normalised` in place.
+        self._seed_entries = [dict(entry) for entry in normalised]
         self.restaurants: dict[str, dict[str, Any]] = {r["id"]: r for r in normalised}
         self._restaurants_by_slug: dict[str, dict[str, Any]] = {
             str(r.get("slug")).lower(): r for r in normalised if r.get("slug")
         }
 
         self._restaurant_summaries: list[dict[str, Any]] = []
-        self._summary_index: list[tuple[dict[str, Any], str]] = []
+        self._summaries_by_id: dict[str, dict[str, Any]] = {}
+        # Search and facet documents are both numbered in `_restaurant_summaries` order.
+        self._search_index = SearchIndex()
+        self._facets = FacetIndex()
+        self._catalog_docs: dict[str, int] = {}
         self._tables_cache: dict[str, list[tuple[dict[str, Any], int]]] = {}
         self._table_lookup_cache: dict[str, dict[str, dict[str, Any]]] = {}
+        self._schedules: dict[str, CompiledSchedule] = {}
+        self._table_specs: dict[str, list[TableSpec]] = {}
+        self._table_groups: dict[str, list[tuple[TableSpec, ...]]] = {}
+        # Set when `startup` runs in the background (lazy use inside an event loop).
+        self._startup_task: asyncio.Task | None = None
+        self._writes = WriteCoalescer(
+            self._session,
+            self._materialize_batch,
+            window=settings.RESERVATION_BATCH_WINDOW_MS / 1000,
+            max_size=settings.RESERVATION_BATCH_MAX_SIZE,
+        )
 
         for r in normalised:
             rid = r["id"]
+            self._schedules[rid] = compile_schedule(r)
             cover = r.get("cover_photo") or (r["photos"][0] if r.get("photos") else "")
             tags_raw = r.get("tag_groups") or r.get("tags") or {}
             if isinstance(tags_raw, dict):
@@ -262,25 +460,40 @@ class Database:
                 "reviews_count": int(r.get("reviews_count") or 0),
             }
             self._restaurant_summaries.append(summary)
+            self._summaries_by_id[rid] = summary
             grouped_tags = []
             if isinstance(tag_groups, dict):
                 for values in tag_groups.values():
                     if isinstance(values, list | tuple):
                         grouped_tags.extend(str(tag) for tag in values if isinstance(tag, str))
 
-            search_text = " ".join(
-                [
-                    r.get("name", ""),
-                    r.get("city", ""),
-                    neighborhood or "",
-                    address or "",
-                    r.get("slug", ""),
-                    " ".join(r.get("cuisine", []) or []),
-                    " ".join(flattened_tags),
-                    " ".join(grouped_tags),
-                ]
-            ).lower()
-            self._summary_index.append((summary, search_text))
+            self._catalog_docs[rid] = self._search_index.add(
+                {
+                    "name": [str(r.get(key) or "") for key in ("name", "name_en", "name_az")],
+                    "slug": r.get("slug"),
+                    "cuisine": [str(value) for value in cuisine],
+                    "neighborhood": neighborhood,
+                    "address": address,
+                    "tags": flattened_tags + grouped_tags,
+                    "city": r.get("city"),
+                },
+                boost=summary["rating"],
+            )
+            self._facets.add(
+                {
+                    "cuisine": [str(value) for value in cuisine],
+                    "neighborhood": neighborhood,
+                    "price_level": summary["price_level"],
+                    **{
+                        f"tag:{group}": [str(tag) for tag in values if isinstance(tag, str)]
+                        for group, values in tag_groups.items()
+                        if isinstance(values, list | tuple)
+                    },
+                },
+                name=summary["name"],
+                rating=summary["rating"],
+                reviews_count=summary["reviews_count"],
+            )
 
             table_entries: list[tuple[dict[str, Any], int]] = []
             for area in r.get("areas") or []:
@@ -290,120 +503,174 @@ class Database:
             table_entries.sort(key=lambda entry: entry[1])
             self._tables_cache[rid] = table_entries
             self._table_lookup_cache[rid] = {str(t.get("id")): t for t, _ in table_entries}
+            self._table_specs[rid] = table_specs(r.get("areas"))
+            self._table_groups[rid] = combinable_groups(self._table_specs[rid])
 
-        self._schedule_review_hydration()
-
-    def _schedule_review_hydration(self) -> None:
-        """Hydrate review aggregates without blocking startup."""
-
-        def _apply(stats: dict[str, dict[str, Any]]) -> None:
-            for rid, payload in stats.items():
-                if rid in self.restaurants:
-                    self.restaurants[rid]["rating"] = payload["average_rating"]
-                    self.restaurants[rid]["reviews_count"] = payload["count"]
-                for summary in self._restaurant_summaries:
-                    if summary["id"] == rid:
-                        summary["rating"] = payload["average_rating"]
-                        summary["reviews_count"] = payload["count"]
-
+    async def startup(self) -> None:
+        """Create the schema, sync the seed catalog into SQL and hydrate review aggregates."""
+        await init_db()
         try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            try:
-                stats = asyncio.run(self._load_review_stats())
-                _apply(stats)
-            except Exception:
-                logger.exception("Failed to hydrate review aggregates; continuing without stats")
-        else:
-            loop.create_task(self._load_and_apply_review_stats(_apply))
-
-    async def _load_and_apply_review_stats(
-        self, apply_fn: Callable[[dict[str, dict[str, Any]]], None]
-    ) -> None:
+            await self._sync_restaurants_to_db(self._seed_entries)
+        except Exception:
+            logger.exception("Failed to sync restaurants into SQL store; continuing with JSON data")
         try:
-            stats = await self._load_review_stats()
-            apply_fn(stats)
+            self._apply_review_stats(await self._load_review_stats())
         except Exception:
             logger.exception("Failed to hydrate review aggregates; continuing without stats")
 
+    def start_in_background(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Run `startup` as a task on ``loop``; every session waits for it to finish."""
+        self._startup_task = loop.create_task(self.startup())
+
+    async def _wait_started(self) -> None:
+        task = self._startup_task
+        if task is None:
+            return
+        loop = asyncio.get_running_loop()
+        if task.cancelled() or (not task.done() and task.get_loop() is not loop):
+            # The loop that started it closed first; startup is idempotent, so rerun it here.
+            task = self._startup_task = loop.create_task(self.startup())
+        await asyncio.shield(task)
+        if self._startup_task is task:
+            self._startup_task = None
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[AsyncSession]:
+        await self._wait_started()
+        async with get_session() as session:
+            yield session
+
+    @asynccontextmanager
+    async def _read_session(self, *keys: str) -> AsyncIterator[AsyncSession]:
+        await self._wait_started()
+        async with get_read_session(*keys) as session:
+            yield session
+
+    def _apply_review_stats(self, stats: dict[str, dict[str, Any]]) -> None:
+        for rid, payload in stats.items():
+            if rid in self.restaurants:
+                self.restaurants[rid]["rating"] = payload["average_rating"]
+                self.restaurants[rid]["reviews_count"] = payload["count"]
+                self.restaurants[rid]["rating_histogram"] = payload["histogram"]
+            summary = self._summaries_by_id.get(rid)
+            if summary is not None:
+                summary["rating"] = payload["average_rating"]
+                summary["reviews_count"] = payload["count"]
+                doc = self._catalog_docs[rid]
+                self._search_index.set_boost(doc, payload["average_rating"])
+                self._facets.set_rating(doc, payload["average_rating"], payload["count"])
+
     async def _sync_restaurants_to_db(self, entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        """Persist restaurant metadata to SQL so reservations can join across workers."""
-        if not entries:
+        """
+        Persist restaurant metadata to SQL so reservations can join across workers.
+
+        Rows are compared by a content hash of the seed payload and only new or changed ones are
+        written, in a single ``INSERT ... ON CONFLICT`` statement. Workers serialise on a
+        cross-process guard (a Postgres advisory lock, or a lock file next to the SQLite
+        database), so the first worker to boot does the writes and the rest find nothing to do.
+        """
+        seed = {str(entry["id"]): entry for entry in entries if entry.get("id")}
+        if not seed:
             return []
-        seed_ids: list[str] = []
+        started = perf_counter()
+        hashes = {rid: _payload_hash(entry) for rid, entry in seed.items()}
         async with get_session() as session:
-            for entry in entries:
-                rid = entry.get("id")
-                if not rid:
-                    continue
-                rid = str(rid)
-                seed_ids.append(rid)
-                record = await session.get(RestaurantRecord, rid)
-                payload = dict(entry)
-                if record:
-                    record.slug = payload.get("slug")
-                    record.name = payload.get("name") or record.name
-                    record.city = payload.get("city")
-                    record.timezone = payload.get("timezone")
-                    record.cuisine = payload.get("cuisine")
-                    record.tags = payload.get("tags")
-                    record.payload = payload
-                else:
-                    record = RestaurantRecord(
-                        id=str(rid),
-                        slug=payload.get("slug"),
-                        name=payload.get("name") or "",
-                        city=payload.get("city"),
-                        timezone=payload.get("timezone"),
-                        cuisine=payload.get("cuisine"),
-                        tags=payload.get("tags"),
-                        payload=payload,
+            dialect = session.bind.dialect.name
+            lock = None
+            if dialect == "postgresql":
+                await session.execute(
+                    text("SELECT pg_advisory_xact_lock(hashtext('restaurant_sync'))")
+                )
+            elif dialect == "sqlite":
+                lock = FileLock(settings.data_dir / "restaurant_sync")
+                await asyncio.to_thread(lock.acquire)
+            try:
+                result = await session.execute(
+                    select(RestaurantRecord.id, RestaurantRecord.content_hash).where(
+                        RestaurantRecord.id.in_(list(seed))
                     )
-                    session.add(record)
-            await session.commit()
-            # Only surface restaurants that exist in the current seed, and preserve seed order
-            result = await session.execute(
-                select(RestaurantRecord).where(RestaurantRecord.id.in_(seed_ids))
-            )
-            rows = result.scalars().all()
-            payload_by_id = {row.id: row.payload for row in rows if row.payload}
-            missing = set(seed_ids) - set(payload_by_id.keys())
-            if missing:
-                logger.info("Omitting %d restaurants absent from the current seed", len(missing))
-            return [payload_by_id[rid] for rid in seed_ids if rid in payload_by_id]
+                )
+                stored = dict(result.all())
+                changed = [rid for rid, digest in hashes.items() if stored.get(rid) != digest]
+                for offset in range(0, len(changed), RESTAURANT_SYNC_BATCH):
+                    batch = changed[offset : offset + RESTAURANT_SYNC_BATCH]
+                    await session.execute(
+                        _restaurant_upsert(dialect, [_restaurant_row(seed[rid]) for rid in batch])
+                    )
+                await session.commit()
+            finally:
+                if lock is not None:
+                    lock.release()
+
+        elapsed = perf_counter() - started
+        inserted = sum(1 for rid in changed if rid not in stored)
+        counts = {
+            "inserted": inserted,
+            "updated": len(changed) - inserted,
+            "unchanged": len(seed) - len(changed),
+        }
+        for outcome, count in counts.items():
+            restaurant_sync_rows_total.labels(outcome=outcome).inc(count)
+        restaurant_sync_duration_seconds.observe(elapsed)
+        logger.info(
+            "Restaurant sync: %d inserted, %d updated, %d unchanged in %.1f ms",
+            counts["inserted"],
+            counts["updated"],
+            counts["unchanged"],
+            elapsed * 1000,
+        )
+        return list(seed.values())
 
     async def _load_review_stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Running aggregates for every reviewed restaurant in one query, backfilling rows that
+        predate them. Restaurants without reviews keep their seeded rating.
+        """
+        columns = (RestaurantRecord.id, *_AGGREGATE_COLUMNS)
         async with get_session() as session:
-            stmt = select(
-                ReviewRecord.restaurant_id,
-                func.count(ReviewRecord.id),
-                func.avg(ReviewRecord.rating),
-            ).group_by(ReviewRecord.restaurant_id)
-            result = await session.execute(stmt)
-            stats: dict[str, dict[str, Any]] = {}
-            for restaurant_id, count, average in result.all():
-                stats[str(restaurant_id)] = {
-                    "count": int(count or 0),
-                    "average_rating": float(average or 0.0),
-                }
-            return stats
+            rows = (await session.execute(select(*columns))).all()
+            if any(row.rating_count is None for row in rows):
+                await self._backfill_review_aggregates(session, [row.id for row in rows])
+                await session.commit()
+                rows = (await session.execute(select(*columns))).all()
+        return {str(row[0]): _review_stats(*row[1:]) for row in rows if row.rating_count}
+
+    @staticmethod
+    async def _backfill_review_aggregates(session, rids: list[str]) -> None:
+        """Recompute the stored aggregates for ``rids`` from `reviews` with one grouped query."""
+        result = await session.execute(
+            select(ReviewRecord.restaurant_id, ReviewRecord.rating, func.count(ReviewRecord.id))
+            .where(ReviewRecord.restaurant_id.in_(rids))
+            .group_by(ReviewRecord.restaurant_id, ReviewRecord.rating)
+        )
+        counts: dict[str, dict[int, int]] = {}
+        for restaurant_id, rating, count in result.all():
+            counts.setdefault(str(restaurant_id), {})[int(rating)] = int(count)
+        rows = []
+        for rid in rids:
+            by_rating = counts.get(rid, {})
+            row: dict[str, Any] = {
+                "id": rid,
+                "rating_sum": sum(value * count for value, count in by_rating.items()),
+                "rating_count": sum(by_rating.values()),
+            }
+            for value in RATING_VALUES:
+                row[f"rating_{value}"] = by_rating.get(value, 0)
+            rows.append(row)
+        if rows:
+            await session.execute(update(RestaurantRecord), rows)
 
     async def _refresh_review_stats_for_restaurant(self, rid: str) -> dict[str, Any]:
-        async with get_session() as session:
-            stmt = select(func.count(ReviewRecord.id), func.avg(ReviewRecord.rating)).where(
-                ReviewRecord.restaurant_id == rid
-            )
-            result = await session.execute(stmt)
-            count, average = result.one_or_none() or (0, 0.0)
-            stats = {"count": int(count or 0), "average_rating": float(average or 0.0)}
-            if rid in self.restaurants:
-                self.restaurants[rid]["rating"] = stats["average_rating"]
-                self.restaurants[rid]["reviews_count"] = stats["count"]
-            for summary in self._restaurant_summaries:
-                if summary["id"] == rid:
-                    summary["rating"] = stats["average_rating"]
-                    summary["reviews_count"] = stats["count"]
-            return stats
+        """Slow path: rebuild one restaurant's aggregates from `reviews`."""
+        async with self._session() as session:
+            await self._backfill_review_aggregates(session, [rid])
+            await session.commit()
+            row = (
+                await session.execute(select(*_AGGREGATE_COLUMNS).where(RestaurantRecord.id == rid))
+            ).one_or_none()
+        stats = _review_stats(*row) if row else _review_stats(0, 0, *([0] * len(RATING_VALUES)))
+        self._apply_review_stats({rid: stats})
+        return stats
 
     # -------- helpers --------
     def _tables_for_restaurant(self, rid: str) -> list[dict[str, Any]]:
@@ -415,31 +682,51 @@ class Database:
     def eligible_tables(self, rid: str, party_size: int) -> list[dict[str, Any]]:
         return [table for table, cap in self._tables_cache.get(rid, []) if cap >= party_size]
 
+    def schedule_for(self, rid: str) -> CompiledSchedule | None:
+        """Opening hours compiled at catalog load; ``None`` for unknown restaurants."""
+        return self._schedules.get(rid)
+
     @staticmethod
     def _overlap(a_start: datetime, a_end: datetime, b_start: datetime, b_end: datetime) -> bool:
         return not (a_end <= b_start or b_end <= a_start)
 
+    def _local_days(self, rid: str, start: datetime, end: datetime) -> set[date]:
+        """Local calendar days whose midnight-to-midnight window `[start, end)` overlaps."""
+        schedule = self._schedules.get(rid)
+        tzinfo = schedule.tzinfo if schedule else resolve_timezone(None)
+        local_start = _ensure_datetime(start).astimezone(tzinfo)
+        local_end = _ensure_datetime(end).astimezone(tzinfo)
+        days: set[date] = set()
+        day = local_start.date()
+        while datetime.combine(day, time.min, tzinfo=tzinfo) < local_end:
+            days.add(day)
+            day += timedelta(days=1)
+        return days
+
+    def _invalidate_availability(self, rid: str, start: datetime, end: datetime) -> None:
+        self._invalidate_days(rid, self._local_days(rid, start, end))
+
+    @staticmethod
+    def _invalidate_days(rid: str, days: set[date]) -> None:
+        availability_cache.invalidate(rid, days)
+        availability_hub.publish(rid, days)
+
+    @staticmethod
+    def _utc_day_bounds(day: date, restaurant_tz: str) -> tuple[datetime, datetime]:
+        tzinfo = resolve_timezone(restaurant_tz)
+        day_start_local = datetime.combine(day, time.min, tzinfo=tzinfo)
+        day_end_local = day_start_local + timedelta(days=1)
+        return day_start_local.astimezone(UTC), day_end_local.astimezone(UTC)
+
     async def _reservations_for_restaurant_day(
         self, rid: str, day: date, restaurant_tz: str
     ) -> list[ReservationRecord]:
-        blocking_statuses = ("booked", "pending", "arrived")
-        try:
-            tzinfo = ZoneInfo(restaurant_tz or "Asia/Baku")
-        except ZoneInfoNotFoundError:
-            tzinfo = ZoneInfo("Asia/Baku")
-        day_start_local = datetime.combine(day, time.min, tzinfo=tzinfo)
-        day_end_local = day_start_local + timedelta(days=1)
-        day_start = day_start_local.astimezone(UTC)
-        day_end = day_end_local.astimezone(UTC)
-        async with get_session() as session:
-            stmt = (
-                select(ReservationRecord)
-                .where(ReservationRecord.restaurant_id == rid)
-                .where(ReservationRecord.status.in_(blocking_statuses))
-                .where(ReservationRecord.end > day_start)
-                .where(ReservationRecord.start < day_end)
+        day_start, day_end = self._utc_day_bounds(day, restaurant_tz)
+        async with self._read_session(*_read_keys(rid)) as session:
+            result = await session.execute(
+                BLOCKING_RESERVATIONS,
+                {"rid": rid, "window_start": day_start, "window_end": day_end},
             )
-            result = await session.execute(stmt)
             return result.scalars().all()
 
     async def reservations_for_day(
@@ -448,14 +735,410 @@ class Database:
         rows = await self._reservations_for_restaurant_day(rid, day, restaurant_tz)
         return [_record_to_public_dict(row) for row in rows]
 
+    async def reservation_blocks_for_day(
+        self, rid: str, day: date, restaurant_tz: str
+    ) -> list[tuple[str | None, datetime, datetime, int]]:
+        """Blocking `(table_id, start, end, party_size)` rows as UTC datetimes, no ORM objects."""
+        day_start, day_end = self._utc_day_bounds(day, restaurant_tz)
+        return await self.reservation_blocks_between(rid, day_start, day_end)
+
+    async def reservation_blocks_between(
+        self, rid: str, window_start: datetime, window_end: datetime
+    ) -> list[tuple[str | None, datetime, datetime, int]]:
+        """Blocking rows overlapping `[window_start, window_end)` in a single query."""
+        async with self._read_session(*_read_keys(rid)) as session:
+            return await self._select_blocks(session, rid, window_start, window_end)
+
+    @staticmethod
+    async def _select_blocks(
+        session, rid: str, window_start: datetime, window_end: datetime
+    ) -> list[tuple[str | None, datetime, datetime, int]]:
+        result = await session.execute(
+            BLOCKING_ROWS, {"rid": rid, "window_start": window_start, "window_end": window_end}
+        )
+        return [
+            (table_id, _ensure_datetime(start), _ensure_datetime(end), int(size or 0))
+            for table_id, start, end, size in result.all()
+        ]
+
+    # -------- slot occupancy --------
+    async def materialized_slots(
+        self, rid: str, day: date
+    ) -> list[tuple[datetime, list[str]]] | None:
+        """Stored `(slot_start, free table ids)` rows for one restaurant day, if any."""
+        if not settings.SLOT_OCCUPANCY_ENABLED:
+            return None
+        async with self._read_session(*_read_keys(rid)) as session:
+            result = await session.execute(DAY_OCCUPANCY, {"rid": rid, "day": day})
+            rows = result.all()
+        return [(_ensure_datetime(start), list(ids or [])) for start, ids in rows] or None
+
+    async def _computed_occupancy(
+        self, session, rid: str, days: set[date]
+    ) -> dict[date, list[tuple[datetime, list[str]]] | None]:
+        """
+        Free tables per slot for ``days``, or ``None`` for a day that cannot be stored: an
+        untabled block of unknown size lands on a table chosen by the party size being asked
+        about, so such days are always computed per request.
+        """
+        schedule = self._schedules[rid]
+        first, last = min(days), max(days)
+        window_start = self._utc_day_bounds(first, schedule.timezone_name)[0]
+        window_end = self._utc_day_bounds(last, schedule.timezone_name)[1]
+        raw = await self._select_blocks(session, rid, window_start, window_end)
+        by_day = bucket_blocks(raw, first, last, schedule.tzinfo)
+        computed: dict[date, list[tuple[datetime, list[str]]] | None] = {}
+        for day in sorted(days):
+            blocks = by_day.get(day, [])
+            if any(not table_id and not size for table_id, _, _, size in blocks):
+                computed[day] = None
+            else:
+                computed[day] = occupancy_rows(self, rid, schedule, day, blocks)
+        return computed
+
+    async def _materialize_occupancy(
+        self,
+        session,
+        rid: str,
+        days: set[date],
+        windows: list[tuple[datetime, datetime]] | None = None,
+    ) -> int:
+        """
+        Rewrite `slot_occupancy` for ``days`` inside the caller's transaction: only the slots
+        overlapping ``windows`` (the changed reservations' times) when the day is already
+        stored in full, otherwise every slot of the day.
+
+        Pending reservation changes are flushed first so the recomputation sees them. The slot
+        rows are upserted before anything is read, which locks them until commit, so writers
+        whose reservations share slots queue on those rows and each recomputes from what the
+        previous one committed; writes elsewhere in the day go ahead in parallel.
+        """
+        if not settings.SLOT_OCCUPANCY_ENABLED or not days or rid not in self._schedules:
+            return 0
+        await session.flush()
+        schedule = self._schedules[rid]
+        if windows is not None:
+            windows = [(_ensure_datetime(begin), _ensure_datetime(end)) for begin, end in windows]
+        stored = dict(
+            (
+                await session.execute(
+                    select(SlotOccupancyRecord.local_date, func.count())
+                    .where(SlotOccupancyRecord.restaurant_id == rid)
+                    .where(SlotOccupancyRecord.local_date.in_(sorted(days)))
+                    .group_by(SlotOccupancyRecord.local_date)
+                )
+            ).all()
+        )
+        targets: dict[date, set[datetime]] = {}
+        for day in sorted(days):
+            starts = [start.astimezone(UTC) for start in schedule.slot_starts(day)]
+            if windows is not None and stored.get(day) == len(starts):
+                starts = [
+                    start
+                    for start in starts
+                    if any(start < end and start + RES_DURATION > begin for begin, end in windows)
+                ]
+            elif stored.get(day):
+                # Partly stored or on an old grid: drop the day and store it whole again.
+                await session.execute(
+                    delete(SlotOccupancyRecord)
+                    .where(SlotOccupancyRecord.restaurant_id == rid)
+                    .where(SlotOccupancyRecord.local_date == day)
+                )
+            if starts:
+                targets[day] = set(starts)
+        if not targets:
+            return 0
+        upsert = pg_insert if session.bind.dialect.name == "postgresql" else sqlite_insert
+        latch = upsert(SlotOccupancyRecord).values([
+            {
+                "restaurant_id": rid,
+                "local_date": day,
+                "slot_start": start,
+                "free_table_count": 0,
+                "free_table_ids": [],
+            }
+            for day in sorted(targets)
+            for start in sorted(targets[day])
+        ])
+        await session.execute(
+            latch.on_conflict_do_update(
+                index_elements=["restaurant_id", "local_date", "slot_start"],
+                set_={"free_table_count": SlotOccupancyRecord.free_table_count},
+            )
+        )
+        computed = await self._computed_occupancy(session, rid, set(targets))
+        rows = []
+        for day, slots in computed.items():
+            if slots is None:
+                await session.execute(
+                    delete(SlotOccupancyRecord)
+                    .where(SlotOccupancyRecord.restaurant_id == rid)
+                    .where(SlotOccupancyRecord.local_date == day)
+                )
+                continue
+            for slot_start, free_ids in slots:
+                slot_start = slot_start.astimezone(UTC)
+                if slot_start in targets[day]:
+                    rows.append({
+                        "restaurant_id": rid,
+                        "local_date": day,
+                        "slot_start": slot_start,
+                        "free_table_count": len(free_ids),
+                        "free_table_ids": free_ids,
+                    })
+        if rows:
+            stmt = upsert(SlotOccupancyRecord).values(rows)
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["restaurant_id", "local_date", "slot_start"],
+                    set_={
+                        "free_table_count": stmt.excluded.free_table_count,
+                        "free_table_ids": stmt.excluded.free_table_ids,
+                    },
+                )
+            )
+        return len(rows)
+
+    async def _reservation_days(self, session, rid: str | None) -> dict[str, set[date]]:
+        """Local days per restaurant that hold blocking reservations or stored occupancy."""
+        stmt = select(
+            ReservationRecord.restaurant_id, ReservationRecord.start, ReservationRecord.end
+        ).where(ReservationRecord.status.in_(BLOCKING_STATUSES))
+        stored = select(
+            SlotOccupancyRecord.restaurant_id, SlotOccupancyRecord.local_date
+        ).distinct()
+        if rid is not None:
+            stmt = stmt.where(ReservationRecord.restaurant_id == rid)
+            stored = stored.where(SlotOccupancyRecord.restaurant_id == rid)
+        days: dict[str, set[date]] = {}
+        for restaurant_id, start, end in (await session.execute(stmt)).all():
+            if restaurant_id in self._schedules:
+                days.setdefault(restaurant_id, set()).update(
+                    self._local_days(restaurant_id, start, end)
+                )
+        for restaurant_id, local_date in (await session.execute(stored)).all():
+            days.setdefault(restaurant_id, set()).add(local_date)
+        return days
+
+    async def rebuild_slot_occupancy(self, rid: str | None = None) -> int:
+        """Recompute `slot_occupancy` from `reservations`; returns the number of rows written."""
+        written = 0
+        async with self._session() as session:
+            days_by_restaurant = await self._reservation_days(session, rid)
+            for restaurant_id, days in sorted(days_by_restaurant.items()):
+                await session.execute(
+                    delete(SlotOccupancyRecord).where(
+                        SlotOccupancyRecord.restaurant_id == restaurant_id
+                    )
+                )
+                written += await self._materialize_occupancy(session, restaurant_id, days)
+            await session.commit()
+        availability_cache.clear()
+        return written
+
+    async def reservation_overlaps(self, rid: str | None = None) -> list[tuple[str, str]]:
+        """
+        Pairs of blocking reservations holding the same table (or, for venues without tables,
+        the restaurant) at overlapping times. Claims keep this empty; used by audits and tests.
+        """
+        stmt = select(
+            ReservationRecord.id,
+            ReservationRecord.restaurant_id,
+            ReservationRecord.table_id,
+            ReservationRecord.start,
+            ReservationRecord.end,
+        ).where(ReservationRecord.status.in_(BLOCKING_STATUSES))
+        if rid:
+            stmt = stmt.where(ReservationRecord.restaurant_id == rid)
+        async with self._session() as session:
+            rows = (await session.execute(stmt)).all()
+        held: dict[tuple[str, str], list[tuple[datetime, datetime, str]]] = {}
+        for resid, restaurant_id, table_id, start, end in rows:
+            for table in split_table_ids(table_id) or [WHOLE_RESTAURANT]:
+                held.setdefault((restaurant_id, table), []).append(
+                    (_ensure_datetime(start), _ensure_datetime(end), resid)
+                )
+        overlaps = []
+        for intervals in held.values():
+            intervals.sort()
+            latest_end, latest_id = None, None
+            for start, end, resid in intervals:
+                if latest_end is not None and start < latest_end:
+                    overlaps.append((latest_id, resid))
+                if latest_end is None or end > latest_end:
+                    latest_end, latest_id = end, resid
+        return overlaps
+
+    async def slot_occupancy_mismatches(self, rid: str | None = None) -> list[dict[str, Any]]:
+        """Restaurant days whose stored occupancy differs from a recomputation."""
+        mismatches: list[dict[str, Any]] = []
+        async with self._session() as session:
+            days_by_restaurant = await self._reservation_days(session, rid)
+            for restaurant_id, days in sorted(days_by_restaurant.items()):
+                if restaurant_id not in self._schedules:
+                    mismatches.append(
+                        {"restaurant_id": restaurant_id, "date": None, "reason": "unknown"}
+                    )
+                    continue
+                expected = await self._computed_occupancy(session, restaurant_id, days)
+                result = await session.execute(
+                    select(
+                        SlotOccupancyRecord.local_date,
+                        SlotOccupancyRecord.slot_start,
+                        SlotOccupancyRecord.free_table_count,
+                        SlotOccupancyRecord.free_table_ids,
+                    )
+                    .where(SlotOccupancyRecord.restaurant_id == restaurant_id)
+                    .order_by(SlotOccupancyRecord.local_date, SlotOccupancyRecord.slot_start)
+                )
+                stored: dict[date, list[tuple[datetime, list[str]]]] = {}
+                for local_date, slot_start, count, ids in result.all():
+                    ids = list(ids or [])
+                    if count != len(ids):
+                        mismatches.append(
+                            {
+                                "restaurant_id": restaurant_id,
+                                "date": local_date.isoformat(),
+                                "reason": "count",
+                            }
+                        )
+                    stored.setdefault(local_date, []).append((_ensure_datetime(slot_start), ids))
+                for day, rows in expected.items():
+                    actual = stored.get(day)
+                    if rows is None:
+                        # Not storable (see `_computed_occupancy`): reads compute the day.
+                        if actual is None:
+                            continue
+                        reason = "stale"
+                    elif actual is None:
+                        reason = "missing"
+                    elif actual != rows:
+                        reason = "stale"
+                    else:
+                        continue
+                    mismatches.append(
+                        {"restaurant_id": restaurant_id, "date": day.isoformat(), "reason": reason}
+                    )
+        return mismatches
+
+    async def reservation_blocks_by_restaurant(
+        self, window_start: datetime, window_end: datetime
+    ) -> dict[str, list[tuple[str | None, datetime, datetime, int]]]:
+        """Blocking rows for every restaurant overlapping the window, grouped by restaurant."""
+        async with self._read_session() as session:
+            stmt = (
+                select(
+                    ReservationRecord.restaurant_id,
+                    ReservationRecord.table_id,
+                    ReservationRecord.start,
+                    ReservationRecord.end,
+                    ReservationRecord.party_size,
+                )
+                .where(ReservationRecord.status.in_(BLOCKING_STATUSES))
+                .where(ReservationRecord.end > window_start)
+                .where(ReservationRecord.start < window_end)
+                .order_by(ReservationRecord.restaurant_id)
+            )
+            result = await session.execute(stmt)
+            grouped: dict[str, list[tuple[str | None, datetime, datetime, int]]] = {}
+            for rid, table_id, start, end, size in result.all():
+                grouped.setdefault(str(rid), []).append(
+                    (table_id, _ensure_datetime(start), _ensure_datetime(end), int(size or 0))
+                )
+            return grouped
+
     # -------- restaurants --------
-    def list_restaurants(self, q: str | None = None) -> list[dict[str, Any]]:
-        if not q:
-            return [dict(summary) for summary in self._restaurant_summaries]
-        qlow = q.lower().strip()
-        if not qlow:
-            return [dict(summary) for summary in self._restaurant_summaries]
-        return [dict(summary) for summary, search in self._summary_index if qlow in search]
+    def _select_restaurants(
+        self,
+        q: str | None,
+        filters: dict[str, list[str]] | None,
+        min_rating: float | None,
+        sort: str | None,
+        limit: int | None,
+        offset: int,
+    ) -> tuple[list[int], int, dict[str, int]]:
+        """Catalog positions for one page, the total and the facet count contexts."""
+        filters = {dimension: values for dimension, values in (filters or {}).items() if values}
+        scores = self._search_index.scores(q) if q and q.strip() else None
+        within = None if scores is None else self._facets.bitmap(scores)
+        selection, contexts = self._facets.select(filters, min_rating, within)
+        if sort and sort != "relevance":
+            docs, total = self._facets.page(selection, sort, limit, offset)
+        elif scores is None:
+            docs, total = self._facets.page(selection, "catalog", limit, offset)
+        else:
+            if filters or min_rating is not None:
+                flags = self._facets.flags(selection)
+                scores = {doc: score for doc, score in scores.items() if flags[doc]}
+            docs, total = self._search_index.rank(scores, limit, offset), len(scores)
+        return docs, total, contexts
+
+    def search_restaurants(
+        self,
+        q: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        *,
+        filters: dict[str, list[str]] | None = None,
+        min_rating: float | None = None,
+        sort: str | None = None,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """
+        One page of summaries and the total match count. Results are relevance-ranked when
+        ``q`` is given and in catalog order otherwise, unless ``sort`` names a `FacetIndex`
+        order. ``filters`` maps facet dimensions (``cuisine``, ``neighborhood``,
+        ``price_level``, ``tag:<group>``) to accepted values.
+        """
+        if not (q and q.strip()) and not filters and min_rating is None and not sort:
+            stop = None if limit is None else offset + limit
+            page = self._restaurant_summaries[offset:stop]
+            return [dict(summary) for summary in page], len(self._restaurant_summaries)
+        docs, total, _ = self._select_restaurants(q, filters, min_rating, sort, limit, offset)
+        return [dict(self._restaurant_summaries[doc]) for doc in docs], total
+
+    def browse_restaurants(
+        self,
+        q: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        *,
+        filters: dict[str, list[str]] | None = None,
+        min_rating: float | None = None,
+        sort: str | None = None,
+    ) -> dict[str, Any]:
+        """`search_restaurants` plus facet counts for the same query and filters."""
+        docs, total, contexts = self._select_restaurants(
+            q, filters, min_rating, sort, limit, offset
+        )
+        counts = {
+            dimension: [{"value": value, "count": count} for value, count in pairs]
+            for dimension, pairs in self._facets.counts(contexts, filters).items()
+        }
+        tag_groups = {
+            dimension.removeprefix("tag:"): values
+            for dimension, values in sorted(counts.items())
+            if dimension.startswith("tag:") and values
+        }
+        return {
+            "items": [dict(self._restaurant_summaries[doc]) for doc in docs],
+            "total": total,
+            "facets": {
+                "cuisine": counts.get("cuisine", []),
+                "neighborhood": counts.get("neighborhood", []),
+                "price_level": counts.get("price_level", []),
+                "tag_groups": tag_groups,
+            },
+        }
+
+    def list_restaurants(
+        self, q: str | None = None, limit: int | None = None, offset: int = 0
+    ) -> list[dict[str, Any]]:
+        return self.search_restaurants(q, limit, offset)[0]
+
+    def get_restaurant_summary(self, rid: str) -> dict[str, Any] | None:
+        summary = self._summaries_by_id.get(str(rid))
+        return dict(summary) if summary else None
 
     def get_restaurant(self, rid: str) -> dict[str, Any] | None:
         rid_str = str(rid)
@@ -464,30 +1147,230 @@ class Database:
         return self._restaurants_by_slug.get(rid_str.lower())
 
     # -------- reservations --------
-    async def list_reservations(self, owner_id: str | None = None) -> list[dict[str, Any]]:
-        async with get_session() as session:
-            stmt = select(ReservationRecord)
+    async def list_reservations(
+        self, owner_id: str | None = None, **filters: Any
+    ) -> list[dict[str, Any]]:
+        return (await self.list_reservations_page(owner_id, **filters))[0]
+
+    async def count_reservations(self) -> int:
+        """Live and archived reservations."""
+        async with self._session() as session:
+            live = await session.scalar(select(func.count()).select_from(ReservationRecord))
+            archived = await session.scalar(
+                select(func.count()).select_from(ReservationArchiveRecord)
+            )
+        return int(live) + int(archived)
+
+    def _starting_between(
+        self,
+        restaurant_id: str | None,
+        day_from: date | None,
+        day_to: date | None,
+        table: Any = ReservationRecord.__table__,
+    ) -> list[Any]:
+        """
+        Predicates for reservations starting on local days ``day_from``..``day_to`` (either end
+        open), in the restaurant's timezone or the catalog default without one.
+        """
+        record = self.get_restaurant(restaurant_id) if restaurant_id else None
+        tz_name = (record or {}).get("timezone")
+        clauses = []
+        if day_from:
+            clauses.append(table.c.start >= self._utc_day_bounds(day_from, tz_name)[0])
+        if day_to:
+            clauses.append(table.c.start < self._utc_day_bounds(day_to, tz_name)[1])
+        return clauses
+
+    async def list_reservations_page(
+        self,
+        owner_id: str | None = None,
+        *,
+        restaurant_id: str | None = None,
+        statuses: list[str] | None = None,
+        day_from: date | None = None,
+        day_to: date | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Reservations ordered by ``(start, id)`` after ``cursor``, and the cursor of the next page
+        (``None`` on the last one).
+
+        ``day_from``/``day_to`` are inclusive local dates in the restaurant's timezone (the
+        catalog default when no restaurant is given). Live and archived rows are paged
+        together: each table is read with the same filters along its own keyset index and the
+        two ordered streams are merged. Rows are read as plain column tuples: the listing never
+        needs ORM identity tracking.
+        """
+        after = _decode_cursor(cursor) if cursor else None
+        statements = []
+        for table in (ReservationRecord.__table__, ReservationArchiveRecord.__table__):
+            stmt = (
+                select(*(table.c[name] for name in ARCHIVED_COLUMNS))
+                .order_by(table.c.start, table.c.id)
+                .where(*self._starting_between(restaurant_id, day_from, day_to, table))
+            )
             if owner_id:
-                stmt = stmt.where(ReservationRecord.owner_id == owner_id)
-            rows = (await session.execute(stmt)).scalars().all()
-            return [_record_to_public_dict(row) for row in rows]
+                stmt = stmt.where(table.c.owner_id == owner_id)
+            if restaurant_id:
+                stmt = stmt.where(table.c.restaurant_id == restaurant_id)
+            if statuses:
+                stmt = stmt.where(table.c.status.in_(statuses))
+            if after:
+                stmt = stmt.where(tuple_(table.c.start, table.c.id) > tuple_(*after))
+            if limit is not None:
+                stmt = stmt.limit(limit + 1)
+            statements.append(stmt)
+        async with self._read_session(*_read_keys(restaurant_id, owner_id)) as session:
+            live, archived = [(await session.execute(stmt)).all() for stmt in statements]
+        rows = list(
+            heapq.merge(archived, live, key=lambda row: (_ensure_datetime(row.start), row.id))
+        )
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1].start, rows[-1].id)
+        return [_record_to_public_dict(row) for row in rows], next_cursor
+
+    async def _write(self, operation: Callable[[WriteBatch], Awaitable[Any]]) -> Any:
+        """
+        Run a reservation write transaction, group-committed with concurrent ones when
+        `RESERVATION_WRITE_BATCHING` is on.
+        """
+        if settings.RESERVATION_WRITE_BATCHING:
+            return await self._writes.submit(operation)
+        return await self._writes.run(operation)
+
+    async def _materialize_batch(self, batch: WriteBatch) -> None:
+        for rid, days in batch.touched.items():
+            await self._materialize_occupancy(batch.session, rid, days, batch.windows.get(rid))
+        if batch.touched:
+            keys = [key for rid in batch.touched for key in _read_keys(rid)]
+            batch.after_commit(partial(pin_reads, *keys))
+
+    @staticmethod
+    async def _latch_claims(session, rows: list[dict[str, Any]]) -> None:
+        """
+        Write claim rows, locking their buckets until commit: a concurrent writer of the same
+        bucket waits for this transaction (a row lock on Postgres, the write lock on SQLite).
+        """
+        if not rows:
+            return
+        upsert = pg_insert if session.bind.dialect.name == "postgresql" else sqlite_insert
+        stmt = upsert(SlotClaimRecord).values(rows)
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["restaurant_id", "table_id", "bucket_start"],
+                set_={"reservation_id": stmt.excluded.reservation_id},
+            )
+        )
+
+    async def _claim_slots(self, session, record: ReservationRecord) -> bool:
+        """
+        Latch the claim buckets of a blocking reservation, then report whether another blocking
+        reservation overlaps it on one of its tables. Anything committed before the latches
+        were taken is visible by then, and later bookings of these buckets wait for this one.
+        """
+        if record.status not in BLOCKING_STATUSES:
+            return False
+        await self._latch_claims(session, _claim_rows(record))
+        tables = set(split_table_ids(record.table_id))
+        result = await session.execute(
+            BLOCKING_RESERVATIONS,
+            {"rid": record.restaurant_id, "window_start": record.start, "window_end": record.end},
+        )
+        for other in result.scalars():
+            if other.id == record.id:
+                continue
+            other_tables = set(split_table_ids(other.table_id))
+            if not tables or not other_tables or tables & other_tables:
+                return True
+        return False
+
+    @staticmethod
+    async def _release_slots(session, resid: str) -> None:
+        await session.execute(
+            delete(SlotClaimRecord).where(SlotClaimRecord.reservation_id == resid)
+        )
+
+    async def _reclaim_slots(self, session, record: ReservationRecord) -> None:
+        """Move a reservation's claims to its current table, times and status."""
+        await self._release_slots(session, record.id)
+        if await self._claim_slots(session, record):
+            raise BookingConflict("Selected table/time is already booked", [])
 
     async def _conflicting_reservations(
         self, session, rid: str, start: datetime, end: datetime
     ) -> list[ReservationRecord]:
-        blocking_statuses = ("booked", "pending", "arrived")
-        stmt = (
-            select(ReservationRecord)
-            .where(ReservationRecord.restaurant_id == rid)
-            .where(ReservationRecord.status.in_(blocking_statuses))
-            .where(ReservationRecord.end > start)
-            .where(ReservationRecord.start < end)
-        )
+        stmt = BLOCKING_RESERVATIONS
         if getattr(session.bind.dialect, "name", "") != "sqlite":
-            stmt = stmt.with_for_update(of=ReservationRecord)
-        result = await session.execute(stmt)
+            stmt = BLOCKING_RESERVATIONS_FOR_UPDATE
+        result = await session.execute(
+            stmt, {"rid": rid, "window_start": start, "window_end": end}
+        )
         return result.scalars().all()
 
+    @staticmethod
+    def _blocks_from_records(
+        records: list[ReservationRecord],
+    ) -> list[tuple[str | None, datetime, datetime, int]]:
+        return [
+            (
+                record.table_id,
+                _ensure_datetime(record.start),
+                _ensure_datetime(record.end),
+                int(record.party_size or 0),
+            )
+            for record in records
+        ]
+
+    def _assign_table(
+        self,
+        rid: str,
+        party_size: int,
+        start: datetime,
+        end: datetime,
+        blocks: list[tuple[str | None, datetime, datetime, int]],
+    ) -> str | None:
+        specs = self._table_specs.get(rid, [])
+        groups = self._table_groups.get(rid, []) if settings.TABLE_COMBINATIONS_ENABLED else []
+        schedule = self._schedules.get(rid)
+        window = schedule.service_window_at(start) if schedule else None
+        table_id = choose_tables(specs, groups, party_size, start, end, blocks, window)
+        largest = specs[-1].capacity if specs else 0
+        seatable = largest >= party_size or any(
+            sum(spec.capacity for spec in group) >= party_size for group in groups
+        )
+        if table_id is None and specs and not seatable:
+            # Parties larger than any table keep the historical behaviour of taking the
+            # biggest table rather than being refused outright.
+            table_id = choose_tables(specs, [], largest, start, end, blocks, window, combine=False)
+        return table_id
+
+    def _booking_alternatives(
+        self,
+        rid: str,
+        party_size: int,
+        start: datetime,
+        end: datetime,
+        blocks: list[tuple[str | None, datetime, datetime, int]],
+        exclude: str | None = None,
+    ) -> list[dict[str, Any]]:
+        schedule = self._schedules.get(rid)
+        fits = schedule.fits_reservation if schedule else None
+        options = alternative_slots(
+            self._table_specs.get(rid, []), party_size, start, end, blocks, fits, exclude
+        )
+        localize = schedule.localize if schedule else _ensure_datetime
+        return [
+            {
+                "start": localize(alt_start).isoformat(timespec="seconds"),
+                "end": localize(alt_end).isoformat(timespec="seconds"),
+                "table_id": alt_table,
+            }
+            for alt_start, alt_end, alt_table in options
+        ]
+
     async def create_reservation(
         self, payload: ReservationCreate, owner_id: str | None = None
     ) -> Reservation:
@@ -509,47 +1392,108 @@ class Database:
         initial_status = "pending" if confirmation_mode == "manual" else "booked"
 
         tables_by_id = self._table_lookup(rid)
-        if payload.table_id:
-            table_id = str(payload.table_id)
+        table_id = str(payload.table_id) if payload.table_id else None
+        if table_id:
             if table_id not in tables_by_id:
                 raise HTTPException(
                     status_code=422, detail="table_id does not belong to restaurant"
                 )
             if tables_by_id[table_id].get("capacity", 1) < payload.party_size:
                 raise HTTPException(status_code=422, detail="party_size exceeds table capacity")
-        else:
-            table_id = None
-            for table, cap in self._tables_cache.get(rid, []):
-                if cap >= payload.party_size:
-                    table_id = str(table.get("id"))
-                    break
-            if not table_id and self._tables_cache.get(rid):
-                table_id = str(self._tables_cache[rid][-1][0].get("id"))
 
-        async with get_session() as session:
-            conflicts = await self._conflicting_reservations(session, rid, start, end)
-            for existing in conflicts:
-                existing_table = existing.table_id
-                if table_id and existing_table and existing_table != table_id:
+        for attempt in range(1, CLAIM_ATTEMPTS + 1):
+            try:
+                return await self._write(
+                    partial(
+                        self._book,
+                        payload=payload,
+                        rid=rid,
+                        start=start,
+                        end=end,
+                        table_id=table_id,
+                        status=initial_status,
+                        owner_id=owner_id,
+                        final=attempt == CLAIM_ATTEMPTS,
+                    )
+                )
+            except _ClaimLost:
+                continue
+        raise AssertionError("the final attempt raises instead of losing")
+
+    async def _book(
+        self,
+        batch: WriteBatch,
+        payload: ReservationCreate,
+        rid: str,
+        start: datetime,
+        end: datetime,
+        table_id: str | None,
+        status: str,
+        owner_id: str | None,
+        final: bool,
+    ) -> Reservation:
+        """
+        One booking. Raises `_ClaimLost` when the claim lost a race and another attempt
+        should re-read (the winner is committed by then); on the ``final`` attempt that is a
+        conflict instead.
+        """
+        session = batch.session
+        # One read around the request serves the conflict check, best-fit scoring and the
+        # alternatives offered when the slot is taken.
+        nearby = await self._conflicting_reservations(
+            session, rid, start - ALTERNATIVE_SEARCH_WINDOW, end + ALTERNATIVE_SEARCH_WINDOW
+        )
+        blocks = self._blocks_from_records(nearby)
+        if table_id or not self._table_specs.get(rid):
+            for existing_table, existing_start, existing_end, _ in blocks:
+                if not self._overlap(start, end, existing_start, existing_end):
                     continue
-                raise HTTPException(status_code=409, detail="Selected table/time is already booked")
-
-            record = ReservationRecord(
-                id=str(uuid4()),
-                restaurant_id=rid,
-                table_id=table_id,
-                party_size=payload.party_size,
-                start=start,
-                end=end,
-                guest_name=payload.guest_name,
-                guest_phone=payload.guest_phone or "",
-                status=initial_status,
-                owner_id=owner_id,
+                existing_tables = split_table_ids(existing_table)
+                if table_id and existing_tables and table_id not in existing_tables:
+                    continue
+                raise BookingConflict(
+                    "Selected table/time is already booked",
+                    self._booking_alternatives(
+                        rid, payload.party_size, start, end, blocks, exclude=table_id
+                    ),
+                )
+        else:
+            table_id = self._assign_table(rid, payload.party_size, start, end, blocks)
+            if table_id is None:
+                raise BookingConflict(
+                    "No table is available for the selected time",
+                    self._booking_alternatives(rid, payload.party_size, start, end, blocks),
+                )
+
+        record = ReservationRecord(
+            id=str(uuid4()),
+            restaurant_id=rid,
+            table_id=table_id,
+            party_size=payload.party_size,
+            start=start,
+            end=end,
+            guest_name=payload.guest_name,
+            guest_phone=payload.guest_phone or "",
+            status=status,
+            owner_id=owner_id,
+        )
+        # The claims are the actual guard: a concurrent booking that passed the same read
+        # loses here.
+        if await self._claim_slots(session, record):
+            if not final:
+                raise _ClaimLost
+            raise BookingConflict(
+                "Selected table/time is already booked",
+                self._booking_alternatives(
+                    rid, payload.party_size, start, end, blocks, exclude=table_id
+                ),
             )
-            session.add(record)
-            await session.commit()
-            await session.refresh(record)
-            return _record_to_reservation(record)
+        session.add(record)
+        await session.flush()
+        batch.touch(rid, self._local_days(rid, start, end), (start, end))
+        batch.after_commit(partial(self._invalidate_availability, rid, start, end))
+        batch.after_commit(partial(pin_reads, *_read_keys(owner_id=owner_id)))
+        return _record_to_reservation(record)
 
     def create_reservation_sync(
         self, payload: ReservationCreate, owner_id: str | None = None
@@ -561,56 +1505,399 @@ class Database:
         allowed = {"pending", "booked", "cancelled", "arrived", "no_show"}
         if status not in allowed:
             raise HTTPException(status_code=422, detail="invalid status")
-        async with get_session() as session:
-            record = await session.get(ReservationRecord, str(resid))
-            if not record:
-                return None
-            record.status = status
-            await session.commit()
-            await session.refresh(record)
-            return _record_to_public_dict(record)
+        return await self._write(partial(self._apply_status, resid=str(resid), status=status))
+
+    async def _apply_status(
+        self, batch: WriteBatch, resid: str, status: str
+    ) -> dict[str, Any] | None:
+        session = batch.session
+        record = await session.get(ReservationRecord, resid)
+        if not record:
+            return None
+        record.status = status
+        await self._reclaim_slots(session, record)
+        await session.flush()
+        await session.refresh(record)
+        rid, start, end = record.restaurant_id, record.start, record.end
+        batch.touch(rid, self._local_days(rid, start, end), (start, end))
+        batch.after_commit(partial(self._invalidate_availability, rid, start, end))
+        return _record_to_public_dict(record)
 
     def set_status_sync(self, resid: str, status: str) -> dict[str, Any] | None:
         """Synchronous helper for status updates."""
         return asyncio.run(self.set_status(resid, status))
 
-    async def cancel_reservation(self, resid: str) -> dict[str, Any] | None:
-        async with get_session() as session:
-            record = await session.get(ReservationRecord, str(resid))
-            if not record:
-                return None
-            payload = _record_to_public_dict(record)
-            await session.delete(record)
-            await session.commit()
-            return payload
+    async def transition_reservation(
+        self, resid: str, status: str, owner_id: str | None = None
+    ) -> dict[str, Any]:
+        """
+        Apply an owner-facing status change with one conditional ``UPDATE ... RETURNING``:
+        the row must exist, belong to ``owner_id`` (``None`` skips the check, for admins) and
+        currently hold a status `STATUS_TRANSITIONS` allows. Raises 404 for a missing or
+        foreign reservation and 409 for a refused transition.
+        """
+        if status not in STATUS_TRANSITIONS:
+            raise HTTPException(status_code=422, detail="invalid status")
+        return await self._write(
+            partial(self._apply_transition, resid=str(resid), status=status, owner_id=owner_id)
+        )
+
+    async def _apply_transition(
+        self, batch: WriteBatch, resid: str, status: str, owner_id: str | None
+    ) -> dict[str, Any]:
+        session = batch.session
+        stmt = (
+            update(ReservationRecord)
+            .where(ReservationRecord.id == resid)
+            .where(ReservationRecord.status.in_(STATUS_TRANSITIONS[status]))
+            .values(status=status)
+        )
+        if owner_id is not None:
+            stmt = stmt.where(ReservationRecord.owner_id == owner_id)
+        if session.bind.dialect.update_returning:
+            record = (await session.execute(stmt.returning(ReservationRecord))).scalar()
+        else:
+            # Builds without RETURNING (SQLite < 3.35): read the row back in the same
+            # transaction.
+            result = await session.execute(stmt)
+            record = None
+            if result.rowcount:
+                record = await session.get(ReservationRecord, resid, populate_existing=True)
+        if record is None:
+            current = (
+                await session.execute(
+                    select(ReservationRecord.owner_id, ReservationRecord.status).where(
+                        ReservationRecord.id == resid
+                    )
+                )
+            ).first()
+            if current is None or (owner_id is not None and current.owner_id != owner_id):
+                raise HTTPException(status_code=404, detail="Reservation not found")
+            raise HTTPException(
+                status_code=409,
+                detail=f"A {current.status} reservation cannot become {status}",
+            )
+        if status not in BLOCKING_STATUSES:
+            await self._release_slots(session, resid)
+            rid, start, end = record.restaurant_id, record.start, record.end
+            batch.touch(rid, self._local_days(rid, start, end), (start, end))
+            batch.after_commit(partial(self._invalidate_availability, rid, start, end))
+        batch.after_commit(partial(pin_reads, *_read_keys(owner_id=record.owner_id)))
+        return _record_to_public_dict(record)
+
+    async def cancel_reservation(
+        self, resid: str, owner_id: str | None = None
+    ) -> dict[str, Any] | None:
+        """
+        Delete a reservation (one ``DELETE ... RETURNING``), limited to ``owner_id``'s when
+        given. Returns ``None`` when nothing matched.
+        """
+        return await self._write(partial(self._apply_delete, resid=str(resid), owner_id=owner_id))
+
+    async def _apply_delete(
+        self, batch: WriteBatch, resid: str, owner_id: str | None
+    ) -> dict[str, Any] | None:
+        session = batch.session
+        stmt = delete(ReservationRecord).where(ReservationRecord.id == resid)
+        if owner_id is not None:
+            stmt = stmt.where(ReservationRecord.owner_id == owner_id)
+        if session.bind.dialect.delete_returning:
+            record = (await session.execute(stmt.returning(ReservationRecord))).scalar()
+        else:
+            record = await session.get(ReservationRecord, resid)
+            if record is not None and owner_id not in (None, record.owner_id):
+                record = None
+            if record is not None:
+                await session.execute(stmt)
+        if record is None:
+            return None
+        await self._release_slots(session, resid)
+        rid, start, end = record.restaurant_id, record.start, record.end
+        batch.touch(rid, self._local_days(rid, start, end), (start, end))
+        batch.after_commit(partial(self._invalidate_availability, rid, start, end))
+        batch.after_commit(partial(pin_reads, *_read_keys(owner_id=record.owner_id)))
+        return _record_to_public_dict(record)
 
     def cancel_reservation_sync(self, resid: str) -> dict[str, Any] | None:
         """Synchronous helper for cancellation."""
         return asyncio.run(self.cancel_reservation(resid))
 
+    async def bulk_transition(
+        self,
+        status: str,
+        *,
+        restaurant_id: str | None = None,
+        day_from: date | None = None,
+        day_to: date | None = None,
+        ended_before: datetime | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Move every matching reservation to ``status`` with one ``UPDATE ... RETURNING`` and
+        return the changed rows. Only statuses `STATUS_TRANSITIONS` allows are changed; rows
+        already in ``status`` are left alone and not returned.
+        """
+        if status not in STATUS_TRANSITIONS:
+            raise HTTPException(status_code=422, detail="invalid status")
+        table = ReservationRecord.__table__
+        sources = [source for source in STATUS_TRANSITIONS[status] if source != status]
+        where = [table.c.status.in_(sources)]
+        if restaurant_id:
+            where.append(table.c.restaurant_id == restaurant_id)
+        where.extend(self._starting_between(restaurant_id, day_from, day_to))
+        if ended_before:
+            where.append(table.c.end <= ended_before)
+        return await self._writes.run(
+            partial(self._apply_bulk, where=where, values={"status": status})
+        )
+
+    async def bulk_reassign_table(
+        self,
+        restaurant_id: str,
+        from_table_id: str,
+        to_table_id: str,
+        *,
+        day_from: date | None = None,
+        day_to: date | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Move the active reservations held on ``from_table_id`` that fit ``to_table_id`` onto
+        it, claims included. Raises `BookingConflict` (nothing moves) when the target table
+        is already taken at one of those times.
+        """
+        tables_by_id = self._table_lookup(restaurant_id)
+        if to_table_id not in tables_by_id:
+            raise HTTPException(status_code=422, detail="table_id does not belong to restaurant")
+        table = ReservationRecord.__table__
+        where = [
+            table.c.restaurant_id == restaurant_id,
+            table.c.table_id == from_table_id,
+            table.c.status.in_(BLOCKING_STATUSES),
+            table.c.party_size <= tables_by_id[to_table_id].get("capacity", 1),
+            *self._starting_between(restaurant_id, day_from, day_to),
+        ]
+        return await self._writes.run(
+            partial(
+                self._apply_bulk,
+                where=where,
+                values={"table_id": to_table_id},
+                moved_from=from_table_id,
+            )
+        )
+
+    async def _apply_bulk(
+        self,
+        batch: WriteBatch,
+        where: list[Any],
+        values: dict[str, Any],
+        moved_from: str | None = None,
+    ) -> list[dict[str, Any]]:
+        session = batch.session
+        table = ReservationRecord.__table__
+        stmt = update(table).where(*where).values(**values)
+        if session.bind.dialect.update_returning:
+            rows = (await session.execute(stmt.returning(*table.c))).all()
+        else:
+            ids = (await session.execute(select(table.c.id).where(*where))).scalars().all()
+            await session.execute(stmt)
+            rows = []
+            for offset in range(0, len(ids), BULK_ID_CHUNK):
+                chunk = ids[offset : offset + BULK_ID_CHUNK]
+                rows.extend(
+                    (await session.execute(select(table).where(table.c.id.in_(chunk)))).all()
+                )
+        ids = [row.id for row in rows]
+        for offset in range(0, len(ids), BULK_ID_CHUNK):
+            chunk = ids[offset : offset + BULK_ID_CHUNK]
+            if moved_from is not None or values.get("status") not in BLOCKING_STATUSES:
+                await session.execute(
+                    delete(SlotClaimRecord).where(SlotClaimRecord.reservation_id.in_(chunk))
+                )
+        if moved_from is not None and rows:
+            await self._claim_moved(session, rows, values["table_id"])
+        for row in rows:
+            batch.touch(
+                row.restaurant_id,
+                self._local_days(row.restaurant_id, row.start, row.end),
+                (row.start, row.end),
+            )
+        for rid, days in batch.touched.items():
+            batch.after_commit(partial(self._invalidate_days, rid, set(days)))
+        owners = {row.owner_id for row in rows if row.owner_id}
+        batch.after_commit(
+            partial(pin_reads, *(key for owner in owners for key in _read_keys(owner_id=owner)))
+        )
+        return [_record_to_public_dict(row) for row in rows]
+
+    async def _claim_moved(self, session, rows: list[Any], table_id: str) -> None:
+        """Latch ``rows`` on ``table_id``, where no blocking reservations may now overlap."""
+        claims = {
+            (claim["table_id"], claim["bucket_start"]): claim
+            for row in rows
+            for claim in _claim_rows(row)
+        }
+        await self._latch_claims(session, [claims[key] for key in sorted(claims)])
+        table = ReservationRecord.__table__
+        held = (
+            await session.execute(
+                select(table.c.table_id, table.c.start, table.c.end)
+                .where(table.c.restaurant_id == rows[0].restaurant_id)
+                .where(table.c.status.in_(BLOCKING_STATUSES))
+                .where(table.c.start < max(row.end for row in rows))
+                .where(table.c.end > min(row.start for row in rows))
+                .order_by(table.c.start)
+            )
+        ).all()
+        busy_until: datetime | None = None
+        for held_table, start, end in held:
+            tables = split_table_ids(held_table)
+            if tables and table_id not in tables:
+                continue
+            start, end = _ensure_datetime(start), _ensure_datetime(end)
+            if busy_until is not None and start < busy_until:
+                raise BookingConflict(
+                    "The target table is already booked at one of those times", []
+                )
+            busy_until = end if busy_until is None else max(busy_until, end)
+
     async def get_reservation(self, resid: str) -> dict[str, Any] | None:
-        async with get_session() as session:
-            record = await session.get(ReservationRecord, str(resid))
+        """A live reservation, or an archived one (read-only history)."""
+        async with self._session() as session:
+            record = await self._find_reservation(session, str(resid))
             if not record:
                 return None
             return _record_to_public_dict(record)
 
+    @staticmethod
+    async def _find_reservation(
+        session, resid: str
+    ) -> ReservationRecord | ReservationArchiveRecord | None:
+        record = await session.get(ReservationRecord, resid)
+        if record is None:
+            record = await session.scalar(
+                select(ReservationArchiveRecord).where(ReservationArchiveRecord.id == resid)
+            )
+        return record
+
+    async def archive_reservations(self, before: datetime | None = None) -> int:
+        """
+        Move reservations that ended before ``before`` (default: the configured archive
+        horizon ago) into `reservations_archive`, one batch per transaction, and return how
+        many moved. Safe to run from several workers: rows already archived are skipped.
+        """
+        if before is None:
+            if settings.RESERVATION_ARCHIVE_AFTER_DAYS <= 0:
+                return 0
+            before = datetime.now(UTC) - timedelta(days=settings.RESERVATION_ARCHIVE_AFTER_DAYS)
+        moved = 0
+        while True:
+            count = await self._writes.run(partial(self._archive_batch, before=before))
+            moved += count
+            if count < settings.RESERVATION_ARCHIVE_BATCH_SIZE:
+                return moved
+
+    async def _archive_batch(self, batch: WriteBatch, before: datetime) -> int:
+        session = batch.session
+        live = ReservationRecord.__table__
+        archive = ReservationArchiveRecord.__table__
+        dialect = session.bind.dialect.name
+        pick = (
+            select(live.c.id, live.c.restaurant_id, live.c.start, live.c.end)
+            .where(live.c.end < before)
+            .order_by(live.c.end)
+            .limit(settings.RESERVATION_ARCHIVE_BATCH_SIZE)
+        )
+        if dialect == "postgresql":
+            pick = pick.with_for_update(skip_locked=True)
+        rows = (await session.execute(pick)).all()
+        if not rows:
+            return 0
+        ids = [row.id for row in rows]
+        if dialect == "postgresql":
+            await self._ensure_archive_partitions(session, {row.start for row in rows})
+        upsert = pg_insert if dialect == "postgresql" else sqlite_insert
+        await session.execute(
+            upsert(archive)
+            .from_select(
+                ARCHIVED_COLUMNS,
+                select(*(live.c[name] for name in ARCHIVED_COLUMNS)).where(live.c.id.in_(ids)),
+            )
+            .on_conflict_do_nothing()
+        )
+        await session.execute(delete(live).where(live.c.id.in_(ids)))
+        await session.execute(
+            delete(SlotClaimRecord).where(SlotClaimRecord.reservation_id.in_(ids))
+        )
+        # Every reservation on a day that ended a full day before the cutoff is archived in this
+        # run, so such days drop their stored occupancy (reads fall back to computing it);
+        # days straddling the cutoff are rematerialised from the rows that stay live.
+        expired: dict[str, set[date]] = {}
+        for row in rows:
+            rid = row.restaurant_id
+            tz_name = self.restaurants.get(rid, {}).get("timezone")
+            for day in self._local_days(rid, row.start, row.end):
+                if self._utc_day_bounds(day, tz_name)[1] + timedelta(days=1) <= before:
+                    expired.setdefault(rid, set()).add(day)
+                else:
+                    batch.touch(rid, {day})
+        for rid, days in expired.items():
+            await session.execute(
+                delete(SlotOccupancyRecord)
+                .where(SlotOccupancyRecord.restaurant_id == rid)
+                .where(SlotOccupancyRecord.local_date.in_(sorted(days)))
+            )
+        for rid in expired.keys() | batch.touched.keys():
+            days = expired.get(rid, set()) | batch.touched.get(rid, set())
+            batch.after_commit(partial(self._invalidate_days, rid, days))
+        return len(rows)
+
+    @staticmethod
+    async def _ensure_archive_partitions(session, starts: set[datetime]) -> None:
+        """Create the monthly `reservations_archive` partitions these start times fall in."""
+        months = {(start.astimezone(UTC).year, start.astimezone(UTC).month) for start in starts}
+        for year, month in sorted(months):
+            upper = (year + 1, 1) if month == 12 else (year, month + 1)
+            await session.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS reservations_archive_{year:04d}_{month:02d} "
+                    "PARTITION OF reservations_archive FOR VALUES "
+                    f"FROM ('{year:04d}-{month:02d}-01 00:00:00+00') "
+                    f"TO ('{upper[0]:04d}-{upper[1]:02d}-01 00:00:00+00')"
+                )
+            )
+
     async def update_reservation(self, resid: str, **fields: Any) -> dict[str, Any] | None:
-        async with get_session() as session:
+        async with self._session() as session:
             record = await session.get(ReservationRecord, str(resid))
             if not record:
                 return None
+            previous = (record.restaurant_id, record.start, record.end)
             for key, value in fields.items():
                 if key in {"start", "end"} and value is not None:
                     setattr(record, key, _ensure_datetime(value))
                 else:
                     setattr(record, key, value)
+            await self._reclaim_slots(session, record)
+            touched = self._local_days(*previous)
+            windows = [previous[1:]]
+            if record.restaurant_id == previous[0]:
+                touched |= self._local_days(record.restaurant_id, record.start, record.end)
+                windows.append((record.start, record.end))
+            else:
+                await self._materialize_occupancy(
+                    session,
+                    record.restaurant_id,
+                    self._local_days(record.restaurant_id, record.start, record.end),
+                    [(record.start, record.end)],
+                )
+            await self._materialize_occupancy(session, previous[0], touched, windows)
             await session.commit()
             await session.refresh(record)
+            self._invalidate_availability(*previous)
+            self._invalidate_availability(record.restaurant_id, record.start, record.end)
             return _record_to_public_dict(record)
 
     async def get_review_for_reservation(self, resid: str) -> dict[str, Any] | None:
-        async with get_session() as session:
+        async with self._session() as session:
             stmt = select(ReviewRecord).where(ReviewRecord.reservation_id == resid)
             result = await session.execute(stmt)
             review = result.scalar_one_or_none()
@@ -621,8 +1908,8 @@ class Database:
     ) -> dict[str, Any]:
         if rating < 1 or rating > 5:
             raise HTTPException(status_code=422, detail="rating must be between 1 and 5")
-        async with get_session() as session:
-            reservation = await session.get(ReservationRecord, str(resid))
+        async with self._session() as session:
+            reservation = await self._find_reservation(session, str(resid))
             if not reservation:
                 raise HTTPException(status_code=404, detail="Reservation not found")
             if reservation.status != "arrived":
@@ -643,16 +1930,46 @@ class Database:
                 comment=comment.strip() if comment else None,
             )
             session.add(review)
+            bucket = getattr(RestaurantRecord, f"rating_{review.rating}")
+            bump = (
+                update(RestaurantRecord)
+                .where(RestaurantRecord.id == reservation.restaurant_id)
+                .where(RestaurantRecord.rating_count.is_not(None))
+                .values(
+                    {
+                        RestaurantRecord.rating_sum: RestaurantRecord.rating_sum + review.rating,
+                        RestaurantRecord.rating_count: RestaurantRecord.rating_count + 1,
+                        bucket: func.coalesce(bucket, 0) + 1,
+                    }
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if session.bind.dialect.update_returning:
+                bumped = await session.execute(bump.returning(*_AGGREGATE_COLUMNS))
+                aggregates = bumped.one_or_none()
+            elif (await session.execute(bump)).rowcount:
+                aggregates = (
+                    await session.execute(
+                        select(*_AGGREGATE_COLUMNS).where(
+                            RestaurantRecord.id == reservation.restaurant_id
+                        )
+                    )
+                ).one()
+            else:
+                aggregates = None
             await session.commit()
             await session.refresh(review)
-            # refresh aggregates
+        pin_reads(*_read_keys(reservation.restaurant_id, owner_id))
+        if aggregates is not None:
+            self._apply_review_stats({reservation.restaurant_id: _review_stats(*aggregates)})
+        else:
             await self._refresh_review_stats_for_restaurant(reservation.restaurant_id)
-            return _review_to_public(review)
+        return _review_to_public(review)
 
     async def list_reviews(
         self, restaurant_id: str, limit: int = 50, offset: int = 0
     ) -> list[dict[str, Any]]:
-        async with get_session() as session:
+        async with self._read_session(*_read_keys(restaurant_id)) as session:
             stmt = (
                 select(ReviewRecord)
                 .where(ReviewRecord.restaurant_id == restaurant_id)
@@ -664,4 +1981,16 @@ class Database:
             return [_review_to_public(r) for r in result.scalars().all()]
 
 
-DB = Database()
+def _build_database() -> Database:
+    """Lazy fallback for scripts and tests that touch `DB` without the app lifespan."""
+    database = Database()
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(database.startup())
+    else:
+        database.start_in_background(loop)
+    return database
+
+
+DB: LazyService[Database] = LazyService("database", _build_database)
@@ -0,0 +1,280 @@
+"""
+Table assignment for bookings that arrive without a ``table_id``.
+
+`choose_tables` runs inside the booking transaction against the restaurant's nearby blocking
+reservations. Among the tables that are free for the requested window it picks the best fit:
+least wasted seats first, then the placement that leaves the fewest unusable gaps (shorter than
+one reservation) next to neighbouring bookings or the service edges. When no single table seats
+the party, adjacent tables in the same area can be combined; combined assignments are stored as
+``"<id>+<id>"`` and `split_table_ids` expands them for conflict checks and availability grids.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import combinations
+from typing import Any
+
+from .schedule import INTERVAL, RES_DURATION
+
+COMBINED_TABLE_SEPARATOR = "+"
+MAX_COMBINED_TABLES = 3
+# Floor-plan positions are percentages of the area; tables closer than this can be pushed together.
+ADJACENT_DISTANCE = 25.0
+
+# Conflict responses suggest up to this many alternatives within this distance of the request.
+MAX_ALTERNATIVES = 5
+ALTERNATIVE_SEARCH_WINDOW = timedelta(hours=2)
+
+Block = tuple[str | None, datetime, datetime, int]
+
+
+def split_table_ids(table_id: str | None) -> list[str]:
+    if not table_id:
+        return []
+    return [part for part in str(table_id).split(COMBINED_TABLE_SEPARATOR) if part]
+
+
+def join_table_ids(table_ids: Iterable[str]) -> str:
+    return COMBINED_TABLE_SEPARATOR.join(table_ids)
+
+
+@dataclass(frozen=True, slots=True)
+class TableSpec:
+    id: str
+    capacity: int
+    area_id: str
+    position: tuple[float, float] | None
+
+
+def table_specs(areas: list[dict[str, Any]] | None) -> list[TableSpec]:
+    """Flatten a restaurant's ``areas`` into specs sorted by capacity (stable within ties)."""
+    specs: list[TableSpec] = []
+    for area in areas or []:
+        area_id = str(area.get("id") or "")
+        for table in area.get("tables") or []:
+            position = table.get("position")
+            try:
+                point = (float(position[0]), float(position[1])) if position else None
+            except (TypeError, ValueError, IndexError):
+                point = None
+            specs.append(
+                TableSpec(
+                    id=str(table.get("id")),
+                    capacity=int(table.get("capacity", 2) or 2),
+                    area_id=area_id,
+                    position=point,
+                )
+            )
+    specs.sort(key=lambda spec: spec.capacity)
+    return specs
+
+
+def _adjacent(a: TableSpec, b: TableSpec) -> bool:
+    if a.area_id != b.area_id or a.position is None or b.position is None:
+        return False
+    return math.dist(a.position, b.position) <= ADJACENT_DISTANCE
+
+
+def _connected(group: tuple[TableSpec, ...]) -> bool:
+    reached = {0}
+    frontier = [0]
+    while frontier:
+        current = group[frontier.pop()]
+        for idx, other in enumerate(group):
+            if idx not in reached and _adjacent(current, other):
+                reached.add(idx)
+                frontier.append(idx)
+    return len(reached) == len(group)
+
+
+def combinable_groups(
+    specs: list[TableSpec], max_tables: int = MAX_COMBINED_TABLES
+) -> list[tuple[TableSpec, ...]]:
+    """Connected sets of 2..``max_tables`` adjacent tables, ordered by combined capacity."""
+    by_area: dict[str, list[TableSpec]] = {}
+    for spec in specs:
+        if spec.position is not None:
+            by_area.setdefault(spec.area_id, []).append(spec)
+    groups: list[tuple[TableSpec, ...]] = []
+    for area_specs in by_area.values():
+        for size in range(2, max_tables + 1):
+            for group in combinations(area_specs, size):
+                if _connected(group):
+                    groups.append(group)
+    groups.sort(key=lambda group: (sum(spec.capacity for spec in group), len(group)))
+    return groups
+
+
+def _busy_intervals(
+    specs: list[TableSpec], blocks: Iterable[Block]
+) -> dict[str, list[tuple[datetime, datetime]]]:
+    busy: dict[str, list[tuple[datetime, datetime]]] = {}
+    for table_id, start, end, size in blocks:
+        ids = split_table_ids(table_id)
+        if not ids:
+            # Legacy unassigned bookings hold the smallest table that seats them, matching
+            # how the availability grid places them.
+            fallback = next((s for s in specs if s.capacity >= max(1, size)), None)
+            if fallback is None:
+                continue
+            ids = [fallback.id]
+        for tid in ids:
+            busy.setdefault(tid, []).append((start, end))
+    return busy
+
+
+def _gap_cost(
+    intervals: list[tuple[datetime, datetime]],
+    start: datetime,
+    end: datetime,
+    window: tuple[datetime, datetime] | None,
+) -> tuple[float, float]:
+    """(unusable gap minutes, total gap minutes) left around ``[start, end)`` on one table."""
+    lower = start - RES_DURATION
+    upper = end + RES_DURATION
+    if window is not None:
+        lower = max(lower, window[0])
+        upper = min(upper, window[1])
+    prev_end = max([e for _, e in intervals if e <= start] + [lower])
+    next_start = min([s for s, _ in intervals if s >= end] + [upper])
+    wasted = 0.0
+    total = 0.0
+    for gap in (start - prev_end, next_start - end):
+        if gap <= timedelta(0):
+            continue
+        minutes = gap.total_seconds() / 60
+        total += minutes
+        if gap < RES_DURATION:
+            wasted += minutes
+    return wasted, total
+
+
+def _is_free(intervals: list[tuple[datetime, datetime]], start: datetime, end: datetime) -> bool:
+    return all(not (s < end and e > start) for s, e in intervals)
+
+
+def choose_tables(
+    specs: list[TableSpec],
+    groups: list[tuple[TableSpec, ...]],
+    party_size: int,
+    start: datetime,
+    end: datetime,
+    blocks: Iterable[Block],
+    window: tuple[datetime, datetime] | None = None,
+    combine: bool = True,
+) -> str | None:
+    """
+    Best-fit table (or combined tables) for ``party_size`` over ``[start, end)``.
+
+    ``blocks`` are blocking reservations around the window as ``(table_id, start, end,
+    party_size)``; ``window`` is the service's open/close so gaps against the edges count too.
+    Returns ``None`` when nothing that seats the party is free.
+    """
+    busy = _busy_intervals(specs, blocks)
+    empty: list[tuple[datetime, datetime]] = []
+
+    best: tuple[tuple[Any, ...], str] | None = None
+    for order, spec in enumerate(specs):
+        if spec.capacity < party_size:
+            continue
+        intervals = busy.get(spec.id, empty)
+        if not _is_free(intervals, start, end):
+            continue
+        wasted, total = _gap_cost(intervals, start, end, window)
+        score = (spec.capacity - party_size, wasted, total, order)
+        if best is None or score < best[0]:
+            best = (score, spec.id)
+    if best is not None:
+        return best[1]
+    if not combine:
+        return None
+
+    best_group: tuple[tuple[Any, ...], str] | None = None
+    for order, group in enumerate(groups):
+        seats = sum(spec.capacity for spec in group)
+        if seats < party_size:
+            continue
+        if best_group is not None and seats - party_size > best_group[0][0]:
+            # Groups are ordered by capacity, so nothing later can waste fewer seats than the
+            # best free group found so far.
+            break
+        wasted = total = 0.0
+        for spec in group:
+            intervals = busy.get(spec.id, empty)
+            if not _is_free(intervals, start, end):
+                break
+            spec_wasted, spec_total = _gap_cost(intervals, start, end, window)
+            wasted += spec_wasted
+            total += spec_total
+        else:
+            score = (seats - party_size, len(group), wasted, total, order)
+            if best_group is None or score < best_group[0]:
+                best_group = (score, join_table_ids(spec.id for spec in group))
+    return best_group[1] if best_group is not None else None
+
+
+def alternative_slots(
+    specs: list[TableSpec],
+    party_size: int,
+    start: datetime,
+    end: datetime,
+    blocks: Iterable[Block],
+    fits: Callable[[datetime], bool] | None = None,
+    exclude: str | None = None,
+    limit: int = MAX_ALTERNATIVES,
+) -> list[tuple[datetime, datetime, str]]:
+    """
+    Nearest free ``(start, end, table_id)`` options for a request that could not be booked.
+
+    Other tables free at the requested time come first (smallest seats first), followed by the
+    closest earlier and later start on the ``INTERVAL`` grid within
+    ``ALTERNATIVE_SEARCH_WINDOW``. ``blocks`` must cover that window; ``fits`` rejects starts
+    outside opening hours.
+    """
+    if limit <= 0:
+        return []
+    busy = _busy_intervals(specs, blocks)
+    fitting = [spec for spec in specs if spec.capacity >= party_size]
+    duration = end - start
+
+    def free_at(candidate: datetime) -> list[str]:
+        return [
+            spec.id
+            for spec in fitting
+            if _is_free(busy.get(spec.id, []), candidate, candidate + duration)
+        ]
+
+    shifted: list[tuple[datetime, datetime, str]] = []
+    for sign in (-1, 1):
+        offset = INTERVAL
+        while offset <= ALTERNATIVE_SEARCH_WINDOW:
+            candidate = start + sign * offset
+            if fits is None or fits(candidate):
+                free = free_at(candidate)
+                if free:
+                    shifted.append((candidate, candidate + duration, free[0]))
+                    break
+            offset += INTERVAL
+    same_time = [(start, end, tid) for tid in free_at(start) if tid != exclude]
+    shifted = shifted[:limit]
+    return same_time[: limit - len(shifted)] + shifted
+
+
+__all__ = [
+    "ADJACENT_DISTANCE",
+    "ALTERNATIVE_SEARCH_WINDOW",
+    "COMBINED_TABLE_SEPARATOR",
+    "MAX_ALTERNATIVES",
+    "MAX_COMBINED_TABLES",
+    "TableSpec",
+    "alternative_slots",
+    "choose_tables",
+    "combinable_groups",
+    "join_table_ids",
+    "split_table_ids",
+    "table_specs",
+]
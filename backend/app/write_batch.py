@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, TypeVar
+
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+# SQLite lock contention: attempts and the jittered backoff step (seconds, grows per attempt).
+LOCK_RETRY_ATTEMPTS = 8
+LOCK_RETRY_BACKOFF = 0.02
+
+T = TypeVar("T")
+
+
+async def retry_on_lock(operation: Callable[[], Awaitable[T]]) -> T:
+    """
+    Re-run a write transaction that SQLite aborted because another connection held the
+    write lock (two deferred transactions upgrading at once). Claims, not this retry,
+    decide who wins a slot; Postgres never reports lock contention this way.
+    """
+    for attempt in range(1, LOCK_RETRY_ATTEMPTS + 1):
+        try:
+            return await operation()
+        except OperationalError as exc:
+            if attempt == LOCK_RETRY_ATTEMPTS or "database is locked" not in str(exc.orig):
+                raise
+            await asyncio.sleep(random.uniform(0, LOCK_RETRY_BACKOFF * attempt))
+    raise AssertionError("the final attempt re-raises")
+
+
+@dataclass
+class WriteBatch:
+    """
+    The transaction a write operation runs in. Operations record the restaurant days they
+    changed (materialised once per batch before the commit), optionally narrowed to the
+    reservation times that changed, and the in-process side effects that must wait until the
+    commit succeeded.
+    """
+
+    session: Any
+    touched: dict[str, set[date]] = field(default_factory=dict)
+    # Changed reservation times per restaurant; ``None`` once a touch covered whole days.
+    windows: dict[str, list[tuple[datetime, datetime]] | None] = field(default_factory=dict)
+    callbacks: list[Callable[[], None]] = field(default_factory=list)
+
+    def touch(
+        self, rid: str, days: set[date], window: tuple[datetime, datetime] | None = None
+    ) -> None:
+        self.touched.setdefault(rid, set()).update(days)
+        if window is None:
+            self.windows[rid] = None
+        elif self.windows.get(rid, []) is not None:
+            self.windows.setdefault(rid, []).append(window)
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        self.callbacks.append(callback)
+
+    def committed(self) -> None:
+        for callback in self.callbacks:
+            try:
+                callback()
+            except Exception:  # pragma: no cover - side effects must not fail the write
+                logger.exception("After-commit callback failed")
+
+
+WriteOperation = Callable[[WriteBatch], Awaitable[Any]]
+
+
+class WriteCoalescer:
+    """
+    Group commit for short write transactions.
+
+    `run` executes one operation in its own transaction. `submit` queues it instead: the
+    first submission opens a window of ``window`` seconds, after which everything queued
+    (up to ``max_size`` per transaction) runs in one transaction and one commit. Each
+    operation gets its own SAVEPOINT, so a conflict rolls back and fails only that caller;
+    later operations in the batch read the rows earlier ones flushed. Batches run one after
+    another, and whatever queued while one was committing forms the next.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        before_commit: Callable[[WriteBatch], Awaitable[None]],
+        window: float = 0.005,
+        max_size: int = 64,
+    ) -> None:
+        self._session_factory = session_factory
+        self._before_commit = before_commit
+        self.window = window
+        self.max_size = max_size
+        self._pending: list[tuple[WriteOperation, asyncio.Future]] = []
+        self._flusher: asyncio.Task | None = None
+
+    async def run(self, operation: WriteOperation) -> Any:
+        async def attempt() -> tuple[WriteBatch, Any]:
+            async with self._session_factory() as session:
+                batch = WriteBatch(session)
+                result = await operation(batch)
+                await self._before_commit(batch)
+                await session.commit()
+                return batch, result
+
+        batch, result = await retry_on_lock(attempt)
+        batch.committed()
+        return result
+
+    async def submit(self, operation: WriteOperation) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((operation, future))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+        return await future
+
+    async def _flush(self) -> None:
+        await asyncio.sleep(self.window)
+        while self._pending:
+            items = self._pending[: self.max_size]
+            del self._pending[: self.max_size]
+            items = [(operation, future) for operation, future in items if not future.done()]
+            if items:
+                await self._run_batch(items)
+
+    async def _run_batch(self, items: list[tuple[WriteOperation, asyncio.Future]]) -> None:
+        async def attempt() -> tuple[WriteBatch, list[tuple[bool, Any]]]:
+            async with self._session_factory() as session:
+                batch = WriteBatch(session)
+                outcomes: list[tuple[bool, Any]] = []
+                for operation, _ in items:
+                    callbacks = len(batch.callbacks)
+                    try:
+                        async with session.begin_nested():
+                            outcomes.append((True, await operation(batch)))
+                    except Exception as exc:
+                        del batch.callbacks[callbacks:]
+                        outcomes.append((False, exc))
+                await self._before_commit(batch)
+                await session.commit()
+                return batch, outcomes
+
+        try:
+            batch, outcomes = await retry_on_lock(attempt)
+        except Exception as exc:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        batch.committed()
+        for (_, future), (ok, value) in zip(items, outcomes, strict=True):
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
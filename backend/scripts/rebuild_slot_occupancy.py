@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Recompute (or verify) the slot_occupancy table from reservations."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+
+from backend.app.storage import DB, Database
+
+
+async def run(restaurant: str | None, check: bool) -> int:
+    await DB.provide(Database()).startup()
+    if check:
+        mismatches = await DB.slot_occupancy_mismatches(restaurant)
+        for row in mismatches:
+            print(f"{row['restaurant_id']} {row['date']}: {row['reason']}")
+        print(f"{len(mismatches)} mismatched restaurant day(s)")
+        return 1 if mismatches else 0
+    written = await DB.rebuild_slot_occupancy(restaurant)
+    print(f"Wrote {written} slot occupancy rows")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--restaurant", help="only rebuild/check this restaurant id")
+    parser.add_argument(
+        "--check", action="store_true", help="report mismatches without writing; exit 1 if any"
+    )
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.restaurant, args.check)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""Shared test setup: isolate persistence and auth before the app modules are imported."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="baku-reserve-tests-")
+os.environ.pop("DATABASE_URL", None)
+os.environ["AUTH0_BYPASS"] = "true"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
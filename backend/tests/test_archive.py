@@ -0,0 +1,80 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from app.contracts import ReservationCreate
+from app.db.core import get_session
+from app.db.models import ReservationRecord, SlotClaimRecord, SlotOccupancyRecord
+from app.schedule import RES_DURATION
+from app.storage import DB
+from sqlalchemy import func, select
+
+OWNER = "archive-owner"
+
+
+def test_archived_reservations_leave_the_live_table_but_stay_readable():
+    rid = next(rid for rid in DB.restaurants if len(DB.eligible_tables(rid, 2)) >= 2)
+    tables = [table["id"] for table in DB.eligible_tables(rid, 2)[:2]]
+    old = datetime(2021, 3, 4, 19, 0, tzinfo=ZoneInfo("Asia/Baku"))
+    recent = datetime(2038, 3, 4, 19, 0, tzinfo=ZoneInfo("Asia/Baku"))
+
+    def book(start, table_id):
+        return DB.create_reservation_sync(
+            ReservationCreate(
+                restaurant_id=rid,
+                party_size=2,
+                start=start,
+                end=start + RES_DURATION,
+                guest_name="Archive",
+                table_id=table_id,
+            ),
+            owner_id=OWNER,
+        )
+
+    history = [book(old, table_id) for table_id in tables]
+    kept = book(recent, tables[0])
+    asyncio.run(DB.set_status(history[0].id, "arrived"))
+
+    async def live_rows(resid):
+        async with get_session() as session:
+            reservations = await session.scalar(
+                select(func.count()).where(ReservationRecord.id == resid)
+            )
+            claims = await session.scalar(
+                select(func.count()).where(SlotClaimRecord.reservation_id == resid)
+            )
+            occupancy = await session.scalar(
+                select(func.count())
+                .where(SlotOccupancyRecord.restaurant_id == rid)
+                .where(SlotOccupancyRecord.local_date == old.date())
+            )
+        return reservations, claims, occupancy
+
+    assert asyncio.run(live_rows(history[0].id))[0] == 1
+    total = asyncio.run(DB.count_reservations())
+    cutoff = datetime(2022, 1, 1, tzinfo=ZoneInfo("UTC"))
+    assert asyncio.run(DB.archive_reservations(before=cutoff)) >= 2
+    assert asyncio.run(live_rows(history[0].id)) == (0, 0, 0)
+    assert asyncio.run(DB.count_reservations()) == total
+
+    archived = asyncio.run(DB.get_reservation(history[0].id))
+    assert archived["status"] == "arrived"
+    assert archived["start"] == history[0].start.astimezone(ZoneInfo("UTC")).isoformat()
+    page, cursor = asyncio.run(DB.list_reservations_page(OWNER, restaurant_id=rid, limit=2))
+    rest, _ = asyncio.run(DB.list_reservations_page(OWNER, restaurant_id=rid, cursor=cursor))
+    assert [item["id"] for item in page + rest][-1] == kept.id
+    assert sorted(item["id"] for item in page + rest) == sorted(r.id for r in [*history, kept])
+    old_day = asyncio.run(
+        DB.list_reservations(
+            OWNER, restaurant_id=rid, day_from=date(2021, 3, 4), day_to=date(2021, 3, 4)
+        )
+    )
+    assert len(old_day) == 2
+
+    review = asyncio.run(DB.create_review(history[0].id, OWNER, rating=5))
+    assert review["reservation_id"] == history[0].id
+    # The freed history no longer blocks anything, and nothing live moved.
+    book(old, tables[0])
+    assert asyncio.run(DB.get_reservation(kept.id))["status"] == "booked"
+    assert asyncio.run(DB.archive_reservations(before=old - timedelta(days=1))) == 0
+    assert asyncio.run(DB.slot_occupancy_mismatches(rid)) == []
@@ -0,0 +1,199 @@
+import asyncio
+import random
+from datetime import UTC, date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from app.availability import RES_DURATION, availability_for_day
+from app.cache import AvailabilityCache, availability_cache
+from app.main import app
+from app.storage import DB
+from fastapi.testclient import TestClient
+
+
+class _FakeDB:
+    def __init__(self, tables, bookings):
+        self.tables = sorted(tables, key=lambda t: t["capacity"])
+        self.bookings = bookings
+
+    def eligible_tables(self, rid, party_size):
+        return [t for t in self.tables if t["capacity"] >= party_size]
+
+    async def reservation_blocks_for_day(self, rid, day, tz):
+        return list(self.bookings)
+
+
+def _naive_free_ids(db, party_size, slot_start, slot_end):
+    tables = db.eligible_tables("r", party_size)
+    taken = set()
+    for table_id, start, end, size in db.bookings:
+        if start < slot_end and end > slot_start:
+            # Unassigned bookings land on the smallest table that fits their own party.
+            taken.add(table_id or db.eligible_tables("r", size)[0]["id"])
+    return [t["id"] for t in tables if t["id"] not in taken]
+
+
+def test_bitmask_engine_matches_overlap_scan():
+    rng = random.Random(42)
+    for _ in range(25):
+        tables = [{"id": f"t{i}", "capacity": rng.choice((2, 4, 6))} for i in range(12)]
+        day = date(2025, 3, 1) + timedelta(days=rng.randint(0, 60))
+        base = datetime(day.year, day.month, day.day, 4, 0, tzinfo=UTC)
+        bookings = []
+        for _ in range(30):
+            start = base + timedelta(minutes=15 * rng.randint(0, 60))
+            table = rng.choice(tables)
+            bookings.append((
+                None if rng.random() < 0.1 else table["id"],
+                start,
+                start + RES_DURATION,
+                2,
+            ))
+        db = _FakeDB(tables, bookings)
+        restaurant = {
+            "id": "r",
+            "timezone": "Asia/Baku",
+            "hours": {"open": "09:00", "close": "01:00"},
+        }
+        party = rng.choice((1, 2, 4))
+        payload = asyncio.run(availability_for_day(restaurant, party, day, db))
+        assert payload["slots"]
+        for slot in payload["slots"]:
+            start = datetime.fromisoformat(slot["start"])
+            end = datetime.fromisoformat(slot["end"])
+            assert slot["available_table_ids"] == _naive_free_ids(db, party, start, end)
+            assert slot["count"] == len(slot["available_table_ids"])
+
+
+def _book(client, rid, table_id, start, party_size=2):
+    payload = {
+        "restaurant_id": rid,
+        "party_size": party_size,
+        "start": start.isoformat(),
+        "end": (start + RES_DURATION).isoformat(),
+        "guest_name": "Range Test",
+        "table_id": table_id,
+    }
+    response = client.post("/v1/reservations", json=payload)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_range_endpoint_matches_day_view():
+    rid = next(rid for rid in DB.restaurants if DB.eligible_tables(rid, 6))
+    tables = DB.eligible_tables(rid, 2)
+    first = date(2031, 5, 10)
+    client = TestClient(app)
+    _book(client, rid, tables[0]["id"], datetime(2031, 5, 10, 15, 0, tzinfo=UTC))
+    _book(client, rid, tables[-1]["id"], datetime(2031, 5, 11, 19, 30, tzinfo=UTC), 6)
+
+    response = client.get(
+        f"/v1/restaurants/{rid}/availability/range",
+        params={"from": "2031-05-10", "to": "2031-05-12", "party_sizes": "6,2"},
+    )
+    assert response.status_code == 200, response.text
+    payload = response.json()
+    assert payload["party_sizes"] == [2, 6]
+    assert [d["date"] for d in payload["days"]] == ["2031-05-10", "2031-05-11", "2031-05-12"]
+    for offset, entry in enumerate(payload["days"]):
+        day = (first + timedelta(days=offset)).isoformat()
+        for size, slots in entry["party_sizes"].items():
+            single = client.get(
+                f"/v1/restaurants/{rid}/availability", params={"date": day, "party_size": size}
+            ).json()
+            assert slots == single["slots"]
+
+    too_long = client.get(
+        f"/v1/restaurants/{rid}/availability/range",
+        params={"from": "2031-05-01", "to": "2031-05-20", "party_sizes": "2"},
+    )
+    assert too_long.status_code == 422
+
+
+def test_citywide_search_excludes_fully_booked_restaurants():
+    client = TestClient(app)
+    rid = next(rid for rid in DB.restaurants if DB.eligible_tables(rid, 6))
+    local = datetime(2031, 6, 3, 20, 0, tzinfo=ZoneInfo("Asia/Baku"))
+    for table in DB.eligible_tables(rid, 6):
+        _book(client, rid, table["id"], local, 6)
+
+    def search(party_size):
+        response = client.get(
+            "/v1/availability/search",
+            params={"date": "2031-06-03", "time": "20:00", "party_size": party_size, "limit": 100},
+        )
+        assert response.status_code == 200, response.text
+        return {item["id"]: item for item in response.json()["results"]}
+
+    assert rid not in search(6)
+    small = search(2)
+    assert rid in small
+    assert small[rid]["count"] == len(DB.eligible_tables(rid, 2)) - len(DB.eligible_tables(rid, 6))
+
+
+def test_availability_cache_invalidated_by_writes():
+    client = TestClient(app)
+    rid = next(rid for rid in DB.restaurants if DB.eligible_tables(rid, 2))
+    table_id = DB.eligible_tables(rid, 2)[0]["id"]
+    params = {"date": "2031-07-01", "party_size": 2}
+    url = f"/v1/restaurants/{rid}/availability"
+
+    before = availability_cache.stats()
+    first = client.get(url, params=params).json()
+    assert client.get(url, params=params).json() == first
+    after = availability_cache.stats()
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+
+    local = datetime(2031, 7, 1, 19, 0, tzinfo=ZoneInfo("Asia/Baku"))
+    booking = _book(client, rid, table_id, local)
+    booked = client.get(url, params=params).json()
+    slot = next(s for s in booked["slots"] if datetime.fromisoformat(s["start"]) == local)
+    assert table_id not in slot["available_table_ids"]
+
+    assert client.post(f"/v1/reservations/{booking['id']}/cancel").status_code == 200
+    assert client.get(url, params=params).json() == first
+
+
+def test_next_available_matches_day_view():
+    client = TestClient(app)
+    rid = next(rid for rid in DB.restaurants if DB.eligible_tables(rid, 6))
+    baku = ZoneInfo("Asia/Baku")
+    for table in DB.eligible_tables(rid, 6):
+        for hour, minute in ((18, 0), (19, 30), (21, 0)):
+            _book(client, rid, table["id"], datetime(2031, 10, 1, hour, minute, tzinfo=baku), 6)
+
+    after = datetime(2031, 10, 1, 18, 0, tzinfo=baku)
+    response = client.get(
+        f"/v1/restaurants/{rid}/next-available",
+        params={"party_size": 6, "after": after.isoformat(), "limit": 4},
+    )
+    assert response.status_code == 200, response.text
+    payload = response.json()
+
+    expected = []
+    for day in ("2031-10-01", "2031-10-02"):
+        grid = client.get(
+            f"/v1/restaurants/{rid}/availability", params={"date": day, "party_size": 6}
+        ).json()
+        expected.extend(
+            {"date": day, **slot}
+            for slot in grid["slots"]
+            if slot["count"] and datetime.fromisoformat(slot["start"]) >= after
+        )
+    assert payload["slots"] == expected[:4]
+    assert payload["searched_through"] == "2031-10-02"
+
+
+def test_availability_cache_generations_stay_bounded():
+    cache = AvailabilityCache(max_entries=8, generation_limit=16)
+    first = date(2031, 1, 1)
+    stale = cache.generation("r", first)
+    for offset in range(100):
+        cache.invalidate("r", {first + timedelta(days=offset)})
+    assert len(cache._generations) <= 16
+    # A read that started before all those writes still cannot store its result.
+    cache.put("r", first, 2, {"slots": []}, stale)
+    assert cache.get("r", first, 2) is None
+    current = cache.generation("r", first)
+    cache.put("r", first, 2, {"slots": []}, current)
+    assert cache.get("r", first, 2) == {"slots": []}
@@ -0,0 +1,85 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from app.auth import require_auth
+from app.contracts import ReservationCreate
+from app.main import app
+from app.schedule import RES_DURATION
+from app.storage import DB
+from fastapi.testclient import TestClient
+
+BAKU = ZoneInfo("Asia/Baku")
+
+
+def _book(rid: str, table_id: str, start: datetime) -> str:
+    return DB.create_reservation_sync(
+        ReservationCreate(
+            restaurant_id=rid,
+            party_size=2,
+            start=start,
+            end=start + RES_DURATION,
+            guest_name="Bulk",
+            table_id=table_id,
+        ),
+        owner_id="bulk-owner",
+    ).id
+
+
+def test_bulk_operations_need_the_admin_scope():
+    client = TestClient(app)
+    resp = client.post(
+        "/reservations/bulk/cancel",
+        json={"restaurant_id": "x", "from": "2037-01-01", "to": "2037-01-01"},
+    )
+    assert resp.status_code == 403
+
+
+def test_bulk_cancel_no_show_and_reassign(monkeypatch):
+    monkeypatch.setitem(
+        app.dependency_overrides,
+        require_auth,
+        lambda: {"sub": "admin", "scope": "reservations:admin"},
+    )
+    rid = next(rid for rid in DB.restaurants if len(DB.eligible_tables(rid, 2)) >= 3)
+    first, second, spare = (table["id"] for table in DB.eligible_tables(rid, 2)[:3])
+    closed_day = datetime(2037, 6, 1, 18, 0, tzinfo=BAKU)
+    closed = [_book(rid, table_id, closed_day) for table_id in (first, second)]
+    next_day = [_book(rid, first, closed_day + timedelta(days=1))]
+    moved = [_book(rid, spare, closed_day + timedelta(days=2, hours=hour)) for hour in (0, 2)]
+    client = TestClient(app)
+
+    resp = client.post(
+        "/reservations/bulk/cancel",
+        json={"restaurant_id": rid, "from": "2037-06-01", "to": "2037-06-01"},
+    )
+    assert resp.json() == {"affected": 2}
+    statuses = [asyncio.run(DB.get_reservation(resid))["status"] for resid in closed + next_day]
+    assert statuses == ["cancelled", "cancelled", "booked"]
+    # Claims went with the cancellation: the closed day books again.
+    rebooked = _book(rid, first, closed_day)
+
+    resp = client.post(
+        "/reservations/bulk/no-show?rows=true",
+        json={
+            "restaurant_id": rid,
+            "before": (closed_day + timedelta(days=1, hours=3)).isoformat(),
+        },
+    )
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert int(resp.headers["X-Affected-Count"]) == len(lines)
+    assert {line["status"] for line in lines} == {"no_show"}
+    assert {rebooked, next_day[0]} <= {line["id"] for line in lines}
+    assert all(line["id"] not in moved for line in lines)
+
+    taken = _book(rid, first, closed_day + timedelta(days=2))
+    reassign = {"restaurant_id": rid, "from_table_id": spare, "to_table_id": first}
+    assert client.post("/reservations/bulk/reassign-table", json=reassign).status_code == 409
+    assert asyncio.run(DB.get_reservation(moved[0]))["table_id"] == spare
+    client.delete(f"/reservations/{taken}")
+    resp = client.post("/reservations/bulk/reassign-table?rows=true", json=reassign)
+    assert sorted(json.loads(line)["id"] for line in resp.text.splitlines()) == sorted(moved)
+    assert asyncio.run(DB.reservation_overlaps(rid)) == []
+    assert asyncio.run(DB.slot_occupancy_mismatches(rid)) == []
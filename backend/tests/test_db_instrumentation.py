@@ -0,0 +1,65 @@
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+from app.db.core import engine
+from app.db.instrumentation import assert_max_queries, bind_shape, count_queries, normalize_sql
+from app.main import app
+from app.metrics import db_operations_total
+from app.settings import settings
+from app.storage import DB
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+
+def test_slow_query_log_normalises_sql_and_bind_shapes(monkeypatch, caplog):
+    sql = "SELECT * FROM t WHERE a = 'x' AND b IN (?, ?, ?) AND c::text = :c LIMIT 20"
+    assert normalize_sql(sql) == (
+        "SELECT * FROM t WHERE a = ? AND b IN (?, ...) AND c::text = ? LIMIT ?"
+    )
+    assert bind_shape(("a", "b", 3, datetime.now(UTC))) == "(str x 2, int, datetime)"
+    assert bind_shape([{"id": "a"}, {"id": "b"}], executemany=True) == "2 x {id: str}"
+
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 0.000001)
+    rid = next(iter(DB.restaurants))
+    calls = db_operations_total.labels(operation="list_reviews", status="success")._value.get()
+    with caplog.at_level("WARNING", logger="app.db.instrumentation"):
+        with count_queries() as counter:
+            asyncio.run(DB.list_reviews(rid))
+    assert counter.count == 1
+    assert any("Slow query" in message and "params=(" in message for message in caplog.messages)
+    assert (
+        db_operations_total.labels(operation="list_reviews", status="success")._value.get()
+        == calls + 1
+    )
+
+
+def test_failed_statements_leave_no_timing_state(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 60_000)
+
+    async def scenario():
+        async with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                await conn.exec_driver_sql("SELECT * FROM no_such_table")
+            await conn.rollback()
+            with count_queries() as counter:
+                assert (await conn.exec_driver_sql("SELECT 1")).scalar() == 1
+            return counter.count, dict(conn.sync_connection.info)
+
+    with caplog.at_level("WARNING", logger="app.db.instrumentation"):
+        count, info = asyncio.run(scenario())
+    assert count == 1 and "query_started" not in info
+    assert not any("Slow query" in message for message in caplog.messages)
+
+
+def test_assert_max_queries_bounds_an_endpoint():
+    rid = next(rid for rid in DB.restaurants if DB.eligible_tables(rid, 2))
+    client = TestClient(app)
+    params = {"from": "2032-02-01", "to": "2032-02-07", "party_sizes": "2,4"}
+    url = f"/v1/restaurants/{rid}/availability/range"
+    # The whole range is served from one reservations query.
+    with assert_max_queries(1):
+        assert client.get(url, params=params).status_code == 200
+    with pytest.raises(AssertionError, match="expected at most 0"):
+        with assert_max_queries(0):
+            client.get(f"/v1/restaurants/{rid}/reviews")
@@ -0,0 +1,68 @@
+import asyncio
+
+from app.db.core import TimedQueuePool, engine
+from app.metrics import db_pool_checked_out, db_pool_wait_seconds
+from app.settings import settings
+from sqlalchemy import event
+
+
+def test_pool_exports_checkouts_and_pings_idle_connections(monkeypatch):
+    pool = engine.sync_engine.pool
+    assert isinstance(pool, TimedQueuePool) and pool.pool_name == "primary"
+    assert not pool._pre_ping
+    waited = db_pool_wait_seconds.labels(pool="primary")._sum
+    checked_out = db_pool_checked_out.labels(pool="primary")._value
+    idle = {"seconds": 0.0}
+    pings: list[int] = []
+    patched = {}
+
+    class CountingCursor:
+        def __init__(self, cursor):
+            self._cursor = cursor
+
+        def execute(self, *args, **kwargs):
+            pings[-1] += 1
+            return self._cursor.execute(*args, **kwargs)
+
+        def close(self):
+            self._cursor.close()
+
+    # Around the pool's own checkout listener: age the connection being checked out by
+    # ``idle`` seconds, then count the statements that listener runs on it (its ping).
+    def before_checkout(dbapi_connection, record, _proxy):
+        if "checked_in_at" in record.info:
+            record.info["checked_in_at"] -= idle["seconds"]
+        pings.append(0)
+        connection_class = type(dbapi_connection)
+        real_cursor = connection_class.cursor
+
+        def counting_cursor(self, *args, **kwargs):
+            return CountingCursor(real_cursor(self, *args, **kwargs))
+
+        patched[connection_class] = real_cursor
+        connection_class.cursor = counting_cursor
+
+    def after_checkout(_dbapi_connection, _record, _proxy):
+        for connection_class, real_cursor in patched.items():
+            connection_class.cursor = real_cursor
+        patched.clear()
+
+    async def use(seconds: float):
+        idle["seconds"] = seconds
+        async with engine.connect() as conn:
+            assert checked_out.get() == pool.checkedout() >= 1
+            return (await conn.exec_driver_sql("SELECT 1")).scalar()
+
+    monkeypatch.setattr(settings, "DB_POOL_PING_AFTER_IDLE_SECONDS", 30.0)
+    event.listen(engine.sync_engine, "checkout", before_checkout, insert=True)
+    event.listen(engine.sync_engine, "checkout", after_checkout)
+    try:
+        before = waited.get()
+        assert asyncio.run(use(0)) == 1  # recently returned (or brand new): no ping
+        assert asyncio.run(use(3600)) == 1  # idle for an hour: pinged, still usable
+    finally:
+        event.remove(engine.sync_engine, "checkout", before_checkout)
+        event.remove(engine.sync_engine, "checkout", after_checkout)
+    assert pings == [0, 1]
+    assert waited.get() > before
+    assert checked_out.get() == pool.checkedout() == 0
@@ -0,0 +1,74 @@
+from app.facets import FacetIndex
+from app.main import app
+from app.search import fold
+from fastapi.testclient import TestClient
+
+
+def _index() -> FacetIndex:
+    index = FacetIndex()
+    index.add(
+        {"cuisine": ["Seafood"], "price_level": "AZN 3/4", "tag:vibe": ["romantic"]},
+        name="Sea Breeze",
+        rating=4.6,
+        reviews_count=12,
+    )
+    index.add(
+        {"cuisine": ["Seafood", "Grill"], "price_level": "AZN 2/4", "tag:vibe": ["lively"]},
+        name="Fish Box",
+        rating=4.15,
+        reviews_count=40,
+    )
+    index.add(
+        {"cuisine": ["Azerbaijani"], "price_level": "AZN 2/4", "tag:vibe": ["romantic"]},
+        name="Çay Evi",
+        rating=3.9,
+        reviews_count=3,
+    )
+    return index
+
+
+def test_facet_counts_are_disjunctive_per_dimension():
+    index = _index()
+    filters = {"cuisine": ["seafood"], "tag:vibe": ["romantic"]}
+    selection, contexts = index.select(filters)
+    assert index.members(selection) == [0]
+    counts = index.counts(contexts, filters)
+    # Cuisine counts ignore the cuisine filter but honour the vibe filter, and vice versa.
+    assert counts["cuisine"] == [("Azerbaijani", 1), ("Seafood", 1)]
+    assert counts["tag:vibe"] == [("lively", 1), ("romantic", 1)]
+    assert counts["price_level"] == [("AZN 3/4", 1)]
+
+    selection, _ = index.select({"price_level": ["AZN 2/4"]}, min_rating=4.15)
+    assert index.members(selection) == [1]
+
+
+def test_rating_updates_move_buckets_and_resort():
+    index = _index()
+    assert index.page(index.everything, "rating") == ([0, 1, 2], 3)
+    assert index.page(index.everything, "reviews_count", limit=1) == ([1], 3)
+    assert index.page(index.everything, "name")[0] == [2, 1, 0]
+
+    index.set_rating(2, 4.8, 4)
+    assert index.members(index.select({}, min_rating=4.7)[0]) == [2]
+    assert index.page(index.everything, "rating", limit=2, offset=1) == ([0, 1], 3)
+
+
+def test_restaurant_search_endpoint_filters_sorts_and_counts():
+    client = TestClient(app)
+    resp = client.get(
+        "/restaurants/search",
+        params={"cuisine": "seafood", "sort": "name", "limit": 5},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] > len(body["items"]) == 5
+    assert all("seafood" in item["cuisine"] for item in body["items"])
+    names = [fold(item["name"]) for item in body["items"]]
+    assert names == sorted(names)
+    cuisines = {facet["value"]: facet["count"] for facet in body["facets"]["cuisine"]}
+    assert cuisines["seafood"] == body["total"]
+    assert cuisines["azerbaijani"] > 0  # other cuisines stay countable
+
+    listing = client.get("/restaurants", params={"cuisine": "seafood", "tag": "vibe:romantic"})
+    assert int(listing.headers["X-Total-Count"]) == len(listing.json()) <= body["total"]
+    assert client.get("/restaurants", params={"tag": "romantic"}).status_code == 422
@@ -0,0 +1,57 @@
+import asyncio
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from app.contracts import ReservationCreate
+from app.live import availability_hub, slot_delta
+from app.schedule import RES_DURATION
+from app.storage import DB
+
+
+def test_slot_delta_only_reports_changed_slots():
+    before = {"slots": [{"start": "a", "count": 1}, {"start": "b", "count": 2}]}
+    after = {"slots": [{"start": "a", "count": 1}, {"start": "b", "count": 1}]}
+    assert slot_delta(before, after) == [{"start": "b", "count": 1}]
+    assert slot_delta(after, after) == []
+
+
+def test_hub_pushes_deltas_for_reservation_writes():
+    rid = next(rid for rid in DB.restaurants if DB.eligible_tables(rid, 2))
+    table_id = DB.eligible_tables(rid, 2)[0]["id"]
+    day = date(2031, 9, 4)
+    local = datetime(2031, 9, 4, 19, 0, tzinfo=ZoneInfo("Asia/Baku"))
+
+    async def scenario():
+        restaurant = DB.get_restaurant(rid)
+        first, snapshot = await availability_hub.subscribe(restaurant, 2, day, DB)
+        second, _ = await availability_hub.subscribe(restaurant, 2, day, DB)
+        assert availability_hub.stats() == {"channels": 1, "subscribers": 2}
+        assert any(table_id in s["available_table_ids"] for s in snapshot["slots"])
+
+        created = await DB.create_reservation(
+            ReservationCreate(
+                restaurant_id=rid,
+                party_size=2,
+                start=local,
+                end=local + RES_DURATION,
+                guest_name="Live",
+                table_id=table_id,
+            )
+        )
+        event, delta = await asyncio.wait_for(first.queue.get(), timeout=5)
+        assert event == "delta" and delta["date"] == "2031-09-04"
+        # Only the slots overlapping the new 90-minute booking change.
+        assert len(delta["slots"]) == 5
+        assert all(table_id not in s["available_table_ids"] for s in delta["slots"])
+        assert (await asyncio.wait_for(second.queue.get(), timeout=5))[1] == delta
+
+        await DB.set_status(created.id, "cancelled")
+        _, restored = await asyncio.wait_for(first.queue.get(), timeout=5)
+        assert [s["start"] for s in restored["slots"]] == [s["start"] for s in delta["slots"]]
+        assert all(table_id in s["available_table_ids"] for s in restored["slots"])
+
+        availability_hub.unsubscribe(first)
+        availability_hub.unsubscribe(second)
+        assert availability_hub.stats() == {"channels": 0, "subscribers": 0}
+
+    asyncio.run(scenario())
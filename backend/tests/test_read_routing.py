@@ -0,0 +1,54 @@
+import asyncio
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from app.contracts import ReservationCreate
+from app.db import core
+from app.schedule import RES_DURATION
+from app.settings import settings
+from app.storage import DB
+
+
+def test_reads_round_robin_over_replicas_until_a_write_pins_them(monkeypatch):
+    used = []
+
+    def replica(name):
+        # Stand-in replicas share the primary's database and record which one served a read.
+        def factory():
+            used.append(name)
+            return core.SessionLocal()
+
+        return factory
+
+    monkeypatch.setattr(core, "read_session_factories", [replica("a"), replica("b")])
+    monkeypatch.setattr(core, "_pinned_until", {})
+    monkeypatch.setattr(settings, "DATABASE_READ_PIN_SECONDS", 60.0)
+    rid = next(rid for rid in DB.restaurants if DB.eligible_tables(rid, 2))
+    day = date(2036, 5, 9)
+
+    for _ in range(4):
+        asyncio.run(DB.reservations_for_day(rid, day, "Asia/Baku"))
+    assert sorted(used) == ["a", "a", "b", "b"] and used[0] != used[1]
+
+    start = datetime(2036, 5, 9, 19, 0, tzinfo=ZoneInfo("Asia/Baku"))
+    booked = DB.create_reservation_sync(
+        ReservationCreate(
+            restaurant_id=rid,
+            party_size=2,
+            start=start,
+            end=start + RES_DURATION,
+            guest_name="Replica",
+        ),
+        owner_id="replica-owner",
+    )
+    used.clear()
+    rows = asyncio.run(DB.reservations_for_day(rid, day, "Asia/Baku"))
+    mine = asyncio.run(DB.list_reservations("replica-owner"))
+    assert booked.id in {row["id"] for row in rows} and [r["id"] for r in mine] == [booked.id]
+    assert used == []
+
+    # Other restaurants and owners keep reading from the replicas.
+    other = next(other for other in DB.restaurants if other != rid)
+    asyncio.run(DB.list_reviews(other))
+    asyncio.run(DB.list_reservations("someone-else"))
+    assert len(used) == 2
@@ -0,0 +1,98 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from app.contracts import ReservationCreate
+from app.main import app
+from app.schedule import RES_DURATION
+from app.storage import DB
+from fastapi.testclient import TestClient
+
+OWNER = "local-dev-user"  # the AUTH0_BYPASS subject
+
+
+def test_reservations_page_by_start_with_filters():
+    rid = next(rid for rid in DB.restaurants if len(DB.eligible_tables(rid, 2)) >= 3)
+    tables = [table["id"] for table in DB.eligible_tables(rid, 2)[:3]]
+    first = datetime(2032, 3, 9, 18, 0, tzinfo=ZoneInfo("Asia/Baku"))
+
+    async def seed():
+        created = []
+        for day in range(3):
+            for table_id in tables:
+                start = first + timedelta(days=day)
+                created.append(
+                    await DB.create_reservation(
+                        ReservationCreate(
+                            restaurant_id=rid,
+                            party_size=2,
+                            start=start,
+                            end=start + RES_DURATION,
+                            guest_name=f"Keyset {day}",
+                            table_id=table_id,
+                        ),
+                        owner_id=OWNER,
+                    )
+                )
+        await DB.set_status(created[0].id, "cancelled")
+        return created
+
+    created = asyncio.run(seed())
+    expected = sorted((r.start, r.id) for r in created)
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = asyncio.run(
+            DB.list_reservations_page(
+                OWNER,
+                restaurant_id=rid,
+                day_from=date(2032, 3, 9),
+                day_to=date(2032, 3, 11),
+                cursor=cursor,
+                limit=4,
+            )
+        )
+        assert len(page) <= 4
+        seen.extend(item["id"] for item in page)
+        if cursor is None:
+            break
+    assert seen == [resid for _, resid in expected]
+
+    middle_day = asyncio.run(
+        DB.list_reservations(
+            OWNER,
+            restaurant_id=rid,
+            statuses=["booked"],
+            day_from=date(2032, 3, 10),
+            day_to=date(2032, 3, 10),
+        )
+    )
+    assert [item["id"] for item in middle_day] == [resid for _, resid in expected[3:6]]
+
+    client = TestClient(app)
+    resp = client.get(
+        "/reservations",
+        params={"restaurant_id": rid, "from": "2032-03-09", "to": "2032-03-09", "limit": 2},
+    )
+    assert resp.status_code == 200
+    assert len(resp.json()) == 2
+    rest = client.get(
+        "/reservations",
+        params={
+            "restaurant_id": rid,
+            "from": "2032-03-09",
+            "to": "2032-03-09",
+            "limit": 2,
+            "cursor": resp.headers["X-Next-Cursor"],
+        },
+    )
+    assert [item["id"] for item in resp.json() + rest.json()] == [
+        resid for _, resid in expected[:3]
+    ]
+    assert "X-Next-Cursor" not in rest.headers
+    cancelled = client.get(
+        "/reservations",
+        params={"restaurant_id": rid, "status": "cancelled", "from": "2032-03-01"},
+    )
+    assert [item["id"] for item in cancelled.json()] == [created[0].id]
+    assert client.get("/reservations", params={"cursor": "not-a-cursor"}).status_code == 422
@@ -0,0 +1,44 @@
+import asyncio
+import copy
+
+from app.db.core import get_session
+from app.db.models import RestaurantRecord
+from app.metrics import restaurant_sync_rows_total
+from app.storage import DB
+from sqlalchemy import select
+
+
+def _rows(outcome: str) -> float:
+    return restaurant_sync_rows_total.labels(outcome=outcome)._value.get()
+
+
+def test_restaurant_sync_skips_unchanged_rows():
+    before = {outcome: _rows(outcome) for outcome in ("inserted", "updated", "unchanged")}
+
+    async def scenario():
+        # The seed payloads exactly as the startup sync stored them.
+        async with get_session() as session:
+            stored = (await session.execute(select(RestaurantRecord.payload))).scalars().all()
+        entries = [copy.deepcopy(payload) for payload in stored]
+        changed = entries[0]
+        original_city = changed["city"]
+
+        synced = await DB._sync_restaurants_to_db(entries)
+        assert [r["id"] for r in synced] == [r["id"] for r in entries]
+        assert _rows("updated") == before["updated"]
+        assert _rows("unchanged") == before["unchanged"] + len(entries)
+
+        changed["city"] = "Ganja"
+        await DB._sync_restaurants_to_db(entries)
+        assert _rows("updated") == before["updated"] + 1
+        async with get_session() as session:
+            record = await session.get(RestaurantRecord, changed["id"])
+            assert record.city == "Ganja"
+            assert record.payload["city"] == "Ganja"
+            hashes = (await session.execute(select(RestaurantRecord.content_hash))).scalars()
+            assert all(hashes)
+
+        changed["city"] = original_city
+        await DB._sync_restaurants_to_db(entries)
+
+    asyncio.run(scenario())
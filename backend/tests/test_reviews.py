@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from app.contracts import ReservationCreate
+from app.db.core import engine
+from app.db.instrumentation import count_queries
+from app.main import app
+from app.schedule import RES_DURATION
+from app.storage import DB
+from fastapi.testclient import TestClient
+
+
+def test_review_aggregates_update_incrementally():
+    rid = next(rid for rid in DB.restaurants if DB.eligible_tables(rid, 2))
+    before = dict(DB.get_restaurant(rid).get("rating_histogram") or {})
+    base_count = DB.get_restaurant(rid).get("reviews_count", 0)
+
+    async def review(hour: int, rating: int) -> None:
+        local = datetime(2031, 12, 2, hour, 0, tzinfo=ZoneInfo("Asia/Baku"))
+        created = await DB.create_reservation(
+            ReservationCreate(
+                restaurant_id=rid,
+                party_size=2,
+                start=local,
+                end=local + RES_DURATION,
+                guest_name="Reviewer",
+            )
+        )
+        await DB.set_status(created.id, "arrived")
+        await DB.create_review(created.id, None, rating, "fine")
+
+    async def scenario():
+        await review(12, 5)
+        await review(15, 2)
+        incremental = await DB._load_review_stats()
+        # A full recompute from `reviews` agrees with the running totals.
+        rebuilt = await DB._refresh_review_stats_for_restaurant(rid)
+        return incremental[rid], rebuilt
+
+    incremental, rebuilt = asyncio.run(scenario())
+    assert incremental == rebuilt
+    record = DB.get_restaurant(rid)
+    assert record["reviews_count"] == base_count + 2
+    assert record["rating_histogram"]["5"] == before.get("5", 0) + 1
+    assert record["rating_histogram"]["2"] == before.get("2", 0) + 1
+    assert DB.get_restaurant_summary(rid)["reviews_count"] == base_count + 2
+
+    detail = TestClient(app).get(f"/restaurants/{rid}").json()
+    assert detail["rating_histogram"] == record["rating_histogram"]
+    assert detail["rating"] == record["rating"]
+
+
+def test_restaurants_without_reviews_keep_their_seeded_rating(monkeypatch):
+    rid = next(rid for rid in DB.restaurants if not asyncio.run(DB.list_reviews(rid)))
+    monkeypatch.setitem(DB.restaurants[rid], "rating", 4.4)
+    monkeypatch.setitem(DB.restaurants[rid], "reviews_count", 12)
+    monkeypatch.setitem(DB._summaries_by_id[rid], "rating", 4.4)
+    monkeypatch.setitem(DB._summaries_by_id[rid], "reviews_count", 12)
+
+    stats = asyncio.run(DB._load_review_stats())
+    assert rid not in stats
+    DB._apply_review_stats(stats)
+    assert DB.get_restaurant(rid)["rating"] == 4.4
+    assert DB.get_restaurant(rid)["reviews_count"] == 12
+    assert DB.get_restaurant_summary(rid)["rating"] == 4.4
+    detail = TestClient(app).get(f"/restaurants/{rid}").json()
+    assert detail["rating_histogram"] == {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0}
+
+
+def test_review_aggregates_without_update_returning(monkeypatch):
+    monkeypatch.setattr(engine.dialect, "update_returning", False)
+    rid = next(rid for rid in DB.restaurants if DB.eligible_tables(rid, 2))
+    local = datetime(2031, 12, 9, 13, 0, tzinfo=ZoneInfo("Asia/Baku"))
+
+    async def scenario():
+        created = await DB.create_reservation(
+            ReservationCreate(
+                restaurant_id=rid,
+                party_size=2,
+                start=local,
+                end=local + RES_DURATION,
+                guest_name="Reviewer",
+            )
+        )
+        await DB.set_status(created.id, "arrived")
+        with count_queries() as counter:
+            await DB.create_review(created.id, None, 4)
+        updates = [sql for sql in counter.statements if sql.startswith("UPDATE restaurants")]
+        assert updates and not any("RETURNING" in sql for sql in updates)
+        return (await DB._load_review_stats())[rid]
+
+    stats = asyncio.run(scenario())
+    assert DB.get_restaurant(rid)["reviews_count"] == stats["count"]
+    assert DB.get_restaurant(rid)["rating_histogram"] == stats["histogram"]
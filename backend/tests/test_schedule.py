@@ -0,0 +1,48 @@
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from app.schedule import compile_schedule
+from app.storage import DB
+
+BAKU = ZoneInfo("Asia/Baku")
+
+
+def test_compiled_schedule_handles_overnight_and_weekday_hours():
+    schedule = compile_schedule({
+        "id": "r",
+        "timezone": "Asia/Baku",
+        "hours": {
+            "open": "18:00",
+            "close": "02:00",
+            "mon": {"open": "12:00", "close": "15:00"},
+        },
+    })
+    # 2031-06-02 is a Monday, 2031-06-03 a Tuesday.
+    assert schedule.service_window(date(2031, 6, 3)) == (
+        datetime(2031, 6, 3, 18, 0, tzinfo=BAKU),
+        datetime(2031, 6, 4, 2, 0, tzinfo=BAKU),
+    )
+    assert schedule.slot_count(date(2031, 6, 3)) == 14
+    assert schedule.slot_count(date(2031, 6, 2)) == 4
+
+    assert schedule.is_open_at(datetime(2031, 6, 4, 1, 30, tzinfo=BAKU))
+    assert not schedule.is_open_at(datetime(2031, 6, 4, 2, 0, tzinfo=BAKU))
+    assert not schedule.is_open_at(datetime(2031, 6, 2, 16, 0, tzinfo=BAKU))
+    assert schedule.is_open_at(datetime(2031, 6, 2, 9, 0, tzinfo=ZoneInfo("UTC")))
+
+    assert schedule.next_opening_after(datetime(2031, 6, 2, 16, 0, tzinfo=BAKU)) == datetime(
+        2031, 6, 3, 18, 0, tzinfo=BAKU
+    )
+    assert schedule.next_opening_after(datetime(2031, 6, 3, 18, 0, tzinfo=BAKU)) == datetime(
+        2031, 6, 3, 18, 0, tzinfo=BAKU
+    )
+
+    assert schedule.fits_reservation(datetime(2031, 6, 4, 0, 30, tzinfo=BAKU))
+    assert not schedule.fits_reservation(datetime(2031, 6, 4, 1, 0, tzinfo=BAKU))
+
+
+def test_catalog_compiles_every_restaurant_once():
+    for rid in DB.restaurants:
+        schedule = DB.schedule_for(rid)
+        assert schedule is not None
+        assert schedule is DB.schedule_for(rid)
@@ -0,0 +1,42 @@
+from app.main import app
+from app.search import SearchIndex, fold
+from fastapi.testclient import TestClient
+
+
+def _index() -> SearchIndex:
+    index = SearchIndex()
+    index.add({"name": "Şirvanşah Muzey Restoranı", "cuisine": ["Azerbaijani"]}, boost=4.5)
+    index.add({"name": "Sea Breeze", "tags": ["seafood", "sea_view"]}, boost=4.9)
+    index.add({"name": "Fish Box", "cuisine": ["Seafood"]}, boost=4.1)
+    index.add({"name": "Çay Evi", "address": "Şirvanşah küçəsi 3"}, boost=3.0)
+    return index
+
+
+def test_fold_handles_azerbaijani_letters():
+    assert fold("Şirvanşah Ləzzət Çay Ğ İı Öö Üü") == "sirvansah lezzet cay g ii oo uu"
+
+
+def test_search_ranks_folds_and_tolerates_typos():
+    index = _index()
+    # Name hit outranks the address hit; diacritics fold either way.
+    assert index.search("sirvansah") == ([0, 3], 2)
+    assert index.search("Şirvanşah")[0] == [0, 3]
+    # Cuisine outweighs a tag; rating only breaks ties.
+    assert index.search("seafood")[0] == [2, 1]
+    assert index.search("sefood")[0] == [2, 1]
+    # The last token matches as a prefix while typing.
+    assert index.search("cay ev")[0] == [3]
+    assert index.search("sea brz") == ([], 0)
+    assert index.search("seafood", limit=1, offset=1) == ([1], 2)
+
+
+def test_restaurant_listing_paginates_search_results():
+    client = TestClient(app)
+    resp = client.get("/restaurants", params={"q": "yanardağ"})
+    assert resp.status_code == 200
+    assert [item["slug"] for item in resp.json()][:1] == ["yanardag-restaurant"]
+
+    full = client.get("/restaurants", params={"q": "seafood"})
+    page = client.get("/restaurants", params={"q": "seafood", "limit": 2, "offset": 1})
+    assert page.headers["X-Total-Count"] == full.headers["X-Total-Count"]
+    assert [r["id"] for r in page.json()] == [r["id"] for r in full.json()][1:3]
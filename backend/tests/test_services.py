@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+from app import storage
+from app.main import app
+from app.services import LazyService, ServiceContainer, services
+from fastapi.testclient import TestClient
+
+
+def test_lazy_service_builds_once_on_first_use():
+    calls = []
+
+    class Service:
+        value = 1
+
+    def factory():
+        calls.append(1)
+        return Service()
+
+    handle = LazyService("demo", factory)
+    assert not handle.built and calls == []
+    assert handle.value == 1
+    assert handle.get() is handle.get()
+    assert handle.built and calls == [1]
+
+
+def test_container_gates_readiness_on_required_phases():
+    container = ServiceContainer()
+    assert container.ready  # lazy mode: nothing started, services build on demand
+
+    @container.phase("optional", required=False)
+    async def optional():
+        raise RuntimeError("not configured")
+
+    @container.phase("core")
+    async def core():
+        assert container.state == "starting" and not container.ready
+
+    async def boot():
+        await container.startup()
+        # Required phases are done; the optional one is still warming in the background.
+        assert container.state == "warming" and not container.ready
+        await container.wait_ready()
+
+    asyncio.run(boot())
+    report = container.report()
+    assert container.ready and report["state"] == "ready"
+    assert [(p["name"], p["status"]) for p in report["phases"]] == [
+        ("optional", "failed"),
+        ("core", "ok"),
+    ]
+
+    broken = ServiceContainer()
+
+    @broken.phase("core")
+    async def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(broken.startup())
+    assert broken.state == "failed" and not broken.ready
+
+
+def test_lifespan_reports_startup_phases_on_health(monkeypatch):
+    warmed = asyncio.Event()
+    original = services._warm
+
+    async def held_warmup(total):
+        await warmed.wait()
+        await original(total)
+
+    monkeypatch.setattr(services, "_warm", held_warmup)
+    with TestClient(app) as client:
+        warming = client.get("/health")
+        assert warming.status_code == 503
+        assert warming.json()["status"] == "warming"
+        client.portal.call(warmed.set)
+        client.portal.call(services.wait_ready)
+        resp = client.get("/health")
+    assert resp.status_code == 200
+    startup = resp.json()["startup"]
+    assert startup["state"] == "ready"
+    assert [p["name"] for p in startup["phases"]] == ["catalog", "concierge"]
+
+
+def test_lazy_database_waits_for_background_startup(monkeypatch):
+    order = []
+    real_startup = storage.Database.startup
+
+    async def slow_startup(self):
+        await asyncio.sleep(0.05)
+        await real_startup(self)
+        order.append("startup")
+
+    real_session = storage.get_read_session
+
+    def recording_session(*keys):
+        order.append("query")
+        return real_session(*keys)
+
+    monkeypatch.setattr(storage.Database, "startup", slow_startup)
+    monkeypatch.setattr(storage, "get_read_session", recording_session)
+
+    async def first_use():
+        database = storage._build_database()
+        assert database._startup_task is not None
+        await database.list_reviews(next(iter(database.restaurants)))
+        return database
+
+    database = asyncio.run(first_use())
+    assert order == ["startup", "query"] and database._startup_task is None
@@ -0,0 +1,99 @@
+import asyncio
+import importlib.util
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+from app.contracts import ReservationCreate
+from app.db.core import get_session
+from app.db.models import SlotClaimRecord
+from app.main import app
+from app.schedule import RES_DURATION
+from app.storage import CLAIM_BUCKET, DB, BookingConflict
+from pydantic import ValidationError
+from sqlalchemy import func, select
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+_spec = importlib.util.spec_from_file_location(
+    "stress_race", BACKEND_ROOT / "tools" / "stress_race.py"
+)
+stress_race = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(stress_race)
+
+
+def test_concurrent_bookings_never_overlap():
+    report = asyncio.run(stress_race.race(app, DB, requests=400, concurrency=100, seed=3))
+    assert report["overlaps"] == []
+    assert set(report["status_codes"]) <= {201, 409}
+    assert report["status_codes"][201] > 0
+
+
+def test_claims_follow_status_changes():
+    rid = next(rid for rid in DB.restaurants if DB.eligible_tables(rid, 2))
+    table_id = DB.eligible_tables(rid, 2)[0]["id"]
+    start = datetime(2034, 2, 2, 19, 0, tzinfo=ZoneInfo("Asia/Baku"))
+    payload = ReservationCreate(
+        restaurant_id=rid,
+        party_size=2,
+        start=start,
+        end=start + RES_DURATION,
+        guest_name="Claims",
+        table_id=table_id,
+    )
+
+    async def scenario():
+        first = await DB.create_reservation(payload)
+        await DB.set_status(first.id, "cancelled")
+        second = await DB.create_reservation(payload)  # the cancellation released the slot
+        with pytest.raises(BookingConflict):
+            await DB.set_status(first.id, "booked")
+        await DB.cancel_reservation(second.id)
+        await DB.set_status(first.id, "booked")
+        assert await DB.reservation_overlaps(rid) == []
+
+    asyncio.run(scenario())
+
+
+def test_back_to_back_bookings_off_the_quarter_hour():
+    rid = next(rid for rid in DB.restaurants if DB.eligible_tables(rid, 2))
+    table_id = DB.eligible_tables(rid, 2)[0]["id"]
+    first = datetime(2034, 3, 3, 14, 10, tzinfo=ZoneInfo("UTC"))
+
+    def payload(start):
+        return ReservationCreate(
+            restaurant_id=rid,
+            party_size=2,
+            start=start,
+            end=start + RES_DURATION,
+            guest_name="Adjacent",
+            table_id=table_id,
+        )
+
+    async def book(start):
+        try:
+            return await DB.create_reservation(payload(start))
+        except BookingConflict:
+            return None
+
+    async def scenario():
+        booked = await DB.create_reservation(payload(first))
+        await DB.create_reservation(payload(first + RES_DURATION))  # 15:40-17:10, no overlap
+        with pytest.raises(BookingConflict):
+            await DB.create_reservation(payload(first - RES_DURATION + timedelta(minutes=1)))
+        # Racing bookings that overlap only inside a shared 15-minute bucket: one wins.
+        later = first + 3 * RES_DURATION
+        results = await asyncio.gather(
+            *(book(later + timedelta(minutes=minutes)) for minutes in (0, 7, 13, 89))
+        )
+        assert sum(result is not None for result in results) == 1
+        assert await DB.reservation_overlaps(rid) == []
+        async with get_session() as session:
+            claims = await session.scalar(
+                select(func.count()).where(SlotClaimRecord.reservation_id == booked.id)
+            )
+        assert claims <= RES_DURATION / CLAIM_BUCKET + 1
+
+    asyncio.run(scenario())
+    with pytest.raises(ValidationError):
+        payload(first + timedelta(seconds=30))
@@ -0,0 +1,122 @@
+import asyncio
+from datetime import UTC, date, datetime
+from zoneinfo import ZoneInfo
+
+from app.availability import availability_for_day
+from app.contracts import ReservationCreate
+from app.db.core import get_session
+from app.db.models import ReservationRecord, SlotOccupancyRecord
+from app.schedule import RES_DURATION
+from app.settings import settings
+from app.storage import DB
+from sqlalchemy import update
+
+
+def test_slot_occupancy_tracks_writes_and_repairs(monkeypatch):
+    rid = next(rid for rid in DB.restaurants if DB.eligible_tables(rid, 2))
+    table_id = DB.eligible_tables(rid, 2)[0]["id"]
+    day = date(2031, 11, 5)
+    local = datetime(2031, 11, 5, 20, 0, tzinfo=ZoneInfo("Asia/Baku"))
+
+    async def scenario():
+        restaurant = DB.get_restaurant(rid)
+        created = await DB.create_reservation(
+            ReservationCreate(
+                restaurant_id=rid,
+                party_size=2,
+                start=local,
+                end=local + RES_DURATION,
+                guest_name="Occupancy",
+                table_id=table_id,
+            )
+        )
+        rows = await DB.materialized_slots(rid, day)
+        assert rows is not None
+        taken = [start for start, ids in rows if table_id not in ids]
+        assert [start.astimezone(local.tzinfo).strftime("%H:%M") for start in taken] == [
+            "19:00",
+            "19:30",
+            "20:00",
+            "20:30",
+            "21:00",
+        ]
+        assert await DB.slot_occupancy_mismatches(rid) == []
+
+        materialized = await availability_for_day(restaurant, 2, day, DB)
+        monkeypatch.setattr(settings, "SLOT_OCCUPANCY_ENABLED", False)
+        computed = await availability_for_day(restaurant, 2, day, DB)
+        monkeypatch.setattr(settings, "SLOT_OCCUPANCY_ENABLED", True)
+        assert materialized == computed
+
+        await DB.set_status(created.id, "cancelled")
+        rows = await DB.materialized_slots(rid, day)
+        assert all(table_id in ids for _, ids in rows)
+        assert await DB.slot_occupancy_mismatches(rid) == []
+
+        async with get_session() as session:
+            await session.execute(
+                update(SlotOccupancyRecord)
+                .where(SlotOccupancyRecord.restaurant_id == rid)
+                .where(SlotOccupancyRecord.local_date == day)
+                .values(free_table_count=0, free_table_ids=[])
+            )
+            await session.commit()
+        mismatches = await DB.slot_occupancy_mismatches(rid)
+        assert {(m["date"], m["reason"]) for m in mismatches} == {("2031-11-05", "stale")}
+
+        assert await DB.rebuild_slot_occupancy(rid) > 0
+        assert await DB.slot_occupancy_mismatches(rid) == []
+
+    asyncio.run(scenario())
+
+
+def test_writes_rematerialise_only_the_slots_they_cover():
+    rid = next(rid for rid in DB.restaurants if DB.eligible_tables(rid, 2))
+    day = date(2031, 11, 12)
+    local = datetime(2031, 11, 12, 20, 0, tzinfo=ZoneInfo("Asia/Baku"))
+    slot_count = DB.schedule_for(rid).slot_count(day)
+
+    async def scenario():
+        async with get_session() as session:
+            whole = await DB._materialize_occupancy(session, rid, {day})
+            covered = await DB._materialize_occupancy(
+                session, rid, {day}, [(local, local + RES_DURATION)]
+            )
+            await session.commit()
+        return whole, covered
+
+    whole, covered = asyncio.run(scenario())
+    assert whole == slot_count and covered == 5  # 19:00 through 21:00
+
+
+def test_untabled_blocks_of_unknown_size_are_computed_per_party(monkeypatch):
+    rid = next(rid for rid in DB.restaurants if DB.eligible_tables(rid, 6))
+    day = date(2031, 11, 19)
+    local = datetime(2031, 11, 19, 20, 0, tzinfo=ZoneInfo("Asia/Baku"))
+
+    async def scenario():
+        async with get_session() as session:
+            session.add(
+                ReservationRecord(
+                    id="legacy-untabled",
+                    restaurant_id=rid,
+                    table_id=None,
+                    party_size=0,
+                    start=local.astimezone(UTC),
+                    end=(local + RES_DURATION).astimezone(UTC),
+                    guest_name="Legacy",
+                    status="booked",
+                )
+            )
+            await session.commit()
+        await DB.rebuild_slot_occupancy(rid)
+        assert await DB.materialized_slots(rid, day) is None
+        assert await DB.slot_occupancy_mismatches(rid) == []
+        restaurant = DB.get_restaurant(rid)
+        stored = [await availability_for_day(restaurant, size, day, DB) for size in (2, 6)]
+        monkeypatch.setattr(settings, "SLOT_OCCUPANCY_ENABLED", False)
+        computed = [await availability_for_day(restaurant, size, day, DB) for size in (2, 6)]
+        return stored, computed
+
+    stored, computed = asyncio.run(scenario())
+    assert stored == computed
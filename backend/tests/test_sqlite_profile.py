@@ -0,0 +1,21 @@
+import asyncio
+
+from app.db.core import engine, sqlite_maintenance, sqlite_pragmas
+from app.settings import settings
+
+
+def test_production_profile_configures_every_sqlite_connection():
+    assert sqlite_pragmas("default") == []
+
+    async def pragma(name):
+        async with engine.connect() as conn:
+            return (await conn.exec_driver_sql(f"PRAGMA {name}")).scalar()
+
+    assert settings.SQLITE_PROFILE == "production"
+    assert asyncio.run(pragma("journal_mode")).lower() == "wal"
+    assert asyncio.run(pragma("synchronous")) == 1  # NORMAL
+    assert asyncio.run(pragma("busy_timeout")) == settings.SQLITE_BUSY_TIMEOUT_MS
+    assert asyncio.run(pragma("foreign_keys")) == 1
+    assert asyncio.run(pragma("cache_size")) == -settings.SQLITE_CACHE_SIZE_MB * 1024
+    assert engine.pool.size() == settings.SQLITE_POOL_SIZE
+    assert asyncio.run(sqlite_maintenance()) is True
@@ -0,0 +1,59 @@
+import asyncio
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from app.contracts import ReservationCreate
+from app.main import app
+from app.schedule import RES_DURATION
+from app.storage import DB
+from fastapi.testclient import TestClient
+
+OWNER = "local-dev-user"  # the AUTH0_BYPASS subject
+
+
+def _book(rid: str, table_id: str, owner_id: str) -> str:
+    start = datetime(2036, 7, 3, 18, 0, tzinfo=ZoneInfo("Asia/Baku"))
+    created = DB.create_reservation_sync(
+        ReservationCreate(
+            restaurant_id=rid,
+            party_size=2,
+            start=start,
+            end=start + RES_DURATION,
+            guest_name="Transitions",
+            table_id=table_id,
+        ),
+        owner_id=owner_id,
+    )
+    return created.id
+
+
+def test_transitions_follow_the_table_and_the_owner():
+    rid = next(rid for rid in DB.restaurants if len(DB.eligible_tables(rid, 2)) >= 3)
+    tables = [table["id"] for table in DB.eligible_tables(rid, 2)[:3]]
+    mine = _book(rid, tables[0], OWNER)
+    theirs = _book(rid, tables[1], "someone-else")
+    doomed = _book(rid, tables[2], OWNER)
+    client = TestClient(app)
+
+    arrived = client.post(f"/reservations/{mine}/arrive")
+    assert arrived.status_code == 200
+    assert arrived.json()["status"] == "arrived"
+    assert set(arrived.json()) >= {"id", "restaurant_id", "table_id", "start", "end"}
+    assert client.post(f"/reservations/{mine}/arrive").status_code == 200  # repeatable
+    refused = client.post(f"/reservations/{mine}/cancel")
+    assert refused.status_code == 409
+    assert asyncio.run(DB.get_reservation(mine))["status"] == "arrived"
+
+    assert client.post(f"/reservations/{theirs}/cancel").status_code == 404
+    assert client.delete(f"/reservations/{theirs}").status_code == 404
+    assert asyncio.run(DB.get_reservation(theirs))["status"] == "booked"
+
+    cancelled = client.post(f"/reservations/{doomed}/cancel")
+    assert cancelled.json()["status"] == "cancelled"
+    assert client.post(f"/reservations/{doomed}/confirm").status_code == 409
+    # The cancellation released the table: the same slot books again.
+    rebooked = _book(rid, tables[2], OWNER)
+    assert client.delete(f"/reservations/{rebooked}").json()["id"] == rebooked
+    assert asyncio.run(DB.get_reservation(rebooked)) is None
+    assert client.post(f"/reservations/{rebooked}/no-show").status_code == 404
+    assert asyncio.run(DB.reservation_overlaps(rid)) == []
@@ -0,0 +1,109 @@
+from datetime import UTC, datetime, timedelta
+
+from app.main import app
+from app.schedule import RES_DURATION
+from app.storage import DB
+from app.table_assignment import choose_tables, combinable_groups, split_table_ids, table_specs
+from fastapi.testclient import TestClient
+
+AREAS = [
+    {
+        "id": "main",
+        "tables": [
+            {"id": "a", "capacity": 2, "position": [10, 10]},
+            {"id": "b", "capacity": 2, "position": [30, 10]},
+            {"id": "c", "capacity": 4, "position": [50, 10]},
+            {"id": "d", "capacity": 4, "position": [70, 10]},
+        ],
+    },
+    {"id": "terrace", "tables": [{"id": "e", "capacity": 4, "position": [10, 10]}]},
+]
+
+
+def _at(hour, minute=0):
+    return datetime(2031, 8, 1, hour, minute, tzinfo=UTC)
+
+
+def test_best_fit_prefers_snug_placement_and_combines_adjacent_tables():
+    specs = table_specs(AREAS)
+    groups = combinable_groups(specs)
+    assert {tuple(s.id for s in g) for g in groups if len(g) == 2} == {
+        ("a", "b"),
+        ("b", "c"),
+        ("c", "d"),
+    }
+    window = (_at(8), _at(23))
+    start = _at(19)
+    # "a" is booked until 19:00, so a party of two abutting that booking leaves no gap there.
+    blocks = [("a", _at(17, 30), _at(19), 2), ("b", _at(16), _at(17), 2)]
+    assert choose_tables(specs, groups, 2, start, start + RES_DURATION, blocks, window) == "a"
+
+    # Nothing seats eight on its own; adjacent tables in one area are joined instead, using
+    # the fewest tables among equally sized combinations.
+    chosen = choose_tables(specs, groups, 8, start, start + RES_DURATION, [], window)
+    assert split_table_ids(chosen) == ["c", "d"]
+    # Tables in different areas never combine, and a combined booking blocks every member.
+    blocks = [("c+d", _at(19), _at(20), 8)]
+    assert choose_tables(specs, groups, 6, start, start + RES_DURATION, blocks, window) is None
+    assert choose_tables(specs, groups, 4, start, start + RES_DURATION, blocks, window) == "e"
+
+
+def test_auto_assignment_uses_other_free_tables():
+    client = TestClient(app)
+    rid = next(rid for rid in DB.restaurants if len(DB.eligible_tables(rid, 2)) >= 3)
+    start = datetime(2031, 8, 2, 15, 0, tzinfo=UTC)
+    payload = {
+        "restaurant_id": rid,
+        "party_size": 2,
+        "start": start.isoformat(),
+        "end": (start + RES_DURATION).isoformat(),
+        "guest_name": "Best Fit",
+    }
+    assigned = []
+    for _ in range(3):
+        response = client.post("/v1/reservations", json=payload)
+        assert response.status_code == 201, response.text
+        assigned.append(response.json()["table_id"])
+    assert len(set(assigned)) == 3
+    # Smallest seats go first.
+    capacities = {str(t["id"]): t["capacity"] for t in DB.eligible_tables(rid, 1)}
+    assert capacities[assigned[0]] == min(capacities.values())
+
+    day = client.get(
+        f"/v1/restaurants/{rid}/availability",
+        params={"date": start.date().isoformat(), "party_size": 2},
+    ).json()
+    slot = next(
+        s for s in day["slots"] if datetime.fromisoformat(s["start"]) == start + timedelta(0)
+    )
+    assert not set(assigned) & set(slot["available_table_ids"])
+
+
+def test_conflict_response_lists_alternatives():
+    client = TestClient(app)
+    rid = next(rid for rid in DB.restaurants if len(DB.eligible_tables(rid, 2)) >= 2)
+    tables = [str(t["id"]) for t in DB.eligible_tables(rid, 2)]
+    start = datetime(2031, 8, 3, 15, 0, tzinfo=UTC)
+    payload = {
+        "restaurant_id": rid,
+        "party_size": 2,
+        "start": start.isoformat(),
+        "end": (start + RES_DURATION).isoformat(),
+        "guest_name": "Conflict",
+        "table_id": tables[0],
+    }
+    assert client.post("/v1/reservations", json=payload).status_code == 201
+    conflict = client.post("/v1/reservations", json=payload)
+    assert conflict.status_code == 409
+    body = conflict.json()
+    assert body["detail"] == "Selected table/time is already booked"
+    alternatives = body["alternatives"]
+    assert 0 < len(alternatives) <= 5
+    same_time = [a for a in alternatives if datetime.fromisoformat(a["start"]) == start]
+    assert same_time and all(a["table_id"] != tables[0] for a in same_time)
+    # The closest earlier and later starts on the slot grid close out the list.
+    shifted = sorted(datetime.fromisoformat(a["start"]) for a in alternatives if a not in same_time)
+    assert shifted == [start - timedelta(minutes=30), start + timedelta(minutes=30)]
+    first = alternatives[0]
+    retry = dict(payload, table_id=first["table_id"], start=first["start"], end=first["end"])
+    assert client.post("/v1/reservations", json=retry).status_code == 201
@@ -0,0 +1,64 @@
+import asyncio
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+from app.contracts import ReservationCreate
+from app.schedule import RES_DURATION
+from app.settings import settings
+from app.storage import DB, BookingConflict
+
+
+def test_batched_writes_commit_together_and_fail_individually(monkeypatch):
+    monkeypatch.setattr(settings, "RESERVATION_WRITE_BATCHING", True)
+    rid = next(rid for rid in DB.restaurants if len(DB.eligible_tables(rid, 2)) >= 2)
+    first, second = (table["id"] for table in DB.eligible_tables(rid, 2)[:2])
+    start = datetime(2035, 4, 12, 19, 0, tzinfo=ZoneInfo("Asia/Baku"))
+
+    def booking(table_id: str, shift: int = 0) -> ReservationCreate:
+        begin = start + timedelta(minutes=shift)
+        return ReservationCreate(
+            restaurant_id=rid,
+            party_size=2,
+            start=begin,
+            end=begin + RES_DURATION,
+            guest_name="Batch",
+            table_id=table_id,
+        )
+
+    batches = []
+    original = DB._writes._run_batch
+
+    async def counting(items):
+        batches.append(len(items))
+        await original(items)
+
+    monkeypatch.setattr(DB._writes, "_run_batch", counting)
+
+    async def scenario():
+        return await asyncio.gather(
+            DB.create_reservation(booking(first)),
+            DB.create_reservation(booking(first, 30)),  # overlaps the first booking
+            DB.create_reservation(booking(second)),
+            DB.set_status("missing-reservation", "cancelled"),
+            return_exceptions=True,
+        )
+
+    booked, clashed, other, missing = asyncio.run(scenario())
+    assert batches == [4]
+    assert isinstance(clashed, BookingConflict)
+    assert clashed.alternatives
+    assert {booked.table_id, other.table_id} == {first, second}
+    assert missing is None
+
+    async def follow_up():
+        cancelled = await DB.set_status(booked.id, "cancelled")
+        retry = await DB.create_reservation(booking(first, 30))
+        return cancelled, retry, await DB.reservation_overlaps(rid)
+
+    cancelled, retry, overlaps = asyncio.run(follow_up())
+    assert cancelled["status"] == "cancelled"
+    assert retry.table_id == first
+    assert overlaps == []
+    with pytest.raises(BookingConflict):
+        asyncio.run(DB.create_reservation(booking(first, 60)))
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Measure hot reservation queries with a large history, before and after archival.
+
+Seeds a throwaway SQLite database (or ``DATABASE_URL``) with ``--history`` reservations that
+ended months ago plus ``--live`` upcoming ones, times the queries every booking and
+availability request runs, moves the history to ``reservations_archive`` with
+``Database.archive_reservations`` and times the same queries again.
+
+Usage:
+  python backend/tools/bench_archive.py --history 5000000 --live 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time as clock
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+SEED_CHUNK = 20_000
+
+
+async def seed(db, history: int, live: int, rng: random.Random) -> list[str]:
+    from app.db.core import get_session
+    from app.db.models import ReservationRecord
+    from sqlalchemy import insert
+
+    rids = [rid for rid in db.restaurants if db.eligible_tables(rid, 2)]
+    tables = {rid: [table["id"] for table in db.eligible_tables(rid, 2)] for rid in rids}
+    now = datetime.now(UTC).replace(minute=0, second=0, microsecond=0)
+    owners = [f"guest-{idx}" for idx in range(max(1, (history + live) // 50))]
+
+    def row(start: datetime, status: str) -> dict:
+        rid = rng.choice(rids)
+        return {
+            "id": str(uuid4()),
+            "restaurant_id": rid,
+            "table_id": rng.choice(tables[rid]),
+            "party_size": 2,
+            "start": start,
+            "end": start + timedelta(minutes=90),
+            "guest_name": "History",
+            "guest_phone": "",
+            "status": status,
+            "owner_id": rng.choice(owners),
+            "created_at": start - timedelta(days=3),
+            "updated_at": start,
+        }
+
+    async with get_session() as session:
+        for offset in range(0, history, SEED_CHUNK):
+            rows = [
+                row(
+                    now - timedelta(days=200 + rng.randrange(1000), hours=rng.randrange(12)),
+                    rng.choice(("arrived", "arrived", "cancelled", "no_show")),
+                )
+                for _ in range(min(SEED_CHUNK, history - offset))
+            ]
+            await session.execute(insert(ReservationRecord.__table__), rows)
+        upcoming = [
+            row(now + timedelta(days=1 + rng.randrange(30), hours=rng.randrange(12)), "booked")
+            for _ in range(live)
+        ]
+        await session.execute(insert(ReservationRecord.__table__), upcoming)
+        await session.commit()
+    return rids
+
+
+async def hot_queries(db, rids: list[str], rounds: int, rng: random.Random) -> dict:
+    from app.db.core import get_session
+
+    today = datetime.now(UTC)
+    timings: dict[str, list[float]] = {
+        "conflict_window": [],
+        "blocks_for_day": [],
+        "restaurant_day_listing": [],
+        "owner_history_page": [],
+    }
+
+    async def timed(name, operation):
+        started = clock.perf_counter()
+        await operation
+        timings[name].append((clock.perf_counter() - started) * 1000)
+
+    for _ in range(rounds):
+        rid = rng.choice(rids)
+        start = today + timedelta(days=1 + rng.randrange(30))
+        async with get_session() as session:
+            await timed(
+                "conflict_window",
+                db._conflicting_reservations(
+                    session, rid, start - timedelta(hours=2), start + timedelta(hours=4)
+                ),
+            )
+        tz_name = db.restaurants[rid].get("timezone") or "Asia/Baku"
+        await timed("blocks_for_day", db.reservation_blocks_for_day(rid, start.date(), tz_name))
+        await timed(
+            "restaurant_day_listing",
+            db.list_reservations(
+                None, restaurant_id=rid, day_from=start.date(), day_to=start.date()
+            ),
+        )
+        await timed(
+            "owner_history_page",
+            db.list_reservations_page(f"guest-{rng.randrange(100)}", limit=20),
+        )
+    return {
+        name: {
+            "p50_ms": round(statistics.median(values), 3),
+            "p95_ms": round(sorted(values)[int(len(values) * 0.95) - 1], 3),
+        }
+        for name, values in timings.items()
+    }
+
+
+async def main_async(args) -> dict:
+    os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="bench-archive-"))
+    if str(BACKEND_ROOT) not in sys.path:
+        sys.path.insert(0, str(BACKEND_ROOT))
+    from app.storage import DB, Database
+
+    await DB.provide(Database()).startup()
+    rng = random.Random(args.seed)
+    started = clock.perf_counter()
+    rids = await seed(DB, args.history, args.live, rng)
+    seeded = clock.perf_counter() - started
+
+    before = await hot_queries(DB, rids, args.rounds, random.Random(args.seed))
+    started = clock.perf_counter()
+    moved = await DB.archive_reservations(before=datetime.now(UTC) - timedelta(days=180))
+    archived = clock.perf_counter() - started
+    after = await hot_queries(DB, rids, args.rounds, random.Random(args.seed))
+    return {
+        "history_rows": args.history,
+        "live_rows": args.live,
+        "seed_seconds": round(seeded, 1),
+        "archived_rows": moved,
+        "archive_seconds": round(archived, 1),
+        "before": before,
+        "after": after,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--history", type=int, default=5_000_000)
+    ap.add_argument("--live", type=int, default=5_000)
+    ap.add_argument("--rounds", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=11)
+    args = ap.parse_args()
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Compare the bitmask availability engine against the legacy overlap scan.
+
+Generates randomized service days (table counts, opening hours, bookings with and without
+table assignments), checks that both implementations return identical payloads and prints
+timings for each.
+
+Usage:
+  python backend/tools/bench_availability.py --days 200 --tables 40 --bookings 120
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time as clock
+from datetime import UTC, date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.availability import (  # noqa: E402
+    INTERVAL,
+    RES_DURATION,
+    _assign_shared_block,
+    _hours_for_day,
+    _iso_parse,
+    _normalize_timezone,
+    _overlaps,
+    _resolve_timezone,
+    availability_for_day,
+)
+
+
+async def legacy_availability_for_day(
+    restaurant: dict[str, Any], party_size: int, day: date, db
+) -> dict[str, Any]:
+    """The pre-bitmask implementation, kept verbatim for equivalence checks."""
+    rid = str(restaurant.get("id"))
+    restaurant_tz = restaurant.get("timezone") or "Asia/Baku"
+    tzinfo = _resolve_timezone(restaurant_tz)
+    open_time, close_time = _hours_for_day(restaurant, day)
+    tables = db.eligible_tables(rid, party_size)
+    todays = []
+    for r in await db.reservations_for_day(rid, day, restaurant_tz):
+        rs = _normalize_timezone(_iso_parse(str(r["start"])), tzinfo)
+        re = _normalize_timezone(_iso_parse(str(r["end"])), tzinfo)
+        todays.append({
+            "table_id": str(r.get("table_id") or ""),
+            "start": rs,
+            "end": re,
+            "party_size": int(r.get("party_size") or 0),
+        })
+    bookings_by_table: dict[str, list[tuple[datetime, datetime]]] = {}
+    for booking in todays:
+        block = (booking["start"], booking["end"])
+        tid = booking["table_id"]
+        if tid:
+            bookings_by_table.setdefault(tid, []).append(block)
+        else:
+            assigned = _assign_shared_block(
+                db, rid, tables, block, booking.get("party_size") or party_size
+            )
+            if assigned:
+                bookings_by_table.setdefault(assigned, []).append(block)
+    slots = []
+    open_dt = datetime.combine(day, open_time, tzinfo=tzinfo)
+    close_dt = datetime.combine(day, close_time, tzinfo=tzinfo)
+    if close_dt <= open_dt:
+        close_dt += timedelta(days=1)
+    cur = open_dt
+    last_start = close_dt - RES_DURATION
+    while cur <= last_start:
+        slot_end = cur + RES_DURATION
+        free_ids = []
+        for t in tables:
+            tid = str(t.get("id"))
+            taken = False
+            for rs, re in bookings_by_table.get(tid, ()):
+                if _overlaps(cur, slot_end, rs, re):
+                    taken = True
+                    break
+            if not taken:
+                free_ids.append(tid)
+        slots.append({
+            "start": cur.isoformat(timespec="seconds"),
+            "end": slot_end.isoformat(timespec="seconds"),
+            "available_table_ids": free_ids,
+            "count": len(free_ids),
+        })
+        cur += INTERVAL
+    return {"slots": slots, "restaurant_timezone": restaurant_tz}
+
+
+class SyntheticDB:
+    """Duck-typed stand-in for `storage.Database` serving one restaurant day."""
+
+    def __init__(self, tables: list[dict[str, Any]], bookings: list[dict[str, Any]]) -> None:
+        self.tables = sorted(tables, key=lambda t: t["capacity"])
+        self.bookings = bookings
+
+    def eligible_tables(self, rid: str, party_size: int) -> list[dict[str, Any]]:
+        return [t for t in self.tables if t["capacity"] >= party_size]
+
+    async def reservations_for_day(self, rid: str, day: date, tz: str) -> list[dict[str, Any]]:
+        return [
+            {
+                "table_id": b["table_id"],
+                "start": b["start"].isoformat(),
+                "end": b["end"].isoformat(),
+                "party_size": b["party_size"],
+            }
+            for b in self.bookings
+        ]
+
+    async def reservation_blocks_for_day(self, rid: str, day: date, tz: str):
+        return [(b["table_id"], b["start"], b["end"], b["party_size"]) for b in self.bookings]
+
+
+def random_day(rng: random.Random, table_count: int, booking_count: int):
+    tables = [
+        {"id": f"t{i}", "capacity": rng.choice((2, 2, 4, 4, 6, 8, 10))} for i in range(table_count)
+    ]
+    open_hour = rng.randint(7, 13)
+    close_hour = rng.choice((21, 22, 23, 0, 1, 2))
+    hours: dict[str, Any] = {"open": f"{open_hour:02d}:{rng.choice((0, 15, 30)):02d}"}
+    hours["close"] = f"{close_hour:02d}:00"
+    restaurant = {
+        "id": "bench",
+        "timezone": rng.choice(("Asia/Baku", "Europe/Istanbul", "UTC")),
+        "hours": hours,
+    }
+    day = date(2025, 1, 1) + timedelta(days=rng.randint(0, 364))
+    base = datetime.combine(day, time(6, 0), tzinfo=UTC)
+    bookings = []
+    for _ in range(booking_count):
+        start = base + timedelta(minutes=15 * rng.randint(0, 80))
+        end = start + timedelta(minutes=rng.choice((60, 90, 90, 120)))
+        table = rng.choice(tables)
+        bookings.append({
+            "table_id": None if rng.random() < 0.1 else table["id"],
+            "start": start,
+            "end": end,
+            "party_size": rng.randint(1, table["capacity"]),
+        })
+    return restaurant, day, SyntheticDB(tables, bookings)
+
+
+async def run(days: int, tables: int, bookings: int, seed: int) -> dict[str, Any]:
+    rng = random.Random(seed)
+    legacy_seconds = 0.0
+    bitmask_seconds = 0.0
+    mismatches = 0
+    for _ in range(days):
+        restaurant, day, db = random_day(rng, tables, bookings)
+        party = rng.randint(1, 8)
+        started = clock.perf_counter()
+        expected = await legacy_availability_for_day(restaurant, party, day, db)
+        legacy_seconds += clock.perf_counter() - started
+        started = clock.perf_counter()
+        actual = await availability_for_day(restaurant, party, day, db)
+        bitmask_seconds += clock.perf_counter() - started
+        if expected != actual:
+            mismatches += 1
+    return {
+        "days": days,
+        "tables": tables,
+        "bookings_per_day": bookings,
+        "mismatches": mismatches,
+        "legacy_ms_per_day": round(legacy_seconds * 1000 / days, 3),
+        "bitmask_ms_per_day": round(bitmask_seconds * 1000 / days, 3),
+        "speedup": round(legacy_seconds / bitmask_seconds, 2) if bitmask_seconds else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=200)
+    parser.add_argument("--tables", type=int, default=40)
+    parser.add_argument("--bookings", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    report = asyncio.run(run(args.days, args.tables, args.bookings, args.seed))
+    print(json.dumps(report, indent=2))
+    if report["mismatches"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
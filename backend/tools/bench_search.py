@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""Compare the inverted restaurant search index against the legacy substring scan.
+
+Builds synthetic catalogs (names in English and Azerbaijani, cuisines, neighbourhoods,
+addresses and tag groups), then times a fixed query mix against both implementations:
+
+  scan   lowercase substring test over one concatenated string per restaurant, copying every
+         matching summary (the pre-index `Database.list_restaurants`)
+  index  `search.SearchIndex` (token postings, prefix and trigram typo matching), returning the
+         first page of 20 summaries; "cold" clears the per-term memo before every query
+
+Usage:
+  python backend/tools/bench_search.py --sizes 1000 10000 --repeat 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time as clock
+from pathlib import Path
+from typing import Any
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.search import SearchIndex  # noqa: E402
+
+PAGE_SIZE = 20
+WORDS = [
+    "Şirvan",
+    "Qala",
+    "Dəniz",
+    "Bulvar",
+    "Çinar",
+    "Gəncə",
+    "Nərgiz",
+    "Sahil",
+    "Bağ",
+    "Çay",
+    "Xan",
+    "Sultan",
+    "Ləzzət",
+    "Qızıl",
+    "Lalə",
+    "Ulduz",
+    "Köhnə",
+    "Yaşıl",
+    "Mərcan",
+    "Dağ",
+    "Garden",
+    "Terrace",
+    "House",
+    "Grill",
+    "Bistro",
+    "Lounge",
+    "Kitchen",
+    "Port",
+    "Tower",
+]
+CUISINES = [
+    "Azerbaijani",
+    "Seafood",
+    "Steakhouse",
+    "Italian",
+    "Japanese",
+    "Georgian",
+    "Turkish",
+    "Mediterranean",
+    "Vegetarian",
+    "Uzbek",
+    "French",
+    "Fusion",
+]
+NEIGHBORHOODS = [
+    "Icherisheher",
+    "Nizami",
+    "Sabail",
+    "Yasamal",
+    "Nasimi",
+    "Bayil",
+    "Badamdar",
+    "Xətai",
+]
+TAGS = [
+    "family_friendly",
+    "live_music",
+    "rooftop",
+    "sea_view",
+    "shisha",
+    "romantic",
+    "breakfast",
+    "late_night",
+    "vegan_options",
+    "kids_menu",
+    "business_lunch",
+    "outdoor_seating",
+]
+QUERIES = [
+    "seafood",  # one cuisine, many hits
+    "sirvan",  # folded Azerbaijani name
+    "Şirvan qala",  # two tokens, diacritics
+    "terr",  # prefix while typing
+    "stekhouse",  # typo
+    "rooftop sea view",  # tags across fields
+    "nonexistent",  # no hits
+]
+
+
+def catalog(rng: random.Random, size: int) -> list[dict[str, Any]]:
+    rows = []
+    for idx in range(size):
+        name = " ".join(rng.sample(WORDS, 2))
+        rows.append({
+            "id": f"r{idx}",
+            "name": name,
+            "name_az": f"{name} Restoranı",
+            "slug": f"{name.lower().replace(' ', '-')}-{idx}",
+            "cuisine": rng.sample(CUISINES, rng.randint(1, 3)),
+            "neighborhood": rng.choice(NEIGHBORHOODS),
+            "address": f"{rng.randint(1, 200)} {rng.choice(WORDS)} küçəsi, Bakı",
+            "tags": rng.sample(TAGS, rng.randint(2, 5)),
+            "city": "Baku",
+            "rating": round(rng.uniform(3, 5), 2),
+        })
+    return rows
+
+
+def build_scan(rows: list[dict[str, Any]]) -> list[tuple[dict[str, Any], str]]:
+    return [
+        (
+            row,
+            " ".join([
+                row["name"],
+                row["city"],
+                row["neighborhood"],
+                row["address"],
+                row["slug"],
+                " ".join(row["cuisine"]),
+                " ".join(row["tags"]),
+            ]).lower(),
+        )
+        for row in rows
+    ]
+
+
+def scan(index: list[tuple[dict[str, Any], str]], query: str) -> list[dict[str, Any]]:
+    qlow = query.lower().strip()
+    return [dict(row) for row, text in index if qlow in text]
+
+
+def build_index(rows: list[dict[str, Any]]) -> SearchIndex:
+    index = SearchIndex()
+    for row in rows:
+        index.add(
+            {
+                "name": [row["name"], row["name_az"]],
+                "slug": row["slug"],
+                "cuisine": row["cuisine"],
+                "neighborhood": row["neighborhood"],
+                "address": row["address"],
+                "tags": row["tags"],
+                "city": row["city"],
+            },
+            boost=row["rating"],
+        )
+    index.search("warmup")  # builds the vocabulary and trigram tables
+    return index
+
+
+def indexed(index: SearchIndex, rows: list[dict[str, Any]], query: str) -> list[dict[str, Any]]:
+    docs, _ = index.search(query, limit=PAGE_SIZE)
+    return [dict(rows[doc]) for doc in docs]
+
+
+def cold(index: SearchIndex, rows: list[dict[str, Any]], query: str) -> list[dict[str, Any]]:
+    """First-time query: per-term score maps are rebuilt instead of served from the memo."""
+    index._term_cache.clear()
+    return indexed(index, rows, query)
+
+
+def timed(fn, repeat: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(repeat):
+        started = clock.perf_counter()
+        fn()
+        samples.append((clock.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def run(sizes: list[int], repeat: int, seed: int) -> dict[str, Any]:
+    report: dict[str, Any] = {"page_size": PAGE_SIZE, "repeat": repeat, "catalogs": []}
+    for size in sizes:
+        rows = catalog(random.Random(seed), size)
+        started = clock.perf_counter()
+        index = build_index(rows)
+        build_ms = (clock.perf_counter() - started) * 1000
+        legacy = build_scan(rows)
+        queries = {}
+        for query in QUERIES:
+            scan_p50, scan_p95 = timed(lambda q=query, s=legacy: scan(s, q), repeat)
+            index_p50, index_p95 = timed(lambda q=query, i=index, r=rows: indexed(i, r, q), repeat)
+            cold_p50, _ = timed(lambda q=query, i=index, r=rows: cold(i, r, q), repeat)
+            queries[query] = {
+                "scan_hits": len(scan(legacy, query)),
+                "index_hits": index.search(query)[1],
+                "scan_ms_p50": round(scan_p50, 4),
+                "scan_ms_p95": round(scan_p95, 4),
+                "index_ms_p50": round(index_p50, 4),
+                "index_ms_p95": round(index_p95, 4),
+                "index_cold_ms_p50": round(cold_p50, 4),
+            }
+        report["catalogs"].append({
+            "restaurants": size,
+            "index_build_ms": round(build_ms, 1),
+            "queries": queries,
+        })
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, args.repeat, args.seed), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
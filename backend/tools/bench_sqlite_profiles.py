@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Compare SQLite read/write throughput across `SQLITE_PROFILE` settings with several workers.
+
+For each profile, prepares a fresh database, then starts ``--workers`` processes (one
+event loop and connection pool each, like uvicorn workers) that for ``--seconds`` mix day
+availability reads with bookings on random far-future slots. Booking conflicts count as
+completed writes; "database is locked" failures are counted separately.
+
+Usage:
+  python backend/tools/bench_sqlite_profiles.py --workers 4 --seconds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time as clock
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+PROFILES = ("default", "production")
+
+
+def _configure(profile: str, data_dir: str) -> None:
+    # Settings are read at import time, so every process sets its environment first.
+    os.environ["DATA_DIR"] = data_dir
+    os.environ["SQLITE_PROFILE"] = profile
+    os.environ.pop("DATABASE_URL", None)
+    os.environ.pop("DATABASE_READ_URL", None)
+    if str(BACKEND_ROOT) not in sys.path:
+        sys.path.insert(0, str(BACKEND_ROOT))
+
+
+def prepare(profile: str, data_dir: str) -> None:
+    _configure(profile, data_dir)
+    from app.storage import Database
+
+    asyncio.run(Database().startup())
+
+
+def worker(
+    profile: str, data_dir: str, seconds: float, write_ratio: float, seed: int, results
+) -> None:
+    _configure(profile, data_dir)
+    from app.contracts import ReservationCreate
+    from app.schedule import RES_DURATION
+    from app.storage import BookingConflict, Database
+    from fastapi import HTTPException
+    from sqlalchemy.exc import OperationalError
+
+    db = Database()
+    rng = random.Random(seed)
+    rids = [rid for rid in db.restaurants if db.eligible_tables(rid, 2)]
+    counts = {"reads": 0, "writes": 0, "locked": 0}
+
+    async def run() -> None:
+        deadline = clock.perf_counter() + seconds
+        while clock.perf_counter() < deadline:
+            rid = rng.choice(rids)
+            day = date(2040, 1, 1) + timedelta(days=rng.randrange(365))
+            try:
+                if rng.random() < write_ratio:
+                    start = datetime.combine(day, datetime.min.time(), tzinfo=UTC) + timedelta(
+                        hours=8 + rng.randrange(12)
+                    )
+                    try:
+                        await db.create_reservation(
+                            ReservationCreate(
+                                restaurant_id=rid,
+                                party_size=2,
+                                start=start,
+                                end=start + RES_DURATION,
+                                guest_name="Bench",
+                            )
+                        )
+                    except (BookingConflict, HTTPException):
+                        pass
+                    counts["writes"] += 1
+                else:
+                    tz_name = db.restaurants[rid].get("timezone") or "Asia/Baku"
+                    await db.reservation_blocks_for_day(rid, day, tz_name)
+                    counts["reads"] += 1
+            except OperationalError as exc:
+                if "database is locked" not in str(exc.orig):
+                    raise
+                counts["locked"] += 1
+
+    asyncio.run(run())
+    results.put(counts)
+
+
+def bench_profile(profile: str, args) -> dict:
+    data_dir = tempfile.mkdtemp(prefix=f"bench-sqlite-{profile}-")
+    ctx = multiprocessing.get_context("spawn")
+    setup = ctx.Process(target=prepare, args=(profile, data_dir))
+    setup.start()
+    setup.join()
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(
+            target=worker,
+            args=(profile, data_dir, args.seconds, args.write_ratio, args.seed + idx, results),
+        )
+        for idx in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    totals = {"reads": 0, "writes": 0, "locked": 0}
+    for _ in processes:
+        for key, value in results.get().items():
+            totals[key] += value
+    for process in processes:
+        process.join()
+    return {
+        "reads_per_second": round(totals["reads"] / args.seconds, 1),
+        "writes_per_second": round(totals["writes"] / args.seconds, 1),
+        "locked_errors": totals["locked"],
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--seconds", type=float, default=20.0)
+    ap.add_argument("--write-ratio", type=float, default=0.2)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=PROFILES)
+    args = ap.parse_args()
+    report = {"workers": args.workers, "seconds": args.seconds, "write_ratio": args.write_ratio}
+    for profile in args.profiles:
+        report[profile] = bench_profile(profile, args)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
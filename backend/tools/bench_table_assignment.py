@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Simulate a day of booking demand against the table assignment strategies.
+
+Each simulated day replays the same randomized stream of requests (party size, requested start,
+arrival order) against three strategies and reports booking success rate and seat utilization:
+
+  legacy      smallest table that seats the party, ignoring existing bookings (pre-change)
+  first_free  smallest free table that seats the party, no gap scoring or combining
+  best_fit    `table_assignment.choose_tables` (best-fit packing, adjacent-table combining)
+
+Usage:
+  python backend/tools/bench_table_assignment.py --days 50 --requests 160 [--no-combine]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.schedule import RES_DURATION  # noqa: E402
+from app.table_assignment import (  # noqa: E402
+    TableSpec,
+    choose_tables,
+    combinable_groups,
+    split_table_ids,
+    table_specs,
+)
+
+OPEN_HOUR = 12
+CLOSE_HOUR = 24
+PARTY_WEIGHTS = {1: 6, 2: 40, 3: 12, 4: 20, 5: 6, 6: 8, 7: 3, 8: 3, 10: 2}
+
+
+def floor_plan() -> list[dict[str, Any]]:
+    """Two areas laid out on a grid so neighbours sit within combining distance."""
+    capacities = {"main": [2, 2, 2, 2, 4, 4, 4, 4, 6, 6], "terrace": [2, 2, 4, 4, 6]}
+    areas = []
+    for area_id, caps in capacities.items():
+        tables = [
+            {
+                "id": f"{area_id}-{idx}",
+                "capacity": cap,
+                "position": [10 + 20 * (idx % 5), 20 + 30 * (idx // 5)],
+            }
+            for idx, cap in enumerate(caps)
+        ]
+        areas.append({"id": area_id, "tables": tables})
+    return areas
+
+
+def demand(rng: random.Random, day: date, count: int) -> list[tuple[int, datetime]]:
+    sizes = list(PARTY_WEIGHTS)
+    weights = list(PARTY_WEIGHTS.values())
+    opening = datetime(day.year, day.month, day.day, OPEN_HOUR, tzinfo=UTC)
+    last_slot = (CLOSE_HOUR - OPEN_HOUR) * 2 - 3
+    requests = []
+    for _ in range(count):
+        # Dinner peak around 19:30 with a lunch shoulder.
+        slot = int(
+            min(last_slot, max(0, rng.gauss(15, 5) if rng.random() < 0.8 else rng.gauss(2, 2)))
+        )
+        requests.append((rng.choices(sizes, weights)[0], opening + timedelta(minutes=30 * slot)))
+    return requests
+
+
+def _free(bookings: dict[str, list[tuple[datetime, datetime]]], tid: str, start, end) -> bool:
+    return all(not (s < end and e > start) for s, e in bookings.get(tid, ()))
+
+
+def legacy(specs: list[TableSpec], bookings, party: int, start, end, blocks, window) -> str | None:
+    table = next((s for s in specs if s.capacity >= party), specs[-1])
+    return table.id if _free(bookings, table.id, start, end) else None
+
+
+def first_free(specs, bookings, party: int, start, end, blocks, window) -> str | None:
+    for spec in specs:
+        if spec.capacity >= party and _free(bookings, spec.id, start, end):
+            return spec.id
+    return None
+
+
+def simulate(strategy: str, specs, groups, requests, window) -> dict[str, float]:
+    bookings: dict[str, list[tuple[datetime, datetime]]] = {}
+    blocks: list[tuple[str, datetime, datetime, int]] = []
+    booked = guests = seats_assigned = 0
+    guest_minutes = 0.0
+    for party, start in requests:
+        end = start + RES_DURATION
+        if strategy == "legacy":
+            chosen = legacy(specs, bookings, party, start, end, blocks, window)
+        elif strategy == "first_free":
+            chosen = first_free(specs, bookings, party, start, end, blocks, window)
+        else:
+            chosen = choose_tables(specs, groups, party, start, end, blocks, window)
+        if chosen is None:
+            continue
+        booked += 1
+        guests += party
+        guest_minutes += party * RES_DURATION.total_seconds() / 60
+        by_id = {spec.id: spec for spec in specs}
+        for tid in split_table_ids(chosen):
+            bookings.setdefault(tid, []).append((start, end))
+            seats_assigned += by_id[tid].capacity
+        blocks.append((chosen, start, end, party))
+    service_minutes = (window[1] - window[0]).total_seconds() / 60
+    total_seats = sum(spec.capacity for spec in specs)
+    return {
+        "booked": booked,
+        "guests": guests,
+        "seat_utilization": guest_minutes / (total_seats * service_minutes),
+        "seat_efficiency": guests / seats_assigned if seats_assigned else 0.0,
+    }
+
+
+def run(days: int, request_count: int, seed: int, combine: bool = True) -> dict[str, Any]:
+    rng = random.Random(seed)
+    specs = table_specs(floor_plan())
+    groups = combinable_groups(specs) if combine else []
+    totals = {name: {"booked": 0, "guests": 0, "util": 0.0, "eff": 0.0} for name in STRATEGIES}
+    for _ in range(days):
+        day = date(2025, 1, 1) + timedelta(days=rng.randint(0, 364))
+        requests = demand(rng, day, request_count)
+        window = (
+            datetime(day.year, day.month, day.day, OPEN_HOUR, tzinfo=UTC),
+            datetime(day.year, day.month, day.day, tzinfo=UTC) + timedelta(hours=CLOSE_HOUR),
+        )
+        for name in STRATEGIES:
+            result = simulate(name, specs, groups, requests, window)
+            totals[name]["booked"] += result["booked"]
+            totals[name]["guests"] += result["guests"]
+            totals[name]["util"] += result["seat_utilization"]
+            totals[name]["eff"] += result["seat_efficiency"]
+    requested = days * request_count
+    return {
+        "days": days,
+        "requests_per_day": request_count,
+        "tables": len(specs),
+        "seats": sum(spec.capacity for spec in specs),
+        "combining": combine,
+        "strategies": {
+            name: {
+                "success_rate": round(t["booked"] / requested, 4),
+                "guests_per_day": round(t["guests"] / days, 1),
+                "seat_utilization": round(t["util"] / days, 4),
+                "seat_efficiency": round(t["eff"] / days, 4),
+            }
+            for name, t in totals.items()
+        },
+    }
+
+
+STRATEGIES = ("legacy", "first_free", "best_fit")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=160)
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument(
+        "--no-combine", action="store_true", help="disable adjacent-table combining for best_fit"
+    )
+    args = parser.parse_args()
+    report = run(args.days, args.requests, args.seed, combine=not args.no_combine)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,41 @@
+#!/usr/bin/env python3
+"""Fire concurrent bookings at the reservations API and check that no table is double-booked.
+
+Two modes:
+
+  remote      many copies of one booking against a running server (``--base``); exactly one
+              should succeed and the rest get 409
+  in-process  thousands of bookings against the ASGI app through ``httpx.ASGITransport`` with a
+              throwaway SQLite database (or ``DATABASE_URL``): overlapping start times on a few
+              tables, explicit tables mixed with auto-assignment. Afterwards every blocking
+              reservation is checked for overlaps and the run reports throughput and latency.
+              ``--batching on|off|both`` toggles group-committed writes
+              (``RESERVATION_WRITE_BATCHING``); ``both`` runs the burst once each way.
+
+Usage:
+  python backend/tools/stress_race.py --rid <id> --tid <table> --base http://localhost:8000
+  python backend/tools/stress_race.py --in-process --requests 2000 --concurrency 200
+  python backend/tools/stress_race.py --in-process --batching both
+"""
+
+from __future__ import annotations
+
 import argparse
 import asyncio
 import datetime as dt
 import json
 import os
+import random
+import statistics
+import sys
+import tempfile
+import time as clock
+from pathlib import Path
 
 import httpx
 
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
 
 def iso(day, hhmm, dur="01:30"):
     h, m = map(int, hhmm.split(":"))
@@ -16,22 +46,13 @@ def iso(day, hhmm, dur="01:30"):
     return start.isoformat(timespec="seconds"), end.isoformat(timespec="seconds")
 
 
-async def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--base", default=os.environ.get("BASE", "http://192.168.0.148:8000"))
-    ap.add_argument("--rid", required=True)
-    ap.add_argument("--tid", required=True)
-    ap.add_argument("--start", default="10:00")
-    ap.add_argument("--duration", default="01:30")
-    ap.add_argument("--tasks", type=int, default=12)
-    args = ap.parse_args()
-
+async def remote(args) -> dict:
     day = dt.date.today().strftime("%Y-%m-%d")
     s, e = iso(day, args.start, args.duration)
+    params = {"restaurant_id": args.rid, "limit": 500}
 
     async with httpx.AsyncClient(base_url=args.base, timeout=10) as client:
-        existing = (await client.get("/reservations")).json()
-        for rec in existing:
+        for rec in (await client.get("/reservations", params=params)).json():
             await client.delete(f"/reservations/{rec['id']}")
 
         payload = dict(
@@ -49,26 +70,122 @@ async def main():
 
         results = await asyncio.gather(*[attempt(i) for i in range(args.tasks)])
 
-        successes = sum(1 for code, _ in results if code == 201)
-        conflicts = sum(1 for code, _ in results if code == 409)
-        others = [(code, body) for code, body in results if code not in (201, 409)]
-
-        for rec in (await client.get("/reservations")).json():
+        for rec in (await client.get("/reservations", params=params)).json():
             await client.delete(f"/reservations/{rec['id']}")
 
-        print(
-            json.dumps(
-                {
-                    "slot": {"start": s, "end": e, "table_id": args.tid},
-                    "attempts": args.tasks,
-                    "successes": successes,
-                    "conflicts": conflicts,
-                    "others": others,
-                },
-                indent=2,
-            )
+    return {
+        "slot": {"start": s, "end": e, "table_id": args.tid},
+        "attempts": args.tasks,
+        "successes": sum(1 for code, _ in results if code == 201),
+        "conflicts": sum(1 for code, _ in results if code == 409),
+        "others": [(code, body) for code, body in results if code not in (201, 409)],
+    }
+
+
+async def race(app, db, requests: int, concurrency: int, seed: int = 7) -> dict:
+    """
+    Book ``requests`` overlapping reservations against ``app`` with at most ``concurrency`` in
+    flight, then audit the stored rows. Shared with the test suite.
+    """
+    rng = random.Random(seed)
+    rid = next(rid for rid in db.restaurants if len(db.eligible_tables(rid, 2)) >= 4)
+    tables = [table["id"] for table in db.eligible_tables(rid, 2)[:4]]
+    tz = dt.timezone(dt.timedelta(hours=4))
+    day = dt.date(2033, 5, 17) + dt.timedelta(days=rng.randrange(300))
+    # Starts every 30 minutes over four hours: neighbouring starts overlap a 90-minute booking.
+    starts = [
+        dt.datetime.combine(day, dt.time(18, 0), tz) + dt.timedelta(minutes=30 * step)
+        for step in range(8)
+    ]
+    payloads = []
+    for idx in range(requests):
+        start = rng.choice(starts)
+        payload = {
+            "restaurant_id": rid,
+            "party_size": 2,
+            "start": start.isoformat(),
+            "end": (start + dt.timedelta(minutes=90)).isoformat(),
+            "guest_name": f"Race {idx}",
+        }
+        if rng.random() < 0.5:
+            payload["table_id"] = rng.choice(tables)
+        payloads.append(payload)
+
+    gate = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    codes: dict[int, int] = {}
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://race") as client:
+
+        async def book(payload):
+            async with gate:
+                started = clock.perf_counter()
+                response = await client.post("/reservations", json=payload)
+                latencies.append((clock.perf_counter() - started) * 1000)
+                codes[response.status_code] = codes.get(response.status_code, 0) + 1
+
+        started = clock.perf_counter()
+        await asyncio.gather(*(book(payload) for payload in payloads))
+        elapsed = clock.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "restaurant_id": rid,
+        "requests": requests,
+        "concurrency": concurrency,
+        "status_codes": dict(sorted(codes.items())),
+        "overlaps": await db.reservation_overlaps(rid),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(requests / elapsed, 1),
+        "latency_ms_p50": round(statistics.median(latencies), 2),
+        "latency_ms_p95": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+    }
+
+
+async def in_process(args) -> dict:
+    os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="stress-race-"))
+    os.environ.setdefault("AUTH0_BYPASS", "true")
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    if str(BACKEND_ROOT) not in sys.path:
+        sys.path.insert(0, str(BACKEND_ROOT))
+    from app.main import app
+    from app.settings import settings
+    from app.storage import DB, Database
+
+    await DB.provide(Database()).startup()
+    modes = {"off": [False], "on": [True], "both": [False, True]}[args.batching]
+    reports = {}
+    for offset, batching in enumerate(modes):
+        settings.RESERVATION_WRITE_BATCHING = batching
+        # A different seed books a different day, so the second run starts from empty slots.
+        reports["batched" if batching else "unbatched"] = await race(
+            app, DB, args.requests, args.concurrency, args.seed + offset
         )
+    return reports if len(reports) > 1 else next(iter(reports.values()))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--in-process", action="store_true")
+    ap.add_argument("--base", default=os.environ.get("BASE", "http://192.168.0.148:8000"))
+    ap.add_argument("--rid")
+    ap.add_argument("--tid")
+    ap.add_argument("--start", default="10:00")
+    ap.add_argument("--duration", default="01:30")
+    ap.add_argument("--tasks", type=int, default=12)
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--concurrency", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--batching", choices=("off", "on", "both"), default="off")
+    args = ap.parse_args()
+    if args.in_process:
+        report = asyncio.run(in_process(args))
+    else:
+        if not args.rid or not args.tid:
+            ap.error("--rid and --tid are required against a remote server")
+        report = asyncio.run(remote(args))
+    print(json.dumps(report, indent=2))
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
@@ -5,6 +5,7 @@ import type {
   ReservationCreate as ApiReservationPayload,
   Restaurant as ApiRestaurantDetail,
   RestaurantListItem as ApiRestaurantSummary,
+  RestaurantPage as ApiRestaurantPage,
 } from './types/server';
 
 type ExtraConfig = {
@@ -91,6 +92,21 @@ export type AreaDetail = {
   }>;
 };
 
+export type RestaurantFilters = {
+  q?: string;
+  cuisine?: string[];
+  neighborhood?: string[];
+  priceLevel?: string[];
+  /** Tag group -> accepted values, e.g. { vibe: ['romantic'] }. */
+  tags?: Record<string, string[]>;
+  minRating?: number;
+  sort?: 'relevance' | 'rating' | 'reviews_count' | 'name';
+  limit?: number;
+  offset?: number;
+};
+
+export type RestaurantPage = Omit<ApiRestaurantPage, 'items'> & { items: RestaurantSummary[] };
+
 export type RestaurantDetail = Omit<ApiRestaurantDetail, 'areas' | 'tags'> & {
   areas?: AreaDetail[];
   tags?: string[] | { [key: string]: string[] };
@@ -108,8 +124,48 @@ export type AvailabilityResponse = {
   restaurant_timezone?: string | null;
 };
 
+export type AvailabilityRangeDay = {
+  date: string;
+  party_sizes: Record<string, AvailabilitySlot[]>;
+};
+
+export type AvailabilityRangeResponse = {
+  restaurant_timezone: string;
+  from: string;
+  to: string;
+  party_sizes: number[];
+  days: AvailabilityRangeDay[];
+};
+
+export type NextAvailableSlot = AvailabilitySlot & { date: string };
+
+export type NextAvailableResponse = {
+  restaurant_timezone: string;
+  party_size: number;
+  after: string;
+  searched_through: string;
+  slots: NextAvailableSlot[];
+};
+
+/** Payload of a `delta` event on the availability stream: only the slots that changed. */
+export type AvailabilitySlotDelta = {
+  restaurant_id: string;
+  date: string;
+  party_size: number;
+  slots: AvailabilitySlot[];
+};
+
 export type Reservation = ApiReservation;
 
+/** Nearby free option returned alongside a 409 from `createReservation`. */
+export type BookingAlternative = {
+  start: string;
+  end: string;
+  table_id: string;
+};
+
+export type ApiError = Error & { alternatives?: BookingAlternative[] };
+
 export type ReservationPayload = ApiReservationPayload;
 
 export type Review = {
@@ -296,17 +352,21 @@ async function handleResponse<T>(res: Response, fallbackMessage: string): Promis
     return res.json() as Promise<T>;
   }
   let detail = fallbackMessage;
+  let alternatives: BookingAlternative[] | undefined;
   try {
     const payload = await res.json();
     detail =
       typeof payload?.detail === 'string'
         ? payload.detail
         : JSON.stringify(payload?.detail ?? fallbackMessage);
+    if (Array.isArray(payload?.alternatives)) alternatives = payload.alternatives;
   } catch (err) {
     const text = await res.text();
     if (text) detail = text;
   }
-  throw new Error(detail);
+  const error: ApiError = new Error(detail);
+  if (alternatives) error.alternatives = alternatives;
+  throw error;
 }
 
 async function fetchWithTimeout(resource: string, init?: RequestInit, timeoutMs = 10000) {
@@ -326,6 +386,28 @@ export async function fetchRestaurants(q?: string) {
   return handleResponse<RestaurantSummary[]>(res, 'Failed to fetch restaurants');
 }
 
+/** Filtered, sorted page of the catalog with facet counts for building filter chips. */
+export async function searchRestaurants(filters: RestaurantFilters = {}) {
+  const params: string[] = [];
+  const add = (key: string, value: string | number) =>
+    params.push(`${key}=${encodeURIComponent(String(value))}`);
+  if (filters.q) add('q', filters.q);
+  filters.cuisine?.forEach((value) => add('cuisine', value));
+  filters.neighborhood?.forEach((value) => add('neighborhood', value));
+  filters.priceLevel?.forEach((value) => add('price_level', value));
+  Object.entries(filters.tags ?? {}).forEach(([group, values]) =>
+    values.forEach((value) => add('tag', `${group}:${value}`)),
+  );
+  if (filters.minRating !== undefined) add('min_rating', filters.minRating);
+  if (filters.sort) add('sort', filters.sort);
+  if (filters.limit !== undefined) add('limit', filters.limit);
+  if (filters.offset !== undefined) add('offset', filters.offset);
+  const base = buildApiUrl('/restaurants/search');
+  const url = params.length ? `${base}?${params.join('&')}` : base;
+  const res = await fetch(url, { headers: withAuth() });
+  return handleResponse<RestaurantPage>(res, 'Failed to fetch restaurants');
+}
+
 export async function fetchRestaurant(id: string) {
   const res = await fetch(buildApiUrl(`/restaurants/${id}`), { headers: withAuth() });
   return handleResponse<RestaurantDetail>(res, 'Restaurant not found');
@@ -337,6 +419,37 @@ export async function fetchAvailability(id: string, dateStr: string, partySize:
   return handleResponse<AvailabilityResponse>(res, 'Failed to fetch availability');
 }
 
+export async function fetchAvailabilityRange(
+  id: string,
+  fromDate: string,
+  toDate: string,
+  partySizes: number[],
+) {
+  const params = `from=${encodeURIComponent(fromDate)}&to=${encodeURIComponent(toDate)}&party_sizes=${partySizes.join(',')}`;
+  const url = `${buildApiUrl(`/restaurants/${id}/availability/range`)}?${params}`;
+  const res = await fetch(url, { headers: withAuth() });
+  return handleResponse<AvailabilityRangeResponse>(res, 'Failed to fetch availability');
+}
+
+export async function fetchNextAvailable(
+  id: string,
+  partySize: number,
+  options: { after?: string; withinDays?: number; limit?: number } = {},
+) {
+  const params = [`party_size=${partySize}`];
+  if (options.after) params.push(`after=${encodeURIComponent(options.after)}`);
+  if (options.withinDays) params.push(`within_days=${options.withinDays}`);
+  if (options.limit) params.push(`limit=${options.limit}`);
+  const url = `${buildApiUrl(`/restaurants/${id}/next-available`)}?${params.join('&')}`;
+  const res = await fetch(url, { headers: withAuth() });
+  return handleResponse<NextAvailableResponse>(res, 'Failed to fetch next available slots');
+}
+
+/** Server-sent events URL emitting a `snapshot` event, then `delta` events as bookings change. */
+export function availabilityStreamUrl(id: string, dateStr: string, partySize: number) {
+  return `${buildApiUrl(`/restaurants/${id}/availability/stream`)}?date=${encodeURIComponent(dateStr)}&party_size=${partySize}`;
+}
+
 export async function createReservation(payload: ReservationPayload) {
   const res = await fetch(buildApiUrl('/reservations'), {
     method: 'POST',
@@ -346,9 +459,17 @@ export async function createReservation(payload: ReservationPayload) {
   return handleResponse<Reservation>(res, 'Failed to create reservation');
 }
 
+/** All of the signed-in guest's reservations, following the server's `X-Next-Cursor` pages. */
 export async function fetchReservationsList() {
-  const res = await fetch(buildApiUrl('/reservations'), { headers: withAuth() });
-  return handleResponse<Reservation[]>(res, 'Failed to fetch reservations');
+  const reservations: Reservation[] = [];
+  let cursor: string | null = null;
+  do {
+    const query = cursor ? `?limit=200&cursor=${encodeURIComponent(cursor)}` : '?limit=200';
+    const res = await fetch(`${buildApiUrl('/reservations')}${query}`, { headers: withAuth() });
+    reservations.push(...(await handleResponse<Reservation[]>(res, 'Failed to fetch reservations')));
+    cursor = res.headers.get('X-Next-Cursor');
+  } while (cursor);
+  return reservations;
 }
 
 export async function cancelReservation(reservationId: string) {
@@ -21,6 +21,24 @@ export interface RestaurantListItem {
   instagram?: string | null;
 }
 
+export interface FacetCount {
+  value: string;
+  count: number;
+}
+
+export interface RestaurantFacets {
+  cuisine?: FacetCount[];
+  neighborhood?: FacetCount[];
+  price_level?: FacetCount[];
+  tag_groups?: Record<string, FacetCount[]>;
+}
+
+export interface RestaurantPage {
+  items: RestaurantListItem[];
+  total: number;
+  facets: RestaurantFacets;
+}
+
 export interface Restaurant {
   id: string;
   name: string;
@@ -50,6 +68,7 @@ export interface Restaurant {
   areas?: Area[];
   rating?: number | null;
   reviews_count?: number;
+  rating_histogram?: Record<string, number>;
 }
 
 export interface Area {
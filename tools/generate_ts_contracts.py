@@ -10,6 +10,9 @@ OPENAPI_PATH = Path("artifacts/openapi.json")
 OUTPUT_PATH = Path("mobile/src/types/server.d.ts")
 TARGET_SCHEMAS = [
     "RestaurantListItem",
+    "FacetCount",
+    "RestaurantFacets",
+    "RestaurantPage",
     "Restaurant",
     "Area",
     "Table",